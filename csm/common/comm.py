@@ -341,13 +341,25 @@ class AmqpChannel(Channel):
     def send_file(self, local_file, remote_file):
         raise Exception('send_file not implemented for AMQP Channel')
 
-    def acknowledge(self, delivery_tag=None):
+    def acknowledge(self, delivery_tag=None, multiple=False):
         try:
-            self._channel.basic_ack(delivery_tag=delivery_tag)
+            self._channel.basic_ack(delivery_tag=delivery_tag, multiple=multiple)
         except self.connection_exceptions as e:
             Log.error(self.connection_error_msg.format(repr(e)))
             self.init()
-            self.acknowledge(delivery_tag)
+            self.acknowledge(delivery_tag, multiple)
+
+    def reject(self, delivery_tag=None, multiple=False, requeue=True):
+        """
+        Return the message(s) to the queue to be delivered again, or drop
+        them without requeue (dead-lettered if the queue has an exchange for it)
+        """
+        try:
+            self._channel.basic_nack(delivery_tag=delivery_tag, multiple=multiple,
+                                     requeue=requeue)
+        except self.connection_exceptions as e:
+            # Unacknowledged messages are delivered again after reconnect
+            Log.error(self.connection_error_msg.format(repr(e)))
 
 class FILEChannel(Channel):
     def __init__(self, *args, **kwargs):
@@ -483,6 +495,10 @@ class AmqpComm(Comm):
         self.plugin_callback = None
         self.delivery_tag = None
         self._is_disconnect = False
+        self._window = []
+        self._window_size = 1
+        self._window_latency = 0
+        self._window_timer = None
 
     def init(self):
         self._inChannel.init()
@@ -509,6 +525,70 @@ class AmqpComm(Comm):
     def acknowledge(self):
         self._inChannel.acknowledge(self.delivery_tag)
 
+    def _window_callback(self, ch, method, properties, body):
+        self._window.append((method.delivery_tag, body))
+        if len(self._window) >= self._window_size:
+            self._flush_window()
+        elif len(self._window) == 1:
+            self._window_timer = self._inChannel.connection().call_later(
+                self._window_latency, self._flush_window)
+
+    def _flush_window(self):
+        """
+        Pass the window to the callback, then settle its messages by their
+        outcomes: all at once if they are all acknowledged, one by one
+        otherwise. If the callback fails the window is returned to the queue.
+        """
+        if self._window_timer is not None:
+            self._inChannel.connection().remove_timeout(self._window_timer)
+            self._window_timer = None
+        if not self._window:
+            return
+        window, self._window = self._window, []
+        try:
+            outcomes = self.plugin_callback([body for _, body in window])
+        except Exception as e:
+            Log.error(f"Error in processing a window of {len(window)} messages: {e}")
+            outcomes = [const.AMQP_MSG_REQUEUE] * len(window)
+        if all(outcome == const.AMQP_MSG_ACK for outcome in outcomes):
+            self._inChannel.acknowledge(window[-1][0], multiple=True)
+            return
+        for (delivery_tag, _), outcome in zip(window, outcomes):
+            if outcome == const.AMQP_MSG_ACK:
+                self._inChannel.acknowledge(delivery_tag)
+            else:
+                self._inChannel.reject(delivery_tag,
+                                       requeue=outcome == const.AMQP_MSG_REQUEUE)
+
+    def recv_window(self, callback_fn, window_size, max_latency):
+        """
+        Start consuming the queue messages in windows.
+        A window is passed to callback_fn as a list of message bodies when
+        it has window_size messages or max_latency seconds after its first
+        message. callback_fn returns the outcome of every message:
+        const.AMQP_MSG_ACK if it is processed, const.AMQP_MSG_REQUEUE if it
+        is to be delivered again, const.AMQP_MSG_REJECT if it is to be dropped.
+        """
+        try:
+            consumer_tag = const.CONSUMER_TAG
+            self.plugin_callback = callback_fn
+            self._window = []
+            self._window_timer = None
+            self._window_size = window_size
+            self._window_latency = max_latency
+            channel = self._inChannel.channel()
+            if channel:
+                # The broker does not deliver more than a window ahead
+                channel.basic_qos(prefetch_count=window_size)
+                channel.basic_consume(self._inChannel.exchange_queue,
+                        self._window_callback, consumer_tag=consumer_tag)
+                channel.start_consuming()
+        except self._inChannel.connection_exceptions as e:
+            if not self._is_disconnect:
+                Log.error(self._inChannel.connection_error_msg.format(repr(e)))
+                self.init()
+                self.recv_window(callback_fn, window_size, max_latency)
+
     def stop(self):
         self.disconnect()
 
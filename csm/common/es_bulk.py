@@ -0,0 +1,119 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import aiohttp
+from typing import Any, Dict, List, Optional, Tuple
+from cortx.utils.log import Log
+from csm.common.errors import CsmInternalError, CsmResourceNotAvailable
+from csm.common.payload import JsonCodec
+
+
+class EsBulkClient:
+    """
+    Client of the Elasticsearch bulk API.
+    Writes of several documents, possibly of different indexes, are sent
+    in one request. Actions are tuples created by the *_action methods.
+    """
+
+    def __init__(self, host: str, port: int, login: str = None, password: str = None,
+                 timeout: float = 30, indexes: Dict[str, str] = None):
+        """
+        :param indexes: index of every model by its import path,
+                        see model_indexes
+        """
+        self._url = f"http://{host}:{port}/_bulk"
+        self._indexes = indexes or {}
+        self._auth = aiohttp.BasicAuth(login, password) if login else None
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+
+    @staticmethod
+    def model_indexes(db_config: dict, database: str = 'es_db') -> Dict[str, str]:
+        """ Indexes of the models of the database in database.yaml """
+        return {model['import_path']: model['config'][database]['collection']
+                for model in db_config.get('models', [])
+                if model.get('database') == database}
+
+    def index_of(self, model: type) -> str:
+        """ Index the model is stored in """
+        index = self._indexes.get(f"{model.__module__}.{model.__qualname__}")
+        if index is None:
+            raise CsmInternalError(f"No Elasticsearch index for {model.__name__}")
+        return index
+
+    @staticmethod
+    def index_action(index: str, doc_id: str, doc: dict) -> Tuple[dict, Any]:
+        """ Create or replace the whole document """
+        return {'index': {'_index': index, '_id': doc_id}}, doc
+
+    @staticmethod
+    def update_action(index: str, doc_id: str, doc: dict = None,
+                      script: dict = None) -> Tuple[dict, Any]:
+        """
+        Change a part of an existing document
+        :param doc: fields to be replaced
+        :param script: painless script {"source": ..., "params": {...}}
+        """
+        body = {'doc': doc} if script is None else {'script': script}
+        return {'update': {'_index': index, '_id': doc_id}}, body
+
+    @staticmethod
+    def delete_action(index: str, doc_id: str) -> Tuple[dict, Any]:
+        """ Remove the document """
+        return {'delete': {'_index': index, '_id': doc_id}}, None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def bulk(self, actions: List[Tuple[dict, Any]]) -> List[Optional[str]]:
+        """
+        Send actions in one request
+        :return: error of every action, None for the successful ones
+        :raises CsmResourceNotAvailable: the request as a whole failed
+        """
+        if not actions:
+            return []
+        lines = []
+        for meta, body in actions:
+            lines.append(JsonCodec.dumps(meta))
+            if body is not None:
+                lines.append(JsonCodec.dumps(body))
+        data = '\n'.join(lines) + '\n'
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=self._timeout, auth=self._auth)
+        try:
+            async with self._session.post(self._url, data=data, params={'refresh': 'false'},
+                    headers={'Content-Type': 'application/x-ndjson'}) as response:
+                text = await response.text()
+                if response.status != 200:
+                    raise CsmResourceNotAvailable(
+                        f"Bulk request failed with HTTP {response.status}: {text[:512]}")
+        except aiohttp.ClientError as e:
+            raise CsmResourceNotAvailable(f"Bulk request failed: {e}")
+        result = JsonCodec.loads(text)
+        errors = []
+        for item in result.get('items', []):
+            status = next(iter(item.values()), {})
+            error = status.get('error')
+            errors.append(None if error is None else str(error))
+        if len(errors) != len(actions):
+            raise CsmResourceNotAvailable(
+                f"Bulk reply has {len(errors)} results for {len(actions)} actions")
+        if result.get('errors'):
+            Log.warn(f"Bulk request: {sum(e is not None for e in errors)} of "
+                     f"{len(actions)} actions failed")
+        return errors
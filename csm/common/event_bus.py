@@ -0,0 +1,143 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import inspect
+import time
+from typing import Callable, Dict, List, Type
+
+from cortx.utils.log import Log
+from csm.core.blogic import const
+
+
+class Subscription:
+    """
+    Subscriber of an event bus topic. Events are queued for the subscriber
+    and handled one by one by its worker task, so a slow or failing
+    subscriber delays only its own events.
+    """
+
+    def __init__(self, name: str, topic: Type, handler: Callable, queue_size: int):
+        self.name = name
+        self.topic = topic
+        self.handler = handler
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_queued = 0
+        self.max_handling_time = 0.0
+
+    def put(self, event):
+        """ Queue the event, the oldest one is dropped if the queue is full """
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            if not self.dropped:
+                Log.warn(f"Event subscriber {self.name} is too slow, events are dropped")
+            self.dropped += 1
+        self.queue.put_nowait(event)
+        self.max_queued = max(self.max_queued, self.queue.qsize())
+
+    async def run(self):
+        while True:
+            event = await self.queue.get()
+            started = time.monotonic()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                Log.error(f"Event subscriber {self.name} failed to handle "
+                          f"{type(event).__name__}: {e}")
+            finally:
+                self.max_handling_time = max(self.max_handling_time,
+                                             time.monotonic() - started)
+                self.queue.task_done()
+
+    def metrics(self) -> dict:
+        return {
+            'topic': self.topic.__name__,
+            'queued': self.queue.qsize(),
+            'max_queued': self.max_queued,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'max_handling_time': self.max_handling_time,
+        }
+
+
+class EventBus:
+    """
+    Asynchronous publish/subscribe of typed events.
+    Topics are event classes: a subscriber of a class receives the events
+    of the class and of its subclasses. Events may be published from any
+    thread and are never handled in the publisher's context, they are
+    delivered to the subscribers by worker tasks on the event loop.
+    Subscriptions must be made on the event loop thread or before it runs.
+    """
+
+    def __init__(self, loop=None):
+        self._loop = loop or asyncio.get_event_loop()
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(self, topic: Type, handler: Callable, name: str = None,
+                  queue_size: int = const.EVENT_BUS_QUEUE_SIZE) -> Subscription:
+        """
+        :param handler: function or coroutine function taking the event
+        :param name: name of the subscriber in logs and metrics
+        :param queue_size: events waiting for the subscriber, 0 is unlimited
+        """
+        name = name or getattr(handler, '__qualname__', repr(handler))
+        subscription = Subscription(name, topic, handler, queue_size)
+        subscription.task = self._loop.create_task(subscription.run())
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.remove(subscription)
+        subscription.task.cancel()
+
+    def _dispatch(self, event):
+        for subscription in self._subscriptions:
+            if isinstance(event, subscription.topic):
+                subscription.put(event)
+
+    def publish(self, event):
+        """ Queue the event for its subscribers, thread safe """
+        # Events of all threads are queued in the order they are published
+        self._loop.call_soon_threadsafe(self._dispatch, event)
+
+    async def join(self):
+        """ Wait until the subscribers handle the events published so far """
+        # Let the events published from this thread be queued
+        await asyncio.sleep(0)
+        for subscription in list(self._subscriptions):
+            await subscription.queue.join()
+
+    def stop(self):
+        """ Cancel the subscribers, queued events are discarded """
+        for subscription in self._subscriptions:
+            subscription.task.cancel()
+        self._subscriptions = []
+
+    def metrics(self) -> Dict[str, dict]:
+        """ :return: delivery counters and queue lengths by subscriber """
+        return {s.name: s.metrics() for s in self._subscriptions}
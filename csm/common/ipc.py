@@ -0,0 +1,170 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import os
+from typing import Any, Callable, Dict
+from cortx.utils.log import Log
+from csm.common.payload import JsonCodec
+
+
+async def _dispatch(handlers: Dict[str, Callable], line: bytes):
+    message = JsonCodec.loads(line)
+    handler = handlers.get(message.get('topic'))
+    if handler is None:
+        return
+    result = handler(message.get('payload'))
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class IpcServer:
+    """
+    Publisher of local messages over a Unix socket.
+    Every message is one line of JSON: {"topic": ..., "payload": ...}.
+    The last message of a retained topic is replayed to clients that
+    connect later, so they start from the current state.
+    Messages sent by clients in the same format are dispatched to
+    per-topic handlers.
+    """
+
+    def __init__(self, path: str, max_buffer: int = 16 * 1024 * 1024,
+                 handlers: Dict[str, Callable] = None):
+        self._path = path
+        self._max_buffer = max_buffer
+        self._handlers = handlers or {}
+        self._writers = set()
+        self._retained = {}
+        self._server = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_event_loop()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(self._on_connect, path=self._path,
+                                                       limit=self._max_buffer)
+        os.chmod(self._path, 0o600)
+        Log.info(f"IPC server is listening on {self._path}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+        self._server = None
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+    async def _on_connect(self, reader, writer):
+        Log.debug("IPC client connected")
+        self._writers.add(writer)
+        for line in self._retained.values():
+            writer.write(line)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    await _dispatch(self._handlers, line)
+                except Exception as e:
+                    Log.error(f"Failed to handle IPC client message: {e}")
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            Log.debug("IPC client disconnected")
+
+    def _send(self, topic: str, line: bytes, retain: bool):
+        if retain:
+            self._retained[topic] = line
+        for writer in list(self._writers):
+            if writer.is_closing():
+                self._writers.discard(writer)
+            elif writer.transport.get_write_buffer_size() > self._max_buffer:
+                # The client does not read, drop it instead of growing memory
+                Log.warn("IPC client is too slow, disconnecting")
+                self._writers.discard(writer)
+                writer.close()
+            else:
+                writer.write(line)
+
+    def publish(self, topic: str, payload: Any, retain: bool = False):
+        """
+        Send the message to all connected clients.
+        A retained message equal to the previous one is not sent again.
+        Safe to call from any thread.
+        """
+        line = JsonCodec.dumps_bytes({'topic': topic, 'payload': payload}) + b'\n'
+        if retain and self._retained.get(topic) == line:
+            # Nothing changed since the last retained message
+            return
+        self._loop.call_soon_threadsafe(self._send, topic, line, retain)
+
+
+class IpcClient:
+    """
+    Receives messages published by IpcServer and dispatches them to
+    per-topic handlers. Reconnects until cancelled.
+    Messages sent while disconnected are lost.
+    """
+
+    def __init__(self, path: str, handlers: Dict[str, Callable],
+                 reconnect_interval: float = 1, limit: int = 16 * 1024 * 1024):
+        self._path = path
+        self._handlers = handlers
+        self._reconnect_interval = reconnect_interval
+        self._limit = limit
+        self._writer = None
+
+    def send(self, topic: str, payload: Any) -> bool:
+        """ Send a message to the server, must be called from the client's loop """
+        if self._writer is None or self._writer.is_closing():
+            Log.warn(f"IPC server {self._path} is not connected, {topic} message is lost")
+            return False
+        self._writer.write(JsonCodec.dumps_bytes({'topic': topic, 'payload': payload}) + b'\n')
+        return True
+
+    async def run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self._path, limit=self._limit)
+            except OSError as e:
+                Log.debug(f"IPC server {self._path} is not available: {e}")
+                await asyncio.sleep(self._reconnect_interval)
+                continue
+            Log.info(f"Connected to IPC server {self._path}")
+            self._writer = writer
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        await _dispatch(self._handlers, line)
+                    except Exception as e:
+                        Log.error(f"Failed to handle IPC message: {e}")
+            except (OSError, ValueError) as e:
+                Log.warn(f"IPC connection error: {e}")
+            finally:
+                self._writer = None
+                writer.close()
+            Log.warn(f"Disconnected from IPC server {self._path}")
+            await asyncio.sleep(self._reconnect_interval)
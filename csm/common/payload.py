@@ -16,7 +16,147 @@
 import os, errno, sys
 import json, toml, yaml, tarfile
 import configparser
-from typing import List
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+class JsonCodec:
+    """
+    JSON encoder/decoder used for REST, websocket and payload I/O.
+    Uses orjson when it is installed and stdlib json otherwise.
+    Datetime objects keep the str() representation used by the REST API,
+    UUIDs and models (anything with to_primitive, e.g. CsmModel) are
+    encoded directly, other unknown objects are converted with str().
+    """
+
+    _ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                       if orjson is not None else 0)
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if hasattr(obj, 'to_primitive'):
+            return obj.to_primitive()
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        return str(obj)
+
+    @staticmethod
+    def dumps_bytes(obj: Any) -> bytes:
+        """
+        Serialize object to JSON encoded in UTF-8
+        :param obj: object to be serialized
+        :return: :type: bytes
+        """
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=JsonCodec._default,
+                                    option=JsonCodec._ORJSON_OPTIONS)
+            except TypeError:
+                # orjson is stricter than stdlib (e.g. integers above 64 bit)
+                pass
+        return json.dumps(obj, default=JsonCodec._default).encode('utf-8')
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        """
+        Serialize object to JSON string
+        :param obj: object to be serialized
+        :return: :type: str
+        """
+        if orjson is not None:
+            return JsonCodec.dumps_bytes(obj).decode('utf-8')
+        return json.dumps(obj, default=JsonCodec._default)
+
+    @staticmethod
+    def loads(data) -> Any:
+        """
+        Deserialize JSON document
+        :param data: :type: str or bytes
+        :return: deserialized object
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+
+class JsonStream:
+    """
+    JSON document with a large list inside which is serialized lazily,
+    batch by batch, so it can be sent to the client while the list is
+    still being consumed.
+    Produces either a JSON array (optionally wrapped into an object
+    with extra envelope fields) or newline-delimited JSON. In NDJSON form
+    the envelope, if present, is written as the first line.
+    """
+
+    def __init__(self, items, key: Optional[str] = None, envelope: Optional[dict] = None,
+                 transform: Optional[Callable] = None, batch_size: int = 100):
+        """
+        :param items: iterable or async iterable of list items
+        :param key: name of the list field inside the envelope object,
+                    a bare array is produced when not set
+        :param envelope: extra fields of the resulting object
+        :param transform: function applied to each item before serialization
+        :param batch_size: number of items serialized per chunk
+        """
+        self._items = items
+        self._key = key
+        self._envelope = envelope or {}
+        self._transform = transform
+        self._batch_size = batch_size
+
+    async def _iterate(self):
+        if hasattr(self._items, '__aiter__'):
+            async for item in self._items:
+                yield item
+        else:
+            for item in self._items:
+                yield item
+
+    def _bounds(self, ndjson: bool):
+        if ndjson:
+            prefix = JsonCodec.dumps_bytes(self._envelope) + b'\n' if self._envelope else b''
+            return prefix, b''
+        if self._key is None:
+            return b'[', b']'
+        head = JsonCodec.dumps_bytes(self._envelope)[:-1]
+        if self._envelope:
+            head += b','
+        return head + JsonCodec.dumps_bytes(self._key) + b':[', b']}'
+
+    def _serialize(self, batch: list, ndjson: bool, first: bool) -> bytes:
+        if ndjson:
+            return b''.join(JsonCodec.dumps_bytes(item) + b'\n' for item in batch)
+        chunk = b','.join(JsonCodec.dumps_bytes(item) for item in batch)
+        return chunk if first else b',' + chunk
+
+    async def chunks(self, ndjson: bool = False) -> AsyncIterator[bytes]:
+        """
+        Serialize the document chunk by chunk
+        :param ndjson: produce newline-delimited JSON instead of JSON document
+        :return: async iterator of UTF-8 encoded chunks
+        """
+        prefix, suffix = self._bounds(ndjson)
+        batch = []
+        first = True
+        async for item in self._iterate():
+            batch.append(self._transform(item) if self._transform else item)
+            if len(batch) >= self._batch_size:
+                chunk = self._serialize(batch, ndjson, first)
+                yield prefix + chunk if first else chunk
+                batch = []
+                first = False
+        chunk = self._serialize(batch, ndjson, first) if batch else b''
+        yield (prefix + chunk if first else chunk) + suffix
+
+    async def to_bytes(self, ndjson: bool = False) -> bytes:
+        """ Serialize the whole document at once """
+        return b''.join([chunk async for chunk in self.chunks(ndjson)])
 
 
 class Doc:
@@ -160,7 +300,7 @@ class JsonMessage(Json):
         Load the json to python interpretable Dictionary Object
         :return: :type: Dict
         """
-        return json.loads(self._source)
+        return JsonCodec.loads(self._source)
 
     def dump(self, data):
         """
@@ -168,7 +308,7 @@ class JsonMessage(Json):
         :param data: :type: Dict
         :return:
         """
-        self._source = json.dumps(data)
+        self._source = JsonCodec.dumps(data)
         return self._source
 
 class Payload:
@@ -245,6 +385,46 @@ class Payload:
     def data(self):
         return self._data
 
+class CompiledMapping:
+    """
+    Schema conversion of Payload.convert for dictionaries that are already
+    loaded. Dotted keys of the mapping are split once, when it is created,
+    so converting a document only walks the prepared key paths.
+    """
+
+    def __init__(self, map: dict):
+        """
+        :param map: mapping dictionary, see Payload.convert
+        """
+        self._plan = [(tuple(src.split('.')), tuple(dst.split('.')))
+                      for src, dst in map.items()]
+
+    def convert(self, source: dict, target: Optional[dict] = None) -> dict:
+        """
+        Copy values of the source to the target keys. Like Payload.convert,
+        a missing source key gives None and values are not copied.
+        :param target: dictionary to update, a new one if not set
+        :return: the target dictionary
+        """
+        if target is None:
+            target = {}
+        for src_path, dst_path in self._plan:
+            value = source
+            for key in src_path:
+                try:
+                    value = value[key]
+                except KeyError:
+                    value = None
+                    break
+            data = target
+            for key in dst_path[:-1]:
+                child = data.get(key)
+                if type(child) is not dict:
+                    child = data[key] = {}
+                data = child
+            data[dst_path[-1]] = value
+        return target
+
 class CommonPayload:
     """
     Implements a common payload to represent Json, Toml, Yaml, Ini Doc.
@@ -13,9 +13,12 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+import base64
+import binascii
+import json
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, List, Optional, Sequence
 from cortx.utils.data.access import SortOrder
 
 class SortBy:
@@ -34,3 +37,63 @@ class DateTimeRange:
     def __init__(self, start: Optional[datetime], end: Optional[datetime]):
         self.start = start
         self.end = end
+
+
+class PageCursor:
+    """
+    Position after the last record of a page, used like Elasticsearch
+    search_after: the next page is selected by the sort value instead of
+    an offset, so any page costs the same as the first one.
+    Records with the same sort value are told apart by their IDs, the
+    cursor keeps all the IDs already returned with the last value and the
+    next query excludes them.
+    """
+
+    def __init__(self, field: str, order: str, value: Any, ids: List[str]):
+        """
+        :param field: name of the sort field
+        :param order: "asc" or "desc"
+        :param value: primitive sort value of the last returned record
+        :param ids: IDs of the returned records having that value
+        """
+        self.field = field
+        self.order = order
+        self.value = value
+        self.ids = ids
+
+    def encode(self) -> str:
+        data = json.dumps([self.field, self.order, self.value, self.ids],
+                          separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token: str) -> 'PageCursor':
+        """
+        :raises ValueError: the token is not a cursor
+        """
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            field, order, value, ids = json.loads(data)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValueError(f"Invalid page cursor {token!r}")
+        if not isinstance(ids, list) or order not in ('asc', 'desc'):
+            raise ValueError(f"Invalid page cursor {token!r}")
+        return cls(field, order, value, ids)
+
+    @classmethod
+    def after(cls, items: Sequence, field: str, order: str, value_of: Callable,
+              id_of: Callable, previous: Optional['PageCursor'] = None
+              ) -> Optional['PageCursor']:
+        """
+        Cursor pointing after the last of the items
+        :param value_of: primitive sort value of an item
+        :param id_of: ID of an item
+        :param previous: cursor the items were fetched with
+        """
+        if not items:
+            return None
+        value = value_of(items[-1])
+        ids = [id_of(item) for item in items if value_of(item) == value]
+        if previous is not None and previous.value == value:
+            ids = previous.ids + ids
+        return cls(field, order, value, ids)
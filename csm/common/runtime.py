@@ -22,7 +22,10 @@ class Options:
     """
 
     debug = False
+    role = None
 
     @classmethod
     def parse(cls, args: List[str]) -> None:
         cls.debug = '--debug' in args
+        cls.role = next((arg.split('=', 1)[1] for arg in args
+                         if arg.startswith('--role=')), None)
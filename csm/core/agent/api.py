@@ -20,10 +20,10 @@ import asyncio
 import json
 import traceback
 import ssl
+import hashlib
 from concurrent.futures import CancelledError as ConcurrentCancelledError
 from asyncio import CancelledError as AsyncioCancelledError
-from weakref import WeakSet
-from aiohttp import web, web_exceptions
+from aiohttp import web, web_exceptions, hdrs
 from abc import ABC
 from secure import SecureHeaders
 from csm.core.providers.provider_factory import ProviderFactory
@@ -34,20 +34,28 @@ from cortx.utils.conf_store.conf_store import Conf
 from csm.common.conf import  ConfSection, DebugConf
 from cortx.utils.log import Log
 from cortx.utils.product_features import unsupported_features
-from csm.common.payload import Json
+from csm.common.payload import Json, JsonCodec, JsonStream
 from csm.common.services import Service
 from csm.core.blogic import const
 from csm.common.cluster import Cluster
 from csm.common.errors import (CsmError, CsmNotFoundError, CsmPermissionDenied,
                                CsmInternalError, InvalidRequest, ResourceExist,
-                               CsmNotImplemented, CsmServiceConflict, CsmGatewayTimeout)
+                               CsmNotImplemented, CsmServiceConflict, CsmGatewayTimeout,
+                               CsmServiceNotAvailable)
 from csm.core.routes import ApiRoutes
 from csm.core.services.alerts import AlertsAppService
 from csm.core.services.usl import UslService
 from csm.core.services.file_transfer import DownloadFileEntity
-from csm.core.controllers.view import CsmView, CsmResponse, CsmAuth
+from csm.core.services.feature_endpoints import FeatureEndpointMap, FeatureSupportCache
+from csm.core.controllers.view import CsmView, CsmResponse, CsmAuth, JsonStreamResponse
 from csm.core.controllers import CsmRoutes
-import re
+from csm.core.agent.websocket import (WebSocketClient, WsOverflowPolicy, WsReplayBuffer,
+                                      WsSubscriptions, WsTopic)
+
+try:
+    import brotli
+except ModuleNotFoundError:
+    brotli = None
 
 
 class CsmApi(ABC):
@@ -99,18 +107,32 @@ class CsmRestApi(CsmApi, ABC):
         CsmApi.init()
         CsmRestApi._queue = asyncio.Queue()
         CsmRestApi._bgtasks = []
-        CsmRestApi._wsclients = WeakSet()
+        CsmRestApi._wsclients = set()
+        CsmRestApi._ws_closed_stats = {}
+        ws_queue_size = Conf.get(const.CSM_GLOBAL_INDEX, 'WEBSOCKET>queue_size')
+        CsmRestApi._ws_queue_size = int(ws_queue_size) if ws_queue_size else const.WS_QUEUE_SIZE
+        ws_policy = Conf.get(const.CSM_GLOBAL_INDEX, 'WEBSOCKET>overflow_policy')
+        if ws_policy not in WsOverflowPolicy.ALL:
+            ws_policy = const.WS_OVERFLOW_POLICY
+        CsmRestApi._ws_overflow_policy = ws_policy
+        ws_replay_size = Conf.get(const.CSM_GLOBAL_INDEX, 'WEBSOCKET>replay_size')
+        CsmRestApi._ws_replay = WsReplayBuffer(
+            int(ws_replay_size) if ws_replay_size is not None else const.WS_REPLAY_SIZE)
+        CsmRestApi._feature_endpoints = FeatureEndpointMap(
+            const.FEATURE_ENDPOINT_MAPPING_SCHEMA, const.FEATURE_ENDPOINT_MAP_CHECK_INTERVAL)
+        CsmRestApi._feature_support = FeatureSupportCache(const.FEATURE_SUPPORT_CACHE_TTL)
 
         CsmRestApi._app = web.Application(
             middlewares=[CsmRestApi.set_secure_headers,
+                         CsmRestApi.http_cache_middleware,
                          CsmRestApi.rest_middleware,
                          CsmRestApi.session_middleware,
                          CsmRestApi.permission_middleware]
         )
 
-        CsmRoutes.add_routes(CsmRestApi._app)
         ApiRoutes.add_websocket_routes(
             CsmRestApi._app.router, CsmRestApi.process_websocket)
+        CsmRoutes.add_routes(CsmRestApi._app)
 
         CsmRestApi._app.on_startup.append(CsmRestApi._on_startup)
         CsmRestApi._app.on_shutdown.append(CsmRestApi._on_shutdown)
@@ -128,11 +150,16 @@ class CsmRestApi(CsmApi, ABC):
 
             if not feature_supported:
                 Log.debug(f"{const.LYVE_PILOT} is not supported.")
+                updated = False
                 for permissions in roles.values():
                     if permissions.get(const.PERMISSIONS).get(const.LYVE_PILOT):
                         del permissions.get(const.PERMISSIONS)[const.LYVE_PILOT]
+                        updated = True
                         Log.debug(f"{const.LYVE_PILOT} permissions removed.")
-                Json(const.ROLES_MANAGEMENT).dump(roles)
+                # Several agent processes may start at once, rewrite the file
+                # only when it has really changed
+                if updated:
+                    Json(const.ROLES_MANAGEMENT).dump(roles)
         except Exception as e_:
             Log.error(f"Error occurred while updating permissions: {e_}")
 
@@ -192,59 +219,35 @@ class CsmRestApi(CsmApi, ABC):
         return resp
 
     @staticmethod
-    def json_serializer(*args, **kwargs):
-        kwargs['default'] = str
-        return json.dumps(*args, **kwargs)
+    def json_serializer(obj):
+        return JsonCodec.dumps(obj)
 
     @staticmethod
     def json_response(resp_obj, status=200):
-        return web.json_response(
-            resp_obj, status=status, dumps=CsmRestApi.json_serializer)
+        return web.Response(body=JsonCodec.dumps_bytes(resp_obj), status=status,
+                            content_type='application/json', charset='utf-8')
 
     @classmethod
     def _unauthorised(cls, reason):
         Log.debug(f'Unautorized: {reason}')
         raise web.HTTPUnauthorized(headers=CsmAuth.UNAUTH)
 
-    @staticmethod
-    async def _resolve_handler(request):
-        match_info = await request.app.router.resolve(request)
-        return match_info.handler
-
-    @classmethod
-    async def _is_public(cls, request):
-        handler = await cls._resolve_handler(request)
-        return CsmView.is_public(handler, request.method)
-
-    @classmethod
-    async def _get_permissions(cls, request):
-        handler = await cls._resolve_handler(request)
-        return CsmView.get_permissions(handler, request.method)
-
     @staticmethod
     async def check_for_unsupported_endpoint(request):
         """
         Check whether the endpoint is supported. If not, send proper error
         reponse.
         """
-        def getMatchingEndpoint(endpoint_map, path):
-            for key,value in endpoint_map.items():
-                map_re = f'^{key}$'.replace("*", "[\w\d]*")
-                if re.search(rf"{map_re}", path):
-                    return value
-
-        feature_endpoint_map = Json(const.FEATURE_ENDPOINT_MAPPING_SCHEMA).load()
-        endpoint = getMatchingEndpoint(feature_endpoint_map, request.path)
+        endpoint = CsmRestApi._feature_endpoints.match(request.path)
         if endpoint:
-            unsupported_feature_instance = unsupported_features.UnsupportedFeaturesDB()
-            if endpoint[const.DEPENDENT_ON]:
-                for component in endpoint[const.DEPENDENT_ON]:
-                    if not await unsupported_feature_instance.is_feature_supported(component,endpoint[const.FEATURE_NAME]):
-                        Log.debug(f"The request {request.path} of feature {endpoint[const.FEATURE_NAME]} is not supported by {component}")
-                        raise InvalidRequest("This feature is not supported on this environment.")
-            if not await unsupported_feature_instance.is_feature_supported(const.CSM_COMPONENT_NAME, endpoint[const.FEATURE_NAME]):
-                Log.debug(f"The request {request.path} of feature {endpoint[const.FEATURE_NAME]} is not supported by {const.CSM_COMPONENT_NAME}")
-                raise InvalidRequest("This feature is not supported on this environment.")
+            feature_support = CsmRestApi._feature_support
+            components = list(endpoint[const.DEPENDENT_ON] or [])
+            components.append(const.CSM_COMPONENT_NAME)
+            for component in components:
+                if not await feature_support.is_feature_supported(
+                        component, endpoint[const.FEATURE_NAME]):
+                    Log.debug(f"The request {request.path} of feature {endpoint[const.FEATURE_NAME]} is not supported by {component}")
+                    raise InvalidRequest("This feature is not supported on this environment.")
         else:
             Log.debug(f"Feature endpoint is not found for {request.path}")
 
@@ -252,8 +255,11 @@ class CsmRestApi(CsmApi, ABC):
     @web.middleware
     async def session_middleware(cls, request, handler):
         session = None
-        is_public = await cls._is_public(request)
-        if not is_public:
+        # aiohttp has already resolved the route, look up its precomputed
+        # auth info once and pass it down to the permission middleware
+        route_auth = CsmRoutes.get_route_auth(request.match_info, request.method)
+        request.route_auth = route_auth
+        if not route_auth.public:
             hdr = request.headers.get(CsmAuth.HDR)
             if not hdr:
                 cls._unauthorised(f'No {CsmAuth.HDR} header')
@@ -281,8 +287,8 @@ class CsmRestApi(CsmApi, ABC):
     async def permission_middleware(cls, request, handler):
         if request.session is not None:
             # Check user permissions
-            required = await cls._get_permissions(request)
-            verdict = (request.session.permissions & required) == required
+            required = request.route_auth.permissions
+            verdict = request.session.permissions.issuperset(required)
             Log.debug(f'Required permissions: {required}')
             Log.debug(f'User permissions: {request.session.permissions}')
             Log.debug(f'Allow access: {verdict}')
@@ -297,6 +303,112 @@ class CsmRestApi(CsmApi, ABC):
         SecureHeaders(csp=True).aiohttp(resp)
         return resp
 
+    @staticmethod
+    def _negotiate_encoding(request, allow_brotli=True):
+        """
+        Choose the response content coding from the Accept-Encoding header
+        :return: 'br', 'gzip' or None
+        """
+        accepted = set()
+        for item in request.headers.get(hdrs.ACCEPT_ENCODING, '').lower().split(','):
+            coding, *params = item.split(';')
+            quality = 1.0
+            for param in params:
+                name, _, value = param.strip().partition('=')
+                if name == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0
+            if quality > 0:
+                accepted.add(coding.strip())
+        if allow_brotli and brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def _parse_etag(etag):
+        """
+        :return: weakness prefix ('W/' or ''), opaque tag without quotes
+        """
+        if not etag:
+            return '', ''
+        etag = etag.strip()
+        weak = ''
+        if etag.startswith('W/'):
+            weak, etag = 'W/', etag[2:]
+        return weak, etag.strip('"')
+
+    @staticmethod
+    def _etag_matches(if_none_match, etag) -> bool:
+        """ Weak comparison, as If-None-Match requires """
+        if not if_none_match:
+            return False
+        etag = CsmRestApi._parse_etag(etag)[1]
+        for candidate in if_none_match.split(','):
+            candidate = candidate.strip()
+            if candidate == '*' or CsmRestApi._parse_etag(candidate)[1] == etag:
+                return True
+        return False
+
+    @staticmethod
+    @web.middleware
+    async def http_cache_middleware(request, handler):
+        """
+        Add strong ETags to successful GET responses and answer If-None-Match
+        with 304, compress response bodies above the configured size.
+        A handler may set its own ETag (e.g. a data version counter, a weak
+        one stays weak), then the body is not hashed. Streamed responses are
+        buffered and handled the same way unless they are too large, then
+        they are only gzipped.
+        """
+        resp = await handler(request)
+        if isinstance(resp, JsonStreamResponse):
+            body = None
+            if request.method in (hdrs.METH_GET, hdrs.METH_HEAD) and resp.status == 200:
+                # The stream is read here, outside of rest_middleware
+                try:
+                    body = await resp.read_ahead(const.HTTP_STREAM_READ_AHEAD_SIZE)
+                except Exception as e:
+                    return CsmRestApi.exception_response(e, request)
+            if body is None:
+                resp.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+                if CsmRestApi._negotiate_encoding(request, allow_brotli=False):
+                    resp.enable_compression(web.ContentCoding.gzip)
+                return resp
+            resp = web.Response(body=body, status=resp.status, headers=resp.headers)
+        if not isinstance(resp, web.Response) or not isinstance(resp.body, bytes):
+            return resp
+
+        body = resp.body
+        encoding = None
+        if len(body) >= const.HTTP_COMPRESSION_MIN_SIZE:
+            encoding = CsmRestApi._negotiate_encoding(request)
+            resp.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+        if request.method in (hdrs.METH_GET, hdrs.METH_HEAD) and resp.status == 200:
+            weak, version = CsmRestApi._parse_etag(resp.headers.get(hdrs.ETAG))
+            if not version:
+                weak, version = '', hashlib.blake2b(body, digest_size=16).hexdigest()
+            # Strong validators must differ between content codings
+            etag = f'{weak}"{version}-{encoding}"' if encoding else f'{weak}"{version}"'
+            resp.headers[hdrs.ETAG] = etag
+            if CsmRestApi._etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), etag):
+                not_modified = web.Response(status=304)
+                for header in (hdrs.ETAG, hdrs.VARY):
+                    if header in resp.headers:
+                        not_modified.headers[header] = resp.headers[header]
+                return not_modified
+
+        if encoding == 'br':
+            resp.body = brotli.compress(body, quality=const.HTTP_BROTLI_QUALITY)
+            resp.headers[hdrs.CONTENT_ENCODING] = 'br'
+        elif encoding == 'gzip':
+            resp.enable_compression(web.ContentCoding.gzip)
+        return resp
+
     @staticmethod
     @web.middleware
     async def rest_middleware(request, handler):
@@ -310,6 +422,11 @@ class CsmRestApi(CsmApi, ABC):
                 file_resp.headers['Content-Disposition'] = f'attachment; filename="{resp.filename}"'
                 return file_resp
 
+            if isinstance(resp, JsonStream):
+                CsmRestApi.process_audit_log(resp, request, 200)
+                return JsonStreamResponse(
+                    resp, ndjson=JsonStreamResponse.accepts_ndjson(request))
+
             if isinstance(resp, web.StreamResponse):
                 Log.audit(f'{CsmRestApi.http_request_to_log_string(request)} RC: {resp.status}')
                 return resp
@@ -334,36 +451,47 @@ class CsmRestApi(CsmApi, ABC):
         except web.HTTPException as e:
             Log.error(f'HTTP Exception {e.status}: {e.reason}')
             raise e
-        except InvalidRequest as e:
+        except Exception as e:
+            return CsmRestApi.exception_response(e, request)
+
+    @staticmethod
+    def exception_response(e: Exception, request) -> web.Response:
+        """ JSON error response of an exception raised while handling the request """
+        if isinstance(e, InvalidRequest):
             Log.error(f"Error: {e} \n {traceback.format_exc()}")
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=400)
-        except CsmNotFoundError as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=404)
-        except CsmPermissionDenied as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=403)
-        except ResourceExist  as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request),
-                                            status=const.STATUS_CONFLICT)
-        except CsmInternalError as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=500)
-        except CsmNotImplemented as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=501)
-        except CsmGatewayTimeout as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=504)
-        except CsmServiceConflict as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=409)
-        except (CsmError, InvalidRequest) as e:
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=400)
-        except KeyError as e:
+            status = 400
+        elif isinstance(e, CsmNotFoundError):
+            status = 404
+        elif isinstance(e, CsmPermissionDenied):
+            status = 403
+        elif isinstance(e, ResourceExist):
+            status = const.STATUS_CONFLICT
+        elif isinstance(e, CsmInternalError):
+            status = 500
+        elif isinstance(e, CsmNotImplemented):
+            status = 501
+        elif isinstance(e, CsmGatewayTimeout):
+            status = 504
+        elif isinstance(e, CsmServiceConflict):
+            status = 409
+        elif isinstance(e, CsmServiceNotAvailable):
+            resp = CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=503)
+            resp.headers[hdrs.RETRY_AFTER] = str(const.LOGIN_RETRY_AFTER)
+            return resp
+        elif isinstance(e, CsmError):
+            status = 400
+        elif isinstance(e, KeyError):
             Log.error(f"Error: {e} \n {traceback.format_exc()}")
             message = f"Missing Key for {e}"
             return CsmRestApi.json_response(CsmRestApi.error_response(KeyError(message), request), status=422)
-        except Exception as e:
+        else:
             Log.critical(f"Unhandled Exception Caught: {e} \n {traceback.format_exc()}")
-            return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=500)
+            status = 500
+        return CsmRestApi.json_response(CsmRestApi.error_response(e, request), status=status)
 
     @staticmethod
-    def run(port: int, https_conf: ConfSection, debug_conf: DebugConf):
+    def run(port: int, https_conf: ConfSection, debug_conf: DebugConf,
+            reuse_port: bool = False):
         if not debug_conf.http_enabled:
             port = https_conf.port
             ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
@@ -375,7 +503,8 @@ class CsmRestApi(CsmApi, ABC):
         else:
             ssl_context = None
 
-        web.run_app(CsmRestApi._app, port=port, ssl_context=ssl_context, access_log=None)
+        web.run_app(CsmRestApi._app, port=port, ssl_context=ssl_context, access_log=None,
+                    reuse_port=reuse_port or None)
 
     @staticmethod
     async def process_request(request):
@@ -407,24 +536,33 @@ class CsmRestApi(CsmApi, ABC):
         ws = web.WebSocketResponse()
         await ws.prepare(request)
         Log.debug('REST API websock connection opened')
-        CsmRestApi._wsclients.add(ws)
+        client = WebSocketClient(ws, CsmRestApi._ws_queue_size, CsmRestApi._ws_overflow_policy)
+        client.start()
+        CsmRestApi._wsclients.add(client)
 
         try:
             async for msg in ws:
                 if msg.type == web.WSMsgType.TEXT:
-                    Log.debug('REST API websock msg (ignored): %s' % msg)
+                    Log.debug('REST API websock msg: %s' % msg)
+                    CsmRestApi._websock_request(client, msg.data)
                 elif msg.type == web.WSMsgType.ERROR:
                     Log.debug('REST API websock exception: %s' % ws.exception())
             Log.debug('REST API websock connection closed')
             await ws.close()
         finally:
-            CsmRestApi._wsclients.discard(ws)
+            CsmRestApi._wsclients.discard(client)
+            await client.stop()
+            for name, value in client.stats().items():
+                if name not in ('queue_depth', 'max_queue_depth'):
+                    CsmRestApi._ws_closed_stats[name] = (
+                        CsmRestApi._ws_closed_stats.get(name, 0) + value)
         return ws
 
     @staticmethod
     async def _on_startup(app):
         Log.debug('REST API startup')
         CsmRestApi._bgtasks.append(app.loop.create_task(CsmRestApi._websock_bg()))
+        CsmRestApi._bgtasks.append(app.loop.create_task(CsmRestApi._websock_stats_bg()))
         CsmRestApi._bgtasks.append(app.loop.create_task(CsmRestApi._ssl_cert_check_bg()))
 
     @staticmethod
@@ -438,23 +576,90 @@ class CsmRestApi(CsmApi, ABC):
         Log.debug('REST API websock background task started')
         try:
             while True:
-                msg = await CsmRestApi._queue.get()
-                await CsmRestApi._websock_broadcast(msg)
+                topic, msg, epoch, seq = await CsmRestApi._queue.get()
+                await CsmRestApi._websock_broadcast(topic, msg, epoch, seq)
         except AsyncioCancelledError:
             Log.debug('REST API websock background task canceled')
 
         Log.debug('REST API websock background task done')
 
     @staticmethod
-    async def _websock_broadcast(msg):
-        # do explicit copy because the list can change asynchronously
-        clients = CsmRestApi._wsclients.copy()
+    def _websock_resume(client, request):
+        """
+        Replay events the client missed after the sequence number it has seen.
+        If some of them are gone, the client has to reload the data by REST API.
+        """
+        replay = CsmRestApi._ws_replay
+        seq = request.get('seq')
+        events = replay.since(request.get('epoch'), seq) if isinstance(seq, int) else None
+        if events is not None:
+            events = [event for event in events
+                      if client.subscriptions.match(event.topic, event.data)]
+        # Replay that does not fit into the send queue would be truncated
+        if events is None or len(events) >= client.max_queue:
+            client.enqueue(JsonCodec.dumps({'action': 'resync_required',
+                                            'epoch': replay.epoch, 'seq': replay.last_seq}))
+            return
+        client.enqueue(JsonCodec.dumps({'action': 'resumed', 'epoch': replay.epoch,
+                                        'seq': replay.last_seq, 'replayed': len(events)}))
+        for event in events:
+            client.enqueue(client.subscriptions.format(event), event.key)
+
+    @staticmethod
+    def _websock_request(client, text):
+        """ Handle a subscription or resume request of a websocket client """
+        try:
+            request = JsonCodec.loads(text)
+        except ValueError:
+            client.enqueue(JsonCodec.dumps({'action': 'error', 'message': 'invalid JSON'}))
+            return
+        if isinstance(request, dict) and request.get('action') == WsSubscriptions.RESUME:
+            CsmRestApi._websock_resume(client, request)
+            return
+        reply = client.subscriptions.handle_request(request)
+        if reply['action'] != 'error':
+            # The client resumes from here after a reconnect
+            reply['epoch'] = CsmRestApi._ws_replay.epoch
+            reply['seq'] = CsmRestApi._ws_replay.last_seq
+        client.enqueue(JsonCodec.dumps(reply))
+
+    @staticmethod
+    async def _websock_broadcast(topic, msg, epoch=None, seq=None):
+        data = msg.to_primitive() if hasattr(msg, 'to_primitive') else msg
+        event = CsmRestApi._ws_replay.append(topic, data, epoch, seq)
+        try:
+            # Enqueueing never waits, so the set can not change while iterating
+            for client in CsmRestApi._wsclients:
+                if client.subscriptions.match(topic, data):
+                    client.enqueue(client.subscriptions.format(event), event.key)
+        except Exception as e:
+            Log.error(f'REST API websock broadcast error: {e}')
+
+    @staticmethod
+    def websocket_stats() -> dict:
+        """ Websocket push counters, totals include closed connections """
+        stats = dict(CsmRestApi._ws_closed_stats)
+        stats['clients'] = len(CsmRestApi._wsclients)
+        stats['queue_depth'] = 0
+        stats['max_queue_depth'] = 0
+        for client in CsmRestApi._wsclients:
+            for name, value in client.stats().items():
+                if name == 'max_queue_depth':
+                    stats[name] = max(stats[name], value)
+                else:
+                    stats[name] = stats.get(name, 0) + value
+        return stats
+
+    @staticmethod
+    async def _websock_stats_bg():
+        """ Log the websocket push counters periodically while there are clients """
         try:
-            for ws in clients:
-                json_msg = CsmRestApi.json_serializer(msg)
-                await ws.send_str(json_msg)
-        except:
-            Log.debug('REST API websock broadcast error')
+            while True:
+                await asyncio.sleep(const.WS_STATS_INTERVAL)
+                if CsmRestApi._wsclients:
+                    Log.info(f"Websocket push metrics: {CsmRestApi.websocket_stats()}")
+        except AsyncioCancelledError:
+            Log.debug('REST API websock stats task canceled')
 
     @classmethod
     async def _ssl_cert_check_bg(cls):
@@ -468,20 +673,35 @@ class CsmRestApi(CsmApi, ABC):
         Log.debug('SSL certificate expiry check background task done')
 
     @staticmethod
-    async def _async_push(msg):
-        return await CsmRestApi._queue.put(msg)
+    async def _async_push_event(topic, msg, epoch=None, seq=None):
+        """
+        Queue an event for websocket clients
+        :param epoch: epoch of the process that numbered the event
+        :param seq: sequence number of the event, the event is numbered here if not set
+        """
+        return await CsmRestApi._queue.put((topic, msg, epoch, seq))
 
     @staticmethod
-    def push(alert):
-        coro = CsmRestApi._async_push(alert)
+    def push_event(topic, msg):
+        """ Push an event of the topic to websocket clients, thread safe """
+        coro = CsmRestApi._async_push_event(topic, msg)
         asyncio.run_coroutine_threadsafe(coro, CsmRestApi._app.loop)
         return True
 
+    @staticmethod
+    def push(alert):
+        return CsmRestApi.push_event(WsTopic.ALERTS, alert)
+
 
 class AlertHttpNotifyService(Service):
-    def __init__(self):
+    def __init__(self, publish=None):
+        """
+        :param publish: callable delivering an alert to websocket clients,
+                        CsmRestApi.push by default
+        """
         super().__init__()
         self.unpublished_alerts = set()
+        self._publish = publish or CsmRestApi.push
 
     def push_unpublished(self):
         while self.unpublished_alerts:
@@ -489,5 +709,5 @@ class AlertHttpNotifyService(Service):
 
     def handle_alert(self, alert):
         self.unpublished_alerts.add(alert)
-        if CsmRestApi.push(alert):
+        if self._publish(alert):
             self.unpublished_alerts.discard(alert)
@@ -15,10 +15,14 @@
 
 import sys
 import os
+import errno
 import glob
+import signal
+import asyncio
 import traceback
 import json
 from aiohttp import web
+from functools import partial
 from importlib import import_module
 import pathlib
 
@@ -32,8 +36,18 @@ def import_plugin_module(name):
 class CsmAgent:
     """ CSM Core Agent / Deamon """
 
+    role = None
+    workers = 1
+    ipc_client = None
+    alert_summary_reconciler = None
+    alert_history_compactor = None
+    events = None
+    # Numbering of websocket events in the background process
+    ws_events = None
+    _alert_summary_version = None
+
     @staticmethod
-    def init():
+    def load_conf():
         Conf.load(const.CSM_GLOBAL_INDEX, f"yaml://{const.CSM_CONF}")
         syslog_port = Conf.get(const.CSM_GLOBAL_INDEX, "Log>syslog_port")
         backup_count = Conf.get(const.CSM_GLOBAL_INDEX, "Log>total_files")
@@ -45,6 +59,24 @@ class CsmAgent:
                file_size_in_mb=int(file_size_in_mb) if file_size_in_mb else None,
                log_path=Conf.get(const.CSM_GLOBAL_INDEX, "Log>log_path"),
                level=Conf.get(const.CSM_GLOBAL_INDEX, "Log>log_level"))
+        workers = Conf.get(const.CSM_GLOBAL_INDEX, const.CSM_AGENT_WORKERS_KEY)
+        CsmAgent.workers = int(workers) if workers else 1
+        if Options.role:
+            CsmAgent.role = Options.role
+        elif CsmAgent.workers <= 1:
+            CsmAgent.role = const.CSM_AGENT_ROLE_STANDALONE
+        else:
+            # Supervisor of the pre-forked agent processes
+            CsmAgent.role = None
+        multi_process = CsmAgent.workers > 1 or CsmAgent.role == const.CSM_AGENT_ROLE_HTTP
+        store_type = Conf.get(const.CSM_GLOBAL_INDEX, const.SESSION_STORE_KEY)
+        if multi_process and store_type != const.SESSION_STORE_CONSUL:
+            # A session created by one worker would be unknown to the others
+            raise CsmError(errno.EINVAL, f"{const.SESSION_STORE_KEY} must be "
+                           f"{const.SESSION_STORE_CONSUL} when the agent runs several workers")
+
+    @staticmethod
+    def init():
         if Conf.get(const.CSM_GLOBAL_INDEX, "DEPLOYMENT>mode") != const.DEV:
             Security.decrypt_conf()
         from cortx.utils.data.db.db_provider import (DataBaseProvider, GeneralConfig)
@@ -60,18 +92,26 @@ class CsmAgent:
 
         Conf.load(const.DATABASE_INDEX, f"yaml://{const.DATABASE_CONF}")
 
-        #Remove all Old Shutdown Cron Jobs
-        CronJob(Conf.get(const.CSM_GLOBAL_INDEX, const.NON_ROOT_USER_KEY)).remove_job(const.SHUTDOWN_COMMENT)
-        #todo: Remove the below line it only dumps the data when server starts.
-        # kept for debugging alerts_storage.add_data()
+        # HTTP workers start after the background process has finished
+        # initialization, so one-time cleanup is done only once
+        is_http_worker = CsmAgent.role == const.CSM_AGENT_ROLE_HTTP
+        if not is_http_worker:
+            #Remove all Old Shutdown Cron Jobs
+            CronJob(Conf.get(const.CSM_GLOBAL_INDEX, const.NON_ROOT_USER_KEY)).remove_job(const.SHUTDOWN_COMMENT)
+            #todo: Remove the below line it only dumps the data when server starts.
+            # kept for debugging alerts_storage.add_data()
 
-        # Clearing cached files
-        cached_files = glob.glob(const.CSM_TMP_FILE_CACHE_DIR + '/*')
-        for f in cached_files:
-            os.remove(f)
+            # Clearing cached files
+            cached_files = glob.glob(const.CSM_TMP_FILE_CACHE_DIR + '/*')
+            for f in cached_files:
+                os.remove(f)
 
         # Alert configuration
-        alerts_repository = AlertRepository(db)
+        es_config = db_config['databases']["es_db"]["config"]
+        es_bulk = EsBulkClient(es_config["host"], es_config[const.PORT],
+                               es_config.get("login"), es_config.get("password"),
+                               indexes=EsBulkClient.model_indexes(db_config))
+        alerts_repository = AlertRepository(db, es_bulk)
         alerts_service = AlertsAppService(alerts_repository)
         CsmRestApi.init(alerts_service)
 
@@ -88,20 +128,42 @@ class CsmAgent:
         health_plugin = import_plugin_module(const.HEALTH_PLUGIN)
         health_plugin_obj = health_plugin.HealthPlugin()
         health_service = HealthAppService(health_repository, alerts_repository, \
-            health_plugin_obj)
+            health_plugin_obj, persist_schema=not is_http_worker)
+        # Alert and health events are delivered off the plugin threads
+        CsmAgent.events = EventBus()
         CsmAgent.health_monitor = HealthMonitorService(\
-                health_plugin_obj, health_service)
+                health_plugin_obj, health_service, CsmAgent.events)
+        CsmAgent.events.subscribe(HealthEvent, lambda event: CsmAgent._push_ws_event(
+            WsTopic.HEALTH, event.delta), 'health_websocket')
         CsmRestApi._app[const.HEALTH_SERVICE] = health_service
 
-        http_notifications = AlertHttpNotifyService()
+        if is_http_worker:
+            # Acknowledged alerts must be updated in the open alert index
+            # of the background process
+            alerts_repository.add_listener(CsmAgent._send_alert_update)
+        if CsmAgent.role == const.CSM_AGENT_ROLE_BACKGROUND:
+            # Alerts are pushed to websocket clients by the HTTP workers
+            CsmAgent.ws_events = WsReplayBuffer(0)
+            CsmAgent.ipc_server = IpcServer(const.CSM_AGENT_IPC_SOCKET,
+                                            const.CSM_AGENT_IPC_MAX_MESSAGE_SIZE, {
+                    const.CSM_AGENT_IPC_TOPIC_ALERT_UPDATE: partial(
+                        CsmAgent._on_alert_update, alerts_service),
+                    const.CSM_AGENT_IPC_TOPIC_WS_EVENT: lambda message: CsmAgent._push_ws_event(
+                        message['topic'], message['payload']),
+                })
+            http_notifications = AlertHttpNotifyService(CsmAgent._publish_alert)
+        else:
+            http_notifications = AlertHttpNotifyService()
         pm = import_plugin_module(const.ALERT_PLUGIN)
         CsmAgent.alert_monitor = AlertMonitorService(alerts_repository,\
-                pm.AlertPlugin(), CsmAgent.health_monitor.health_plugin, \
-                http_notifications)
+                pm.AlertPlugin(), CsmAgent.health_monitor.health_plugin, CsmAgent.events)
         email_queue = EmailSenderQueue()
-        email_queue.start_worker_sync()
+        if not is_http_worker:
+            email_queue.start_worker_sync()
 
-        CsmAgent.alert_monitor.add_listener(http_notifications.handle_alert)
+        # Only new alerts are pushed, updates of them are not
+        CsmAgent.events.subscribe(NewAlertEvent, lambda event: http_notifications.handle_alert(
+            event.alert), 'alert_http_notifications')
         CsmRestApi._app["alerts_service"] = alerts_service
 
        # Network file manager registration
@@ -114,10 +176,11 @@ class CsmAgent:
 
         # User/Role/Session management services
         roles = Json(const.ROLES_MANAGEMENT).load()
-        auth_service = AuthService()
+        password_verifier = CsmAgent._create_password_verifier()
+        auth_service = AuthService(password_verifier)
         user_manager = UserManager(db)
         role_manager = RoleManager(roles)
-        session_manager = SessionManager()
+        session_manager = SessionManager(CsmAgent._create_session_store(db))
         CsmRestApi._app.login_service = LoginService(auth_service,
                                                      user_manager,
                                                      role_manager,
@@ -136,7 +199,8 @@ class CsmAgent:
         email_notifier = AlertEmailNotifier(email_queue, system_config_mgr,
             Template.from_file(const.CSM_ALERT_EMAIL_NOTIFICATION_TEMPLATE_REL),
             user_manager)
-        CsmAgent.alert_monitor.add_listener(email_notifier.handle_alert)
+        CsmAgent.events.subscribe(AlertEvent, lambda event: email_notifier.handle_alert(
+            event.alert), 'alert_email_notifications')
 
         CsmRestApi._app["onboarding_config_service"] = OnboardingConfigService(db)
         # audit log download api
@@ -161,9 +225,10 @@ class CsmAgent:
         CsmRestApi._app[const.S3_ACCESS_KEYS_SERVICE] = S3AccessKeysService(s3)
         CsmRestApi._app[const.S3_SERVER_INFO_SERVICE] = S3ServerInfoService(provisioner)
 
-        user_service = CsmUserService(provisioner, user_manager)
+        user_service = CsmUserService(provisioner, user_manager, password_verifier)
         CsmRestApi._app[const.CSM_USER_SERVICE] = user_service
         update_repo = UpdateStatusRepository(db)
+        update_repo.add_listener(partial(CsmAgent._push_ws_event, WsTopic.UPDATE_STATUS))
         security_service = SecurityService(db, provisioner)
         CsmRestApi._app[const.HOTFIX_UPDATE_SERVICE] = HotfixApplicationService(
             Conf.get(const.CSM_GLOBAL_INDEX, 'UPDATE>hotfix_store_path'), provisioner, update_repo)
@@ -184,6 +249,31 @@ class CsmAgent:
         # TODO : Replace PcsHAFramework with hare utility
         CsmRestApi._app[const.MAINTENANCE_SERVICE] = MaintenanceAppService(CortxHAFramework(),  provisioner, db)
 
+    @staticmethod
+    def _create_password_verifier():
+        concurrency = Conf.get(const.CSM_GLOBAL_INDEX, 'LOGIN>verify_concurrency')
+        queue_size = Conf.get(const.CSM_GLOBAL_INDEX, 'LOGIN>queue_size')
+        queue_timeout = Conf.get(const.CSM_GLOBAL_INDEX, 'LOGIN>queue_timeout')
+        return PasswordVerifier(
+            int(concurrency) if concurrency else const.PASSWD_VERIFY_CONCURRENCY,
+            int(queue_size) if queue_size else const.PASSWD_VERIFY_QUEUE_SIZE,
+            float(queue_timeout) if queue_timeout else const.PASSWD_VERIFY_QUEUE_TIMEOUT)
+
+    @staticmethod
+    def _create_session_store(db):
+        store_type = Conf.get(const.CSM_GLOBAL_INDEX, const.SESSION_STORE_KEY)
+        if store_type == const.SESSION_STORE_CONSUL:
+            cluster_id = Conf.get(const.CSM_GLOBAL_INDEX, const.CLUSTER_ID_KEY)
+            cipher_key = Cipher.generate_key(cluster_id, const.SESSION_CIPHER_KEY_NAME)
+            cache_size = Conf.get(const.CSM_GLOBAL_INDEX, 'SESSION>cache_size')
+            cache_ttl = Conf.get(const.CSM_GLOBAL_INDEX, 'SESSION>cache_ttl')
+            flush_interval = Conf.get(const.CSM_GLOBAL_INDEX, 'SESSION>flush_interval')
+            return ConsulSessionStore(db, cipher_key,
+                int(cache_size) if cache_size else const.SESSION_CACHE_SIZE,
+                float(cache_ttl) if cache_ttl else const.SESSION_CACHE_TTL,
+                float(flush_interval) if flush_interval else const.SESSION_FLUSH_INTERVAL)
+        return InMemorySessionStore()
+
     @staticmethod
     def _daemonize():
         """ Change process into background service """
@@ -212,14 +302,150 @@ class CsmAgent:
         with open(pidfile, "w") as f:
             f.write(str(os.getpid()))
 
+    @staticmethod
+    def _publish_alert(alert):
+        return CsmAgent._push_ws_event(WsTopic.ALERTS, alert)
+
+    @staticmethod
+    def _push_ws_event(topic, payload):
+        """ Push an event to websocket clients of all agent processes """
+        if CsmAgent.role == const.CSM_AGENT_ROLE_BACKGROUND:
+            # Events are numbered once for all HTTP workers, so a websocket
+            # client may resume on any of them
+            event = CsmAgent.ws_events.append(topic, payload)
+            CsmAgent.ipc_server.publish(const.CSM_AGENT_IPC_TOPIC_WS_EVENT, {
+                'topic': topic, 'payload': payload, 'epoch': event.epoch, 'seq': event.seq})
+        elif CsmAgent.role == const.CSM_AGENT_ROLE_HTTP:
+            # Numbered and sent to all workers by the background process
+            CsmRestApi._app.loop.call_soon_threadsafe(
+                CsmAgent.ipc_client.send, const.CSM_AGENT_IPC_TOPIC_WS_EVENT,
+                {'topic': topic, 'payload': payload})
+        else:
+            CsmRestApi.push_event(topic, payload)
+        return True
+
+    @staticmethod
+    async def _push_ipc_ws_event(message):
+        await CsmRestApi._async_push_event(message['topic'], message['payload'],
+                                           message['epoch'], message['seq'])
+
+    @staticmethod
+    def _send_alert_update(alert):
+        if CsmAgent.ipc_client is not None:
+            CsmAgent.ipc_client.send(const.CSM_AGENT_IPC_TOPIC_ALERT_UPDATE,
+                                     alert.to_primitive())
+
+    @staticmethod
+    def _on_alert_update(alerts_service, alert):
+        alert = AlertModel(alert)
+        alerts_service.repo.open_alerts.put(alert)
+        alerts_service.summary.update(alert)
+
+    @staticmethod
+    async def _publish_alert_summary():
+        alerts_service = CsmRestApi._app["alerts_service"]
+        version = alerts_service.summary.version
+        summary = alerts_service.summary.get()
+        if summary is not None and version != CsmAgent._alert_summary_version:
+            CsmAgent.ipc_server.publish(const.CSM_AGENT_IPC_TOPIC_ALERT_SUMMARY,
+                                        summary, retain=True)
+            CsmAgent._alert_summary_version = version
+
+    @staticmethod
+    def _start_alert_summary(loop):
+        """ Count open alerts now and recount them periodically """
+        alerts_service = CsmRestApi._app["alerts_service"]
+        reconciler = Periodic(const.ALERT_SUMMARY_RECONCILE_INTERVAL,
+                              alerts_service.reconcile_alert_summary, loop)
+        reconciler.start()
+        return reconciler
+
+    @staticmethod
+    def _start_alert_history_compaction(loop):
+        """ Merge repeated alert history records periodically """
+        alerts_service = CsmRestApi._app["alerts_service"]
+        compactor = Periodic(const.ALERT_HISTORY_COMPACT_INTERVAL,
+                             alerts_service.compact_alerts_history, loop)
+        compactor.start(now=False)
+        return compactor
+
+    @staticmethod
+    async def _on_standalone_startup(app):
+        CsmAgent.alert_summary_reconciler = CsmAgent._start_alert_summary(app.loop)
+        CsmAgent.alert_history_compactor = CsmAgent._start_alert_history_compaction(app.loop)
+
+    @staticmethod
+    async def _publish_health_snapshot():
+        health_service = CsmRestApi._app[const.HEALTH_SERVICE]
+        CsmAgent.ipc_server.publish(const.CSM_AGENT_IPC_TOPIC_HEALTH,
+                                    health_service.get_health_snapshot(), retain=True)
+
+    @staticmethod
+    async def _on_http_worker_startup(app):
+        health_service = app[const.HEALTH_SERVICE]
+        CsmAgent.ipc_client = IpcClient(const.CSM_AGENT_IPC_SOCKET, {
+                const.CSM_AGENT_IPC_TOPIC_HEALTH: health_service.set_health_snapshot,
+                const.CSM_AGENT_IPC_TOPIC_WS_EVENT: CsmAgent._push_ipc_ws_event,
+                const.CSM_AGENT_IPC_TOPIC_ALERT_SUMMARY: app["alerts_service"].set_alert_summary,
+            }, const.CSM_AGENT_IPC_RECONNECT_INTERVAL, const.CSM_AGENT_IPC_MAX_MESSAGE_SIZE)
+        CsmRestApi._bgtasks.append(app.loop.create_task(CsmAgent.ipc_client.run()))
+
+    @staticmethod
+    def supervise():
+        """ Run HTTP workers and the background process and restart them if they die """
+        if not Options.debug:
+            CsmAgent._daemonize()
+        args = ['--debug'] if Options.debug else []
+        AgentSupervisor(CsmAgent.workers, args).run()
+
+    @staticmethod
+    def _run_background():
+        """ Consume alerts and health updates and publish them to HTTP workers """
+        loop = asyncio.get_event_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, loop.stop)
+        loop.run_until_complete(CsmAgent.ipc_server.start())
+        health_publisher = Periodic(const.CSM_AGENT_HEALTH_SNAPSHOT_INTERVAL,
+                                    CsmAgent._publish_health_snapshot, loop)
+        health_publisher.start()
+        summary_reconciler = CsmAgent._start_alert_summary(loop)
+        summary_publisher = Periodic(const.CSM_AGENT_ALERT_SUMMARY_INTERVAL,
+                                     CsmAgent._publish_alert_summary, loop)
+        summary_publisher.start()
+        history_compactor = CsmAgent._start_alert_history_compaction(loop)
+        CsmAgent.health_monitor.start()
+        CsmAgent.alert_monitor.start()
+        loop.run_forever()
+        Log.info("Started stopping csm agent background process")
+        health_publisher.stop()
+        summary_publisher.stop()
+        summary_reconciler.stop()
+        history_compactor.stop()
+        CsmAgent.alert_monitor.stop()
+        CsmAgent.health_monitor.stop()
+        CsmAgent.events.stop()
+        loop.run_until_complete(CsmAgent.ipc_server.stop())
+        Log.info("Finished stopping csm agent background process")
+
     @staticmethod
     def run():
+        if CsmAgent.role == const.CSM_AGENT_ROLE_BACKGROUND:
+            CsmAgent._run_background()
+            return
+
         https_conf = ConfSection(Conf.get(const.CSM_GLOBAL_INDEX, "HTTPS"))
         debug_conf = DebugConf(ConfSection(Conf.get(const.CSM_GLOBAL_INDEX, "DEBUG")))
         port = Conf.get(const.CSM_GLOBAL_INDEX, 'CSM_SERVICE>CSM_AGENT>port')
 
+        if CsmAgent.role == const.CSM_AGENT_ROLE_HTTP:
+            CsmRestApi._app.on_startup.append(CsmAgent._on_http_worker_startup)
+            CsmRestApi.run(port, https_conf, debug_conf, reuse_port=True)
+            Log.info("Finished stopping csm agent HTTP worker")
+            return
+
         if not Options.debug:
             CsmAgent._daemonize()
+        CsmRestApi._app.on_startup.append(CsmAgent._on_standalone_startup)
         CsmAgent.health_monitor.start()
         CsmAgent.alert_monitor.start()
         CsmRestApi.run(port, https_conf, debug_conf)
@@ -242,9 +468,12 @@ if __name__ == '__main__':
     from csm.common.template import Template
     from csm.core.blogic import const
     from csm.core.services.alerts import AlertsAppService, AlertEmailNotifier, \
-                                        AlertMonitorService, AlertRepository
+                                        AlertMonitorService, AlertRepository, \
+                                        AlertEvent, NewAlertEvent
+    from csm.core.blogic.models.alerts import AlertModel
     from csm.core.services.health import HealthAppService, HealthRepository \
-            , HealthMonitorService
+            , HealthMonitorService, HealthEvent
+    from csm.common.event_bus import EventBus
     from csm.core.services.stats import StatsAppService
     from csm.core.services.s3.iam_users import IamUsersService
     from csm.core.services.s3.accounts import S3AccountService
@@ -254,14 +483,21 @@ if __name__ == '__main__':
     from csm.core.services.usl import UslService
     from csm.core.services.users import CsmUserService, UserManager
     from csm.core.services.roles import RoleManagementService, RoleManager
-    from csm.core.services.sessions import SessionManager, LoginService, AuthService
+    from csm.core.services.sessions import (SessionManager, LoginService, AuthService,
+                                            InMemorySessionStore, ConsulSessionStore)
     from csm.core.services.security import SecurityService
+    from csm.core.services.password_verifier import PasswordVerifier
     from csm.core.services.hotfix_update import HotfixApplicationService
     from csm.core.repositories.update_status import UpdateStatusRepository
     from csm.core.email.email_queue import EmailSenderQueue
     from csm.core.blogic.storage import SyncInMemoryKeyValueStorage
     from csm.core.services.onboarding import OnboardingConfigService
     from csm.core.agent.api import CsmRestApi, AlertHttpNotifyService
+    from csm.core.agent.websocket import WsReplayBuffer, WsTopic
+    from csm.core.agent.supervisor import AgentSupervisor
+    from csm.common.ipc import IpcServer, IpcClient
+    from csm.common.es_bulk import EsBulkClient
+    from csm.common.periodic import Periodic
 
     from csm.common.timeseries import TimelionProvider
     from csm.common.conf import Security
@@ -284,8 +520,12 @@ if __name__ == '__main__':
         #     from salt import client
         # except ModuleNotFoundError:
         client = None
-        CsmAgent.init()
-        CsmAgent.run()
+        CsmAgent.load_conf()
+        if CsmAgent.role is None:
+            CsmAgent.supervise()
+        else:
+            CsmAgent.init()
+            CsmAgent.run()
     except Exception as e:
         Log.error(traceback.format_exc())
         if Options.debug:
@@ -0,0 +1,119 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import errno
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List
+from cortx.utils.log import Log
+from csm.common.errors import CsmError
+from csm.core.blogic import const
+
+
+class AgentSupervisor:
+    """
+    Starts and watches CSM agent processes in the pre-forked mode:
+    one background process that consumes alerts and health updates and
+    publishes them over IPC, and a number of HTTP workers sharing the
+    REST port via SO_REUSEPORT.
+
+    Children are started as new interpreter processes rather than plain
+    forks, so that none of them inherits the event loop or connections
+    created while the supervisor was importing modules.
+    """
+
+    def __init__(self, workers: int, args: List[str] = None,
+                 ipc_path: str = const.CSM_AGENT_IPC_SOCKET,
+                 startup_timeout: float = const.CSM_AGENT_IPC_STARTUP_TIMEOUT,
+                 respawn_interval: float = const.CSM_AGENT_RESPAWN_INTERVAL):
+        self._workers = workers
+        self._args = args or []
+        self._ipc_path = ipc_path
+        self._startup_timeout = startup_timeout
+        self._respawn_interval = respawn_interval
+        self._children = {}
+        self._stopping = False
+
+    @staticmethod
+    def _command() -> List[str]:
+        # A frozen (pyinstaller) agent is its own interpreter
+        if getattr(sys, 'frozen', False):
+            return [sys.executable]
+        return [sys.executable, os.path.abspath(sys.argv[0])]
+
+    def _spawn(self, role: str) -> int:
+        cmd = self._command() + [f'--role={role}'] + self._args
+        process = subprocess.Popen(cmd, close_fds=True)
+        self._children[process.pid] = (role, process)
+        Log.info(f"Started CSM agent {role} process with pid {process.pid}")
+        return process.pid
+
+    def _wait_for_ipc(self, background_pid: int):
+        """ Wait until the background process is initialized and listens for IPC """
+        deadline = time.monotonic() + self._startup_timeout
+        while not os.path.exists(self._ipc_path):
+            if self._stopping:
+                return
+            _, process = self._children[background_pid]
+            if process.poll() is not None:
+                raise CsmError(errno.ECHILD, "CSM agent background process failed to start")
+            if time.monotonic() > deadline:
+                raise CsmError(errno.ETIMEDOUT, "CSM agent background process start timed out")
+            time.sleep(0.5)
+
+    def _terminate(self, signum, frame):
+        Log.info(f"CSM agent supervisor received signal {signum}, stopping workers")
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._terminate)
+        signal.signal(signal.SIGINT, self._terminate)
+        os.makedirs(os.path.dirname(self._ipc_path), exist_ok=True)
+        if os.path.exists(self._ipc_path):
+            os.unlink(self._ipc_path)
+
+        background_pid = self._spawn(const.CSM_AGENT_ROLE_BACKGROUND)
+        try:
+            self._wait_for_ipc(background_pid)
+        except CsmError:
+            self._terminate(signal.SIGTERM, None)
+            raise
+        for _ in range(self._workers):
+            if self._stopping:
+                break
+            self._spawn(const.CSM_AGENT_ROLE_HTTP)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            role, _ = self._children.pop(pid, (None, None))
+            if role is None or self._stopping:
+                continue
+            Log.error(f"CSM agent {role} process {pid} exited with status {status}, "
+                      f"restarting in {self._respawn_interval} seconds")
+            time.sleep(self._respawn_interval)
+            if not self._stopping:
+                self._spawn(role)
+        Log.info("CSM agent supervisor stopped")
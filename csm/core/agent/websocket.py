@@ -0,0 +1,356 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import uuid
+from collections import deque
+from typing import Any, Hashable, List, Optional
+from aiohttp import web
+from cortx.utils.log import Log
+from csm.common.payload import JsonCodec
+from csm.core.blogic import const
+
+
+class WsOverflowPolicy:
+    """ What to do when a client send queue is full """
+
+    # Drop the oldest queued message
+    DROP_OLDEST = 'drop_oldest'
+    # Replace a queued message with the same key, drop the oldest if none
+    COALESCE = 'coalesce'
+    # Close the connection of a client that does not keep up
+    DISCONNECT = 'disconnect'
+
+    ALL = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class WsTopic:
+    """ Topics pushed over the websocket channel """
+
+    ALERTS = 'alerts'
+    HEALTH = 'health'
+    UPDATE_STATUS = 'update_status'
+
+    # Payload fields a subscription may filter on
+    FILTERS = {
+        ALERTS: {'severity', 'node_id', 'host_id', 'module_type', 'state',
+                 'resolved', 'acknowledged'},
+        HEALTH: {'node_id', 'resource_key', 'severity'},
+        UPDATE_STATUS: {'update_type', 'status'},
+    }
+
+    # Payload field identifying the object an event is about
+    KEYS = {
+        ALERTS: 'alert_uuid',
+        UPDATE_STATUS: 'update_type',
+    }
+
+    @classmethod
+    def message_key(cls, topic: str, data: Any) -> Optional[Hashable]:
+        field = cls.KEYS.get(topic)
+        if field is None or not isinstance(data, dict):
+            return None
+        value = data.get(field)
+        return None if value is None else (topic, value)
+
+
+class WsEvent:
+    """
+    One event pushed over the websocket channel.
+    Both message formats are serialized on first use and then shared by
+    all clients, including the ones that get the event replayed.
+    """
+
+    __slots__ = ('epoch', 'seq', 'topic', 'data', 'key', '_plain', '_envelope')
+
+    def __init__(self, epoch: str, seq: int, topic: str, data: Any):
+        self.epoch = epoch
+        self.seq = seq
+        self.topic = topic
+        self.data = data
+        self.key = WsTopic.message_key(topic, data)
+        self._plain = None
+        self._envelope = None
+
+    def plain(self) -> str:
+        """
+        The event data, the format of clients without subscriptions.
+        Objects get the epoch and seq fields, so these clients can resume too.
+        """
+        if self._plain is None:
+            data = self.data
+            if isinstance(data, dict):
+                data = dict(data, epoch=self.epoch, seq=self.seq)
+            self._plain = JsonCodec.dumps(data)
+        return self._plain
+
+    def envelope(self) -> str:
+        if self._envelope is None:
+            self._envelope = JsonCodec.dumps({'topic': self.topic, 'seq': self.seq,
+                                              'data': self.data})
+        return self._envelope
+
+
+class WsReplayBuffer:
+    """
+    Numbers pushed events and keeps the most recent ones, so a client that
+    reconnects can get the events it missed instead of reloading everything.
+    Sequence numbers start over when the agent restarts; the epoch tells
+    numbers of different agent processes apart.
+    HTTP workers keep the numbers given to the events by the background
+    process, so a client may resume on any worker.
+    """
+
+    def __init__(self, size: int = const.WS_REPLAY_SIZE):
+        self.epoch = uuid.uuid4().hex
+        self._events = deque(maxlen=size)
+        self._last_seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def append(self, topic: str, data: Any, epoch: Optional[str] = None,
+               seq: Optional[int] = None) -> WsEvent:
+        """
+        Number the event and keep it
+        :param epoch: epoch of the process that numbered the event, if not this one
+        :param seq: number given to the event by that process
+        """
+        if seq is None:
+            seq = self._last_seq + 1
+        elif epoch != self.epoch or seq != self._last_seq + 1:
+            # The numbering process restarted or some events did not
+            # reach this one, the kept events can not be replayed any more
+            self.epoch = epoch
+            self._events.clear()
+        self._last_seq = seq
+        event = WsEvent(self.epoch, seq, topic, data)
+        if self._events.maxlen:
+            self._events.append(event)
+        return event
+
+    def since(self, epoch: str, seq: int) -> Optional[List[WsEvent]]:
+        """
+        Events that follow the sequence number
+        :return: None if some of them are not in the buffer any more
+        """
+        if epoch != self.epoch or not 0 <= seq <= self._last_seq:
+            return None
+        if seq == self._last_seq:
+            return []
+        if not self._events or self._events[0].seq > seq + 1:
+            return None
+        first = seq + 1 - self._events[0].seq
+        return [self._events[index] for index in range(first, len(self._events))]
+
+
+class WsSubscriptions:
+    """
+    Topics a websocket client is interested in.
+    A client that never sent a subscription request gets every alert in
+    the original format (the plain alert object, with the epoch and seq
+    fields added to resume from). After the first request
+    it gets only the subscribed topics, each event wrapped as
+    {"topic": ..., "data": ...}.
+
+    Requests are JSON text messages:
+        {"action": "subscribe", "topic": "alerts",
+         "filter": {"severity": ["critical", "error"], "node_id": ["srvnode-1"]}}
+        {"action": "unsubscribe", "topic": "alerts"}
+        {"action": "resume", "epoch": "...", "seq": 42}
+    A filter accepts events whose field value is one of the listed values,
+    all fields of the filter must match. Subscribing again to the same
+    topic replaces its filter.
+    """
+
+    SUBSCRIBE = 'subscribe'
+    UNSUBSCRIBE = 'unsubscribe'
+    RESUME = 'resume'
+
+    def __init__(self):
+        # None means the client has not subscribed to anything explicitly
+        self._topics = None
+
+    @property
+    def legacy(self) -> bool:
+        return self._topics is None
+
+    @staticmethod
+    def _parse_filter(topic: str, filter_spec: Any) -> dict:
+        if filter_spec is None:
+            return {}
+        if not isinstance(filter_spec, dict):
+            raise ValueError('filter must be an object')
+        allowed = WsTopic.FILTERS[topic]
+        parsed = {}
+        for field, values in filter_spec.items():
+            if field not in allowed:
+                raise ValueError(f'can not filter {topic} by {field}')
+            if not isinstance(values, list):
+                values = [values]
+            parsed[field] = frozenset(values)
+        return parsed
+
+    def handle_request(self, request: Any) -> dict:
+        """
+        Apply a subscription request
+        :return: reply to be sent to the client
+        """
+        if not isinstance(request, dict):
+            return {'action': 'error', 'message': 'request must be an object'}
+        action = request.get('action')
+        topic = request.get('topic')
+        if action not in (self.SUBSCRIBE, self.UNSUBSCRIBE):
+            return {'action': 'error', 'message': f'unknown action: {action}'}
+        if topic not in WsTopic.FILTERS:
+            return {'action': 'error', 'message': f'unknown topic: {topic}'}
+        if self._topics is None:
+            self._topics = {}
+        if action == self.UNSUBSCRIBE:
+            self._topics.pop(topic, None)
+            return {'action': 'unsubscribed', 'topic': topic}
+        try:
+            self._topics[topic] = self._parse_filter(topic, request.get('filter'))
+        except ValueError as e:
+            return {'action': 'error', 'topic': topic, 'message': str(e)}
+        return {'action': 'subscribed', 'topic': topic}
+
+    def match(self, topic: str, data: Any) -> bool:
+        if self._topics is None:
+            return topic == WsTopic.ALERTS
+        filters = self._topics.get(topic)
+        if filters is None:
+            return False
+        if not filters:
+            return True
+        if not isinstance(data, dict):
+            return False
+        return all(data.get(field) in values for field, values in filters.items())
+
+    def format(self, event: WsEvent) -> str:
+        return event.plain() if self._topics is None else event.envelope()
+
+
+class WebSocketClient:
+    """
+    Outbound side of one websocket connection.
+    Messages are put into a bounded queue without waiting and sent by the
+    client's own writer task, so a slow client only delays itself.
+    """
+
+    def __init__(self, ws: web.WebSocketResponse,
+                 max_queue: int = const.WS_QUEUE_SIZE,
+                 policy: str = WsOverflowPolicy.DROP_OLDEST):
+        self._ws = ws
+        self._queue = deque()
+        self._max_queue = max_queue
+        self._policy = policy
+        self._wakeup = asyncio.Event()
+        self._writer = None
+        self._closed = False
+        self.subscriptions = WsSubscriptions()
+        self._stats = {
+            'sent': 0,
+            'dropped': 0,
+            'coalesced': 0,
+            'max_queue_depth': 0,
+        }
+
+    @property
+    def ws(self) -> web.WebSocketResponse:
+        return self._ws
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def max_queue(self) -> int:
+        return self._max_queue
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats['queue_depth'] = len(self._queue)
+        return stats
+
+    def start(self) -> None:
+        self._writer = asyncio.ensure_future(self._write_loop())
+
+    async def stop(self) -> None:
+        self._closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+    def _coalesce(self, key: Hashable, data: str) -> bool:
+        for index, (queued_key, _) in enumerate(self._queue):
+            if queued_key == key:
+                self._queue[index] = (key, data)
+                self._stats['coalesced'] += 1
+                return True
+        return False
+
+    def enqueue(self, data: str, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a serialized message for sending, never waits.
+        :param data: serialized message
+        :param key: message identity used by the coalesce policy
+        :return: False if a message (this or an older one) or the whole
+                 client had to be dropped
+        """
+        if self._closed:
+            return False
+        if len(self._queue) >= self._max_queue:
+            if self._policy == WsOverflowPolicy.DISCONNECT:
+                Log.warn('Websocket client send queue overflow, disconnecting')
+                self._stats['dropped'] += len(self._queue) + 1
+                self._queue.clear()
+                self._closed = True
+                asyncio.ensure_future(self._ws.close(code=const.WS_CLOSE_SLOW_CLIENT,
+                                                     message=b'Send queue overflow'))
+                return False
+            if (self._policy == WsOverflowPolicy.COALESCE and key is not None
+                    and self._coalesce(key, data)):
+                return True
+            self._queue.popleft()
+            self._stats['dropped'] += 1
+            self._queue.append((key, data))
+            self._wakeup.set()
+            return False
+        self._queue.append((key, data))
+        self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], len(self._queue))
+        self._wakeup.set()
+        return True
+
+    async def _write_loop(self) -> None:
+        try:
+            while not self._closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._queue and not self._closed:
+                    _, data = self._queue.popleft()
+                    await self._ws.send_str(data)
+                    self._stats['sent'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            Log.debug(f'REST API websock send error: {e}')
+            self._closed = True
+            self._queue.clear()
@@ -76,6 +76,51 @@ CSM_AGENT_PORT = 8101
 CSM_AGENT_BASE_URL = "http://"
 TIMEOUT = 60
 
+# CSM Agent process roles (pre-forked mode)
+CSM_AGENT_WORKERS_KEY = 'CSM_SERVICE>CSM_AGENT>workers'
+CSM_AGENT_ROLE_STANDALONE = 'standalone'
+CSM_AGENT_ROLE_BACKGROUND = 'background'
+CSM_AGENT_ROLE_HTTP = 'http'
+CSM_AGENT_IPC_SOCKET = f"{CSM_PIDFILE_PATH}/csm_agent_ipc.sock"
+CSM_AGENT_IPC_TOPIC_HEALTH = 'health'
+CSM_AGENT_IPC_TOPIC_WS_EVENT = 'ws_event'
+CSM_AGENT_IPC_TOPIC_ALERT_SUMMARY = 'alert_summary'
+# Sent by HTTP workers to the background process
+CSM_AGENT_IPC_TOPIC_ALERT_UPDATE = 'alert_update'
+CSM_AGENT_IPC_MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+CSM_AGENT_IPC_RECONNECT_INTERVAL = 1
+CSM_AGENT_IPC_STARTUP_TIMEOUT = 120
+CSM_AGENT_HEALTH_SNAPSHOT_INTERVAL = 5
+CSM_AGENT_ALERT_SUMMARY_INTERVAL = 1
+CSM_AGENT_RESPAWN_INTERVAL = 5
+
+# Event bus
+# Events waiting for one event bus subscriber before the oldest are dropped
+EVENT_BUS_QUEUE_SIZE = 1000
+
+# Session storage
+SESSION_STORE_KEY = 'SESSION>store'
+SESSION_STORE_MEMORY = 'memory'
+SESSION_STORE_CONSUL = 'consul'
+SESSION_CACHE_SIZE = 1024
+SESSION_CACHE_TTL = 5
+SESSION_FLUSH_INTERVAL = 10
+SESSION_SWEEP_INTERVAL = 60
+SESSION_CIPHER_KEY_NAME = 'csm_session'
+
+# Password verification admission control
+PASSWD_VERIFY_CONCURRENCY = 2
+PASSWD_VERIFY_QUEUE_SIZE = 64
+PASSWD_VERIFY_QUEUE_TIMEOUT = 10
+LOGIN_RETRY_AFTER = 5
+
+# Websocket push channel
+WS_QUEUE_SIZE = 256
+WS_OVERFLOW_POLICY = 'drop_oldest'
+WS_CLOSE_SLOW_CLIENT = 1008
+WS_REPLAY_SIZE = 1024
+WS_STATS_INTERVAL = 60
+
 # Initalization
 HA_INIT = '/var/csm/ha_initialized'
 
@@ -117,6 +162,10 @@ CORTXCLI_GLOBAL_INDEX = 'CORTXCLI'
 
 # AMQP Consumer Tag
 CONSUMER_TAG = 'AMQP_CONSUMER'
+# Outcomes of the messages of a window, see AmqpComm.recv_window
+AMQP_MSG_ACK = 'ack'
+AMQP_MSG_REQUEUE = 'requeue'
+AMQP_MSG_REJECT = 'reject'
 
 # Cluster Inventory Related
 INVENTORY_FILE = '/etc/csm/cluster.conf'
@@ -195,10 +244,20 @@ ALERT_FALSE = 0
 ALERT_SENSOR_TYPE = 'sensor_response_type'
 ALERT_MESSAGE = 'message'
 ALERT_COMMENT = 'comment'
+ALERT_COMMENTS = 'comments'
 ALERT_SENSOR_INFO = 'sensor_info'
 ALERT_MAX_COMMENT_LENGTH = 255
 ALERT_SORTABLE_FIELDS = ['created_time', 'updated_time', 'severity', 'resolved',
                          'acknowledged']
+# Fields with few equal values, usable for cursor pagination
+ALERT_CURSOR_SORT_FIELDS = ['created_time', 'updated_time']
+# Alert summary counters
+ALERT_SUMMARY_OPEN = 'open'
+ALERT_SUMMARY_UNACKNOWLEDGED = 'unacknowledged'
+ALERT_SUMMARY_UNRESOLVED = 'unresolved'
+ALERT_SUMMARY_SEVERITY = 'severity'
+ALERT_SUMMARY_NODE = 'node'
+ALERT_SUMMARY_RECONCILE_INTERVAL = 300
 ALERT_EVENT_DETAILS = 'event_details'
 ALERT_EXTENDED_INFO = 'extended_info'
 ALERT_EVENTS = 'events'
@@ -632,12 +691,48 @@ STORAGE_TYPE = "storage_type"
 STORAGE = "storage"
 STORAGE_TYPE_VIRTUAL = "virtual"
 FEATURE_ENDPOINT_MAP_INDEX = "FEATURE_COMPONENTS.feature_endpoint_map"
+FEATURE_ENDPOINT_MAP_CHECK_INTERVAL = 5
+FEATURE_SUPPORT_CACHE_TTL = 60
+HTTP_COMPRESSION_MIN_SIZE = 1024
+HTTP_BROTLI_QUALITY = 4
+# Streamed responses up to this size are buffered to get ETags
+HTTP_STREAM_READ_AHEAD_SIZE = 1024 * 1024
 OK = 'ok'
 EMPTY_PASS_FIELD = "Password field can't be empty."
 HEALTH_REQUIRED_FIELDS = {'health', 'severity', 'alert_uuid', 'alert_type'}
 SHUTDOWN_CRON_TIME = "shutdown_cron_time"
 ES_RETRY = "ELASTICSEARCH>retry"
 ES_RECORD_LIMIT = 1000
+# Alert IDs looked up in one query, ES limits the number of query clauses
+ALERT_IDS_QUERY_CHUNK = 500
+ALERT_WINDOW_SIZE_KEY = 'ALERTS>window_size'
+ALERT_WINDOW_LATENCY_KEY = 'ALERTS>window_latency'
+ALERT_WINDOW_SIZE = 100
+ALERT_WINDOW_LATENCY = 0.5
+# Seconds the alert ingestion rate is averaged over
+ALERT_RATE_INTERVAL = 60
+# Flap damping: a resource changing state flap_threshold times within
+# flap_window seconds is flapping until it keeps a state for flap_settle_time
+# seconds, its alerts are forwarded every flap_summary_interval seconds meanwhile
+ALERT_FLAP_THRESHOLD_KEY = 'ALERTS>flap_threshold'
+ALERT_FLAP_WINDOW_KEY = 'ALERTS>flap_window'
+ALERT_FLAP_SETTLE_TIME_KEY = 'ALERTS>flap_settle_time'
+ALERT_FLAP_SUMMARY_INTERVAL_KEY = 'ALERTS>flap_summary_interval'
+ALERT_FLAP_THRESHOLD = 5
+ALERT_FLAP_WINDOW = 60
+ALERT_FLAP_SETTLE_TIME = 60
+ALERT_FLAP_SUMMARY_INTERVAL = 300
+# Seconds between checks of flapping resources
+ALERT_FLAP_CHECK_INTERVAL = 5
+ALERT_FLAPPING = 'flapping'
+# Alert history records with equal values of these fields repeat the previous one
+ALERT_HISTORY_DEDUP_FIELDS = ['state', 'severity', 'health', 'health_recommendation',
+                              'description', 'module_name', 'node_id', 'resource_id']
+# Resources whose last history record is remembered
+ALERT_HISTORY_DEDUP_SIZE = 10000
+# Repeated history records older than this (seconds) are merged every interval
+ALERT_HISTORY_COMPACT_AGE = 3600
+ALERT_HISTORY_COMPACT_INTERVAL = 3600
 ES_CLEANUP_PERIOD_VIRTUAL = 2  # days
 LOGROTATE_AMOUNT_VIRTUAL = 3
 
@@ -84,6 +84,8 @@ class AlertModel(CsmModel):
     node_id = StringType()
     support_message = StringType()
     resource_id = StringType()
+    # The resource changes state too often, its alerts are damped
+    flapping = BooleanType()
 
     def to_primitive(self) -> dict:
         obj = super().to_primitive()
@@ -113,6 +115,17 @@ class AlertsHistoryModel(AlertModel, CsmModel):
     """
     _id = "alert_uuid"
     alert_uuid = StringType()
+    # Number of identical snapshots the record stands for and the time of
+    # the last one, the record's created_time is the time of the first
+    occurrences = IntType()
+    last_time = DateTimeType()
+
+    def to_primitive(self) -> dict:
+        obj = super().to_primitive()
+        if self.last_time:
+            obj["last_time"] =\
+                    int(self.last_time.replace(tzinfo=timezone.utc).timestamp())
+        return obj
 
 # TODO: probably, it makes more sense to put alert data directly into the fields of
 # the class, rather than storing Alert as a dictionary in the _data field
@@ -50,6 +50,8 @@ class AlertsQueryParameter(Schema):
     resolved = fields.Boolean(default=None, missing=None)
     acknowledged = fields.Boolean(default=None, missing=None)
     show_active = fields.Boolean(default=False, missing=False, allow_none=True)
+    estimate_total = fields.Boolean(default=False, missing=False)
+    cursor = fields.Str(default=None, missing=None, allow_none=True)
 
     @validates('duration')
     def validate_duration(self, value):
@@ -101,6 +103,18 @@ class AlertsListView(CsmView):
         return await self.alerts_service.update_all_alerts(body)
 
 
+@CsmView._app_routes.view("/api/v1/alerts_summary")
+class AlertsSummaryView(CsmView):
+    def __init__(self, request):
+        super().__init__(request)
+        self.alerts_service = self.request.app["alerts_service"]
+
+    @CsmAuth.permissions({Resource.ALERTS: {Action.LIST}})
+    async def get(self):
+        """ Counters of open alerts, served from memory """
+        return self.alerts_service.get_alert_summary()
+
+
 @CsmView._app_routes.view("/api/v1/alerts/{alert_id}")
 class AlertsView(CsmView):
     def __init__(self, request):
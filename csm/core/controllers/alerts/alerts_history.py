@@ -45,6 +45,8 @@ class AlertsHistoryQueryParameter(Schema):
             allow_none=True)
     end_date = fields.Str(data_key='end_date', default=None, missing=None, \
             allow_none=True)
+    estimate_total = fields.Boolean(default=False, missing=False)
+    cursor = fields.Str(default=None, missing=None, allow_none=True)
 
     @validates('duration')
     def validate_duration(self, value):
@@ -49,7 +49,7 @@ class AuditLogShowView(CsmView):
 
         start_date = request_data["start_date"]
         end_date = request_data["end_date"] 
-        return await self._service.get_by_range(component, start_date, end_date)
+        return await self._service.stream_by_range(component, start_date, end_date)
 
 @CsmView._app_routes.view("/api/v1/auditlogs/download/{component}")
 class AuditLogDownloadView(CsmView):
@@ -13,6 +13,10 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+from collections import namedtuple
+from types import MappingProxyType
+from aiohttp import hdrs
+
 # To add new route import from view file
 from .view import CsmView
 from .stats import StatsView
@@ -39,14 +43,57 @@ from csm.core.controllers.appliance_info import ApplianceInfoView
 from csm.core.controllers.system_status import SystemStatusView, SystemStatusAllView
 
 
+RouteAuth = namedtuple('RouteAuth', 'public permissions handler')
+
+
 class CsmRoutes():
     """
     Common class for adding routes
     """
 
+    # (handler, method) -> RouteAuth, built once when the routes are added
+    _auth_table = MappingProxyType({})
+
     @staticmethod
     def add_routes(app):
         """
         Add routes to Web application
         """
         app.add_routes(CsmView._app_routes)
+        CsmRoutes.build_auth_table(app.router)
+
+    @staticmethod
+    def _calc_route_auth(handler, method) -> RouteAuth:
+        return RouteAuth(CsmView.is_public(handler, method),
+                         CsmView.get_permissions(handler, method),
+                         handler)
+
+    @staticmethod
+    def build_auth_table(router):
+        """
+        Precompute public flag and required permissions for every route and
+        method registered in the router, so middlewares do not need to walk
+        the handler attributes on each request
+        """
+        table = {}
+        for route in router.routes():
+            if route.method == hdrs.METH_ANY:
+                methods = hdrs.METH_ALL
+            else:
+                methods = (route.method,)
+            for method in methods:
+                table[(route.handler, method)] = CsmRoutes._calc_route_auth(
+                    route.handler, method)
+        CsmRoutes._auth_table = MappingProxyType(table)
+
+    @staticmethod
+    def get_route_auth(match_info, method) -> RouteAuth:
+        """
+        Obtain auth information for already resolved route.
+        Handlers which are not in the table (e.g. aiohttp system routes for
+        404/405 responses) are processed the same way as before.
+        """
+        route_auth = CsmRoutes._auth_table.get((match_info.handler, method))
+        if route_auth is None:
+            route_auth = CsmRoutes._calc_route_auth(match_info.handler, method)
+        return route_auth
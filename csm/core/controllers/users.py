@@ -22,6 +22,7 @@ from csm.core.controllers.view import CsmView, CsmResponse, CsmAuth
 from csm.core.controllers.validators import PasswordValidator, UserNameValidator
 from cortx.utils.log import Log
 from csm.common.errors import InvalidRequest
+from csm.common.payload import JsonStream
 
 
 INVALID_REQUEST_PARAMETERS = "invalid request parameter"
@@ -135,7 +136,7 @@ class CsmUsersListView(CsmView):
             raise InvalidRequest(
                 "Invalid parameter for user", str(val_err))
         users = await self._service.get_user_list(**request_data)
-        return {'users': users}
+        return JsonStream(users, key='users')
 
     """
     POST REST implementation for creating a csm user
@@ -15,10 +15,12 @@
 
 import json
 import asyncio
+from typing import Optional
 from csm.common.errors import InvalidRequest
 from cortx.utils.log import Log
 from csm.core.services.file_transfer import FileRef, FileCache
 from csm.common.errors import CsmInternalError
+from csm.common.payload import JsonCodec, JsonStream
 import os
 
 from aiohttp import web
@@ -59,11 +61,58 @@ class CsmResponse(web.Response):
     def __init__(self, res={}, status=200, headers=None,
                  content_type='application/json',
                  **kwargs):
-        body = json.dumps(res)
+        body = JsonCodec.dumps_bytes(res)
         super().__init__(body=body, status=status, headers=headers,
                          content_type=content_type, **kwargs)
 
 
+class JsonStreamResponse(web.StreamResponse):
+    """
+    Chunked response for JsonStream objects. The body is written when aiohttp
+    finalizes the response, so headers can still be modified by middlewares.
+    """
+
+    NDJSON = 'application/x-ndjson'
+
+    def __init__(self, stream: JsonStream, ndjson=False, status=200, headers=None):
+        super().__init__(status=status, headers=headers)
+        self._chunks = stream.chunks(ndjson)
+        # Chunks serialized in advance by read_ahead
+        self._head = []
+        self.content_type = self.NDJSON if ndjson else 'application/json'
+        self.charset = 'utf-8'
+        self.enable_chunked_encoding()
+
+    @classmethod
+    def accepts_ndjson(cls, request) -> bool:
+        return cls.NDJSON in request.headers.get('Accept', '')
+
+    async def read_ahead(self, max_size: int) -> Optional[bytes]:
+        """
+        Serialize the body in advance while it fits into max_size bytes
+        :return: the whole body, None if it is larger than max_size. The
+                 serialized part is then written first by write_eof.
+        """
+        size = 0
+        async for chunk in self._chunks:
+            self._head.append(chunk)
+            size += len(chunk)
+            if size > max_size:
+                return None
+        self._chunks = None
+        return b''.join(self._head)
+
+    async def write_eof(self, data=b''):
+        head, self._head = self._head, []
+        chunks, self._chunks = self._chunks, None
+        for chunk in head:
+            await self.write(chunk)
+        if chunks is not None:
+            async for chunk in chunks:
+                await self.write(chunk)
+        await super().write_eof(data)
+
+
 class CsmHttpException(web.HTTPException):
     ''' Temporary solution: Imitate common REST API error structure '''
 
@@ -76,7 +125,7 @@ class CsmHttpException(web.HTTPException):
         }
         if args is not None:
             body["error_format_args"] = args
-        json_body = json.dumps(body)
+        json_body = JsonCodec.dumps(body)
         super().__init__(body=json_body, content_type='application/json')
 
 
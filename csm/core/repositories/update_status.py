@@ -13,19 +13,23 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+import asyncio
 import datetime
 from cortx.utils.data.db.db_provider import DataBaseProvider
 from cortx.utils.data.access.filters import Compare, And, Or
 from cortx.utils.data.access import Query, SortOrder
 from cortx.utils.log import Log
+from csm.common.observer import Observable
 from csm.core.data.models.upgrade import UpdateStatusEntry
 
 
-class UpdateStatusRepository:
+class UpdateStatusRepository(Observable):
     """
     Repository that keeps a single instance of a UpdateStatusEntry model for each update type.
+    Listeners are notified with the primitive form of every saved model.
     """
     def __init__(self, storage: DataBaseProvider):
+        super().__init__()
         self.db = storage
 
     @Log.trace_method(Log.DEBUG)
@@ -53,6 +57,7 @@ class UpdateStatusRepository:
         model.updated_at = datetime.datetime.now()
         await self.db(UpdateStatusEntry).store(model)
         Log.info(f"UpdateStatusEntry stored for {model.update_type}")
+        self._notify_listeners(model.to_primitive(), loop=asyncio.get_event_loop())
 
     @Log.trace_method(Log.DEBUG)
     async def drop_model(self, update_type: str) -> UpdateStatusEntry:
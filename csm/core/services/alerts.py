@@ -19,13 +19,17 @@ import re
 import time
 from csm.common.observer import Observable
 from datetime import datetime, timedelta, timezone
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 from cortx.utils.log import Log
 from csm.common.email import EmailSender
 from csm.common.services import Service, ApplicationService
-from csm.common.queries import SortBy, SortOrder, QueryLimits, DateTimeRange
+from csm.common.queries import SortBy, SortOrder, QueryLimits, DateTimeRange, PageCursor
 from csm.core.blogic.models.alerts import IAlertStorage, Alert
-from csm.common.errors import CsmNotFoundError, CsmError, InvalidRequest
+from csm.common.errors import CsmNotFoundError, CsmError, InvalidRequest, \
+    CsmServiceNotAvailable, CSM_PROVIDER_NOT_AVAILABLE
+from csm.common.es_bulk import EsBulkClient
+from csm.common.event_bus import EventBus
+from csm.common.periodic import Periodic
 from csm.core.blogic import const
 from cortx.utils.data.db.db_provider import (DataBaseProvider, GeneralConfig)
 from cortx.utils.data.access.filters import Compare, And, Or
@@ -37,9 +41,11 @@ from csm.core.services.users import UserManager
 from csm.common import queries
 from schematics import Model
 from schematics.types import StringType, BooleanType, IntType
-from typing import Optional, Iterable, Dict
-from csm.common.payload import Payload, Json, JsonMessage
+from typing import Optional, Iterable, Dict, List, Tuple
+from csm.common.payload import Payload, Json, JsonMessage, JsonStream
 import asyncio
+from collections import Counter, OrderedDict, deque
+from functools import partial
 from cortx.utils.conf_store.conf_store import Conf
 
 
@@ -49,16 +55,671 @@ ALERTS_MSG_NOT_RESOLVED = "alerts_not_resolved"
 ALERTS_MSG_TOO_LONG_COMMENT = "alerts_too_long_comment"
 ALERTS_MSG_RESOLVED_AND_ACKED_ERROR = "alerts_resolved_and_acked"
 ALERTS_MSG_NON_SORTABLE_COLUMN = "alerts_non_sortable_column"
+ALERTS_MSG_UPDATE_FAILED = "alerts_update_failed"
+ALERTS_MSG_INVALID_CURSOR = "alerts_invalid_cursor"
 
-class AlertRepository(IAlertStorage):
-    def __init__(self, storage: DataBaseProvider):
+
+class AlertEvent:
+    """ Alert processed by the alert monitor, topic of all alert events """
+
+    def __init__(self, alert: AlertModel):
+        self.alert = alert
+
+
+class NewAlertEvent(AlertEvent):
+    """ The alert is stored as the open alert of its resource """
+
+
+class UpdatedAlertEvent(AlertEvent):
+    """ The alert changed the state of the open alert of its resource """
+
+
+class DuplicateAlertEvent(AlertEvent):
+    """ The alert repeated the state of the open alert of its resource """
+
+
+class OpenAlertIndex:
+    """
+    In-memory index of alerts that are not both resolved and acknowledged,
+    keyed by (sensor_info, module_type).
+    Once loaded completely from the DB the index is authoritative: a key
+    that is not in it has no open alert. Until then, and for keys whose
+    entry could not be kept up to date, lookups fall back to the DB.
+    Must be used from the event loop thread only.
+    """
+
+    def __init__(self):
+        self._alerts = {}
+        self._complete = False
+        # Keys whose DB state is unknown
+        self._stale = set()
+        # Changes made while the index is loaded from the DB
+        self._journal = None
+
+    @staticmethod
+    def _key(sensor_info, module_type):
+        return str(sensor_info), str(module_type)
+
+    @staticmethod
+    def _is_open(alert: AlertModel) -> bool:
+        return not (alert.resolved and alert.acknowledged)
+
+    def __len__(self):
+        return len(self._alerts)
+
+    @property
+    def complete(self) -> bool:
+        return self._complete
+
+    def begin_load(self):
+        """ Start recording changes that must survive the following load """
+        self._journal = []
+
+    def load_cancelled(self):
+        self._journal = None
+
+    def load(self, alerts: Iterable[AlertModel], complete: bool):
+        """
+        Replace the index with open alerts loaded from the DB. Changes made
+        after begin_load are applied on top, as the DB may have missed them.
+        :param complete: True if these are all open alerts
+        """
+        journal = self._journal or []
+        self._journal = None
+        self._alerts = {}
+        self._stale = set()
+        for alert in alerts:
+            if self._is_open(alert):
+                self._alerts[self._key(alert.sensor_info, alert.module_type)] = alert
+        self._complete = complete
+        for change, args in journal:
+            change(*args)
+
+    def lookup(self, sensor_info, module_type):
+        """
+        :return: (found, alert) - found is False if the DB must be asked
+        """
+        key = self._key(sensor_info, module_type)
+        alert = self._alerts.get(key)
+        if alert is not None:
+            # Callers change the returned alert before it is stored
+            return True, AlertModel(alert.to_native())
+        return self._complete and key not in self._stale, None
+
+    def put(self, alert: AlertModel):
+        """ Track the latest stored state of the alert """
+        if self._journal is not None:
+            self._journal.append((self.put, (AlertModel(alert.to_native()),)))
+        key = self._key(alert.sensor_info, alert.module_type)
+        self._stale.discard(key)
+        if self._is_open(alert):
+            self._alerts[key] = AlertModel(alert.to_native())
+        else:
+            current = self._alerts.get(key)
+            if current is None or current.alert_uuid == alert.alert_uuid:
+                self._alerts.pop(key, None)
+
+    def update(self, sensor_info, module_type, update_params: dict) -> Optional[AlertModel]:
+        """
+        Apply a partial update of the open alert of the key
+        :return: copy of the updated alert, None if it is not in the index
+        """
+        if self._journal is not None:
+            self._journal.append((self.update, (sensor_info, module_type, update_params)))
+        key = self._key(sensor_info, module_type)
+        alert = self._alerts.get(key)
+        if alert is None:
+            return None
+        try:
+            alert.import_data(update_params)
+        except Exception as e:
+            Log.warn(f"Open alert index entry {key} is invalidated: {e}")
+            self.invalidate(sensor_info, module_type)
+            return None
+        if not self._is_open(alert):
+            del self._alerts[key]
+        return AlertModel(alert.to_native())
+
+    def invalidate(self, sensor_info, module_type):
+        if self._journal is not None:
+            self._journal.append((self.invalidate, (sensor_info, module_type)))
+        key = self._key(sensor_info, module_type)
+        self._alerts.pop(key, None)
+        self._stale.add(key)
+
+
+class AlertSummary:
+    """
+    Counters of open alerts (not both resolved and acknowledged), total and
+    by severity and node, kept in memory so they are served without queries.
+    The counted state of every open alert is remembered, so applying a new
+    state of an alert replaces the old one and repeated updates are harmless.
+    Must be used from the event loop thread only.
+    """
+
+    def __init__(self):
+        # alert_uuid -> counters the alert is counted in
+        self._alerts = {}
+        self._counters = Counter()
+        # Updates made while the counters are rebuilt from the DB
+        self._journal = None
+        self._loaded = False
+        self.version = 0
+
+    @staticmethod
+    def _keys(alert: AlertModel) -> tuple:
+        if alert.resolved and alert.acknowledged:
+            return ()
+        keys = [const.ALERT_SUMMARY_OPEN]
+        if not alert.acknowledged:
+            keys.append(const.ALERT_SUMMARY_UNACKNOWLEDGED)
+        if not alert.resolved:
+            keys.append(const.ALERT_SUMMARY_UNRESOLVED)
+        if alert.severity:
+            keys.append((const.ALERT_SUMMARY_SEVERITY, alert.severity))
+        if alert.node_id:
+            keys.append((const.ALERT_SUMMARY_NODE, alert.node_id))
+        return tuple(keys)
+
+    def _apply(self, alert_id: str, keys: tuple) -> bool:
+        old_keys = self._alerts.pop(alert_id, ())
+        if keys:
+            self._alerts[alert_id] = keys
+        if old_keys == keys:
+            return False
+        self._counters.subtract(old_keys)
+        self._counters.update(keys)
+        return True
+
+    def update(self, alert: AlertModel):
+        """ Count the new state of the alert """
+        keys = self._keys(alert)
+        if self._journal is not None:
+            self._journal[alert.alert_uuid] = keys
+        if self._apply(alert.alert_uuid, keys):
+            self.version += 1
+
+    def begin_load(self):
+        """ Start recording updates that must survive the following load """
+        self._journal = {}
+
+    def load_cancelled(self):
+        self._journal = None
+
+    def load(self, alerts: Iterable[AlertModel]):
+        """
+        Recount all open alerts read from the DB. Updates made after
+        begin_load are applied on top, as the DB may have missed them.
+        """
+        journal = self._journal or {}
+        self._journal = None
+        self._alerts = {}
+        self._counters = Counter()
+        for alert in alerts:
+            self._apply(alert.alert_uuid, self._keys(alert))
+        for alert_id, keys in journal.items():
+            self._apply(alert_id, keys)
+        self._loaded = True
+        self.version += 1
+
+    def get(self) -> Optional[dict]:
+        """ :return: the counters, None until they are loaded """
+        if not self._loaded:
+            return None
+        summary = {key: self._counters[key] for key in (const.ALERT_SUMMARY_OPEN,
+                   const.ALERT_SUMMARY_UNACKNOWLEDGED, const.ALERT_SUMMARY_UNRESOLVED)}
+        for group in (const.ALERT_SUMMARY_SEVERITY, const.ALERT_SUMMARY_NODE):
+            summary[group] = {key[1]: count for key, count in self._counters.items()
+                              if isinstance(key, tuple) and key[0] == group and count}
+        return summary
+
+
+class AlertHistoryIndex:
+    """
+    Last stored history record of every resource, keyed by
+    (sensor_info, module_type). A new record with the same values of
+    the ALERT_HISTORY_DEDUP_FIELDS as the last one is not stored,
+    the last record counts it instead.
+    The least recently changed resources are forgotten beyond the size.
+    Must be used from the event loop thread only.
+    """
+
+    def __init__(self, size: int = const.ALERT_HISTORY_DEDUP_SIZE):
+        self._size = size
+        self._records = OrderedDict()
+
+    @staticmethod
+    def key(record: AlertsHistoryModel):
+        return str(record.sensor_info), str(record.module_type)
+
+    @staticmethod
+    def fingerprint(record: AlertsHistoryModel) -> tuple:
+        return tuple(getattr(record, field) for field in const.ALERT_HISTORY_DEDUP_FIELDS)
+
+    @staticmethod
+    def merge(record: AlertsHistoryModel, repeated: AlertsHistoryModel):
+        """ Count the repeated record(s) in the record """
+        record.occurrences = (record.occurrences or 1) + (repeated.occurrences or 1)
+        last_time = repeated.last_time or repeated.created_time
+        if last_time and (record.last_time is None or last_time.replace(tzinfo=timezone.utc)
+                          > record.last_time.replace(tzinfo=timezone.utc)):
+            record.last_time = last_time
+
+    def deduplicate(self, records: Iterable[AlertsHistoryModel]):
+        """
+        :return: (records to be written, last records to be committed once
+                 they are written). Repeated records are replaced by
+                 updated copies of the records they repeat.
+        """
+        writes = {}
+        pending = {}
+        for record in records:
+            key = self.key(record)
+            last = pending.get(key) or self._records.get(key)
+            if (last is None or last.alert_uuid == record.alert_uuid
+                    or self.fingerprint(last) != self.fingerprint(record)):
+                pending[key] = writes[record.alert_uuid] = record
+                continue
+            if key not in pending:
+                last = AlertsHistoryModel(last.to_native())
+            self.merge(last, record)
+            pending[key] = writes[last.alert_uuid] = last
+        return list(writes.values()), pending
+
+    def commit(self, pending: dict):
+        for key, record in pending.items():
+            self._records.pop(key, None)
+            self._records[key] = record
+        while len(self._records) > self._size:
+            self._records.popitem(last=False)
+
+    def is_last(self, record: AlertsHistoryModel) -> bool:
+        last = self._records.get(self.key(record))
+        return last is not None and last.alert_uuid == record.alert_uuid
+
+
+class AlertFlapDetector:
+    """
+    Flap damping of alerts. A resource, keyed by (sensor_info, module_type),
+    whose state changes threshold times within window seconds is flapping:
+    the alert that made it flap is forwarded marked as flapping, later ones
+    are held and only the latest of them is kept. The latest alert is
+    forwarded every summary_interval seconds while the resource flaps, and
+    once more, no longer marked, when it keeps its state for settle_time.
+    Alerts due are handed over by check and are kept until forwarded
+    confirms they are stored, so a failed write is retried by the next check.
+    Alerts are observed in the alert plugin thread, checks run on the event
+    loop, so the state is guarded by a lock.
+    """
+
+    class _Resource:
+        def __init__(self):
+            self.state = None
+            self.last_seen = None
+            self.transitions = deque()
+            self.last_transition = None
+            self.flapping = False
+            self.latest = None
+            # Alerts held since the latest one was forwarded
+            self.held = 0
+            self.last_forwarded = None
+            # (held, last_transition, settled) when check handed the latest over
+            self.forwarding = None
+
+    def __init__(self, threshold: int = const.ALERT_FLAP_THRESHOLD,
+                 window: float = const.ALERT_FLAP_WINDOW,
+                 settle_time: float = const.ALERT_FLAP_SETTLE_TIME,
+                 summary_interval: float = const.ALERT_FLAP_SUMMARY_INTERVAL,
+                 clock=time.monotonic):
+        """
+        :param threshold: state changes making a resource flap, 0 disables damping
+        :param clock: function returning the current time in seconds
+        """
+        self._threshold = threshold
+        self._window = window
+        self._settle_time = settle_time
+        self._summary_interval = summary_interval
+        self._clock = clock
+        self._resources = {}
+        self._lock = Lock()
+        self.suppressed = 0
+
+    @staticmethod
+    def _key(message: dict):
+        return (str(message.get(const.ALERT_SENSOR_INFO, "")),
+                str(message.get(const.ALERT_MODULE_TYPE, "")))
+
+    def _expire(self, resource, now):
+        while resource.transitions and resource.transitions[0] < now - self._window:
+            resource.transitions.popleft()
+
+    def flapping(self) -> List[tuple]:
+        """ :return: keys of the flapping resources """
+        with self._lock:
+            return [key for key, resource in self._resources.items() if resource.flapping]
+
+    def observe(self, message: dict) -> List[dict]:
+        """
+        Pass an incoming alert through the detector
+        :return: alerts to be processed now
+        """
+        if self._threshold <= 0:
+            return [message]
+        now = self._clock()
+        key = self._key(message)
+        state = message.get(const.ALERT_STATE, "")
+        with self._lock:
+            resource = self._resources.get(key)
+            if resource is None:
+                resource = self._resources[key] = self._Resource()
+            if resource.state is not None and state != resource.state:
+                resource.transitions.append(now)
+                resource.last_transition = now
+            resource.state = state
+            resource.last_seen = now
+            self._expire(resource, now)
+            if resource.flapping:
+                resource.latest = message
+                resource.held += 1
+                self.suppressed += 1
+                return []
+            if len(resource.transitions) >= self._threshold:
+                Log.warn(f"Resource {key} is flapping: {len(resource.transitions)} state "
+                         f"changes in {self._window}s, its alerts are damped")
+                resource.flapping = True
+                resource.latest = message
+                resource.held = 0
+                resource.last_forwarded = now
+                message[const.ALERT_FLAPPING] = True
+        return [message]
+
+    def check(self) -> Dict[tuple, dict]:
+        """
+        Find flapping resources that settled or are due for a summary.
+        The resources are not changed until forwarded is called.
+        :return: alerts to be processed now by resource keys
+        """
+        now = self._clock()
+        due = {}
+        with self._lock:
+            for key, resource in list(self._resources.items()):
+                self._expire(resource, now)
+                if not resource.flapping:
+                    if now - resource.last_seen >= self._window:
+                        # No alerts for the whole window
+                        del self._resources[key]
+                    continue
+                settled = now - resource.last_transition >= self._settle_time
+                if not settled and not (resource.held and
+                                        now - resource.last_forwarded >= self._summary_interval):
+                    continue
+                resource.forwarding = (resource.held, resource.last_transition, settled)
+                due[key] = dict(resource.latest, **{const.ALERT_FLAPPING: not settled})
+        return due
+
+    def forwarded(self, keys: Iterable[tuple]):
+        """ Commit the alerts returned by check, once they are stored """
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                resource = self._resources.get(key)
+                if resource is None or resource.forwarding is None:
+                    continue
+                held, last_transition, settled = resource.forwarding
+                resource.forwarding = None
+                if settled and resource.last_transition == last_transition:
+                    Log.info(f"Resource {key} settled in state {resource.state}")
+                    resource.flapping = False
+                    resource.transitions.clear()
+                elif not settled:
+                    Log.info(f"Resource {key} is still flapping, {held} alerts "
+                             f"were held in {now - resource.last_forwarded:.0f}s")
+                # Alerts held after the check are forwarded by the next one
+                resource.held -= held
+                resource.last_forwarded = now
+
+
+class AlertRepository(IAlertStorage, Observable):
+    """
+    Alerts storage. Stored alerts are passed to listeners,
+    open alerts are also kept in the in-memory index.
+    """
+
+    def __init__(self, storage: DataBaseProvider, bulk: EsBulkClient = None):
+        """
+        :param bulk: Elasticsearch bulk API client, without it bulk
+                     methods write documents one by one
+        """
+        super().__init__()
         self.db = storage
+        self._bulk = bulk
+        self._alerts_index = bulk.index_of(AlertModel) if bulk else None
+        self._history_index = bulk.index_of(AlertsHistoryModel) if bulk else None
+        self.open_alerts = OpenAlertIndex()
+        self.history = AlertHistoryIndex()
+
+    async def load_open_alerts(self):
+        """ Fill the open alert index from the DB """
+        self.open_alerts.begin_load()
+        try:
+            alerts = await self.retrieve_open_alerts()
+        except Exception:
+            self.open_alerts.load_cancelled()
+            raise
+        self.open_alerts.load(alerts, complete=True)
+        Log.info(f"Loaded {len(alerts)} open alerts")
+
+    async def retrieve_open_alerts(self, page_size: int = const.ES_RECORD_LIMIT
+                                   ) -> List[AlertModel]:
+        """ Retrieve all alerts that are not both resolved and acknowledged """
+        field = const.ALERT_CREATED_TIME
+        sort = SortBy(field, SortOrder.ASC)
+        alerts, after = [], None
+        while True:
+            page = await self.retrieve_by_range(None, show_all=False, sort=sort,
+                                                limits=QueryLimits(page_size, 0), after=after)
+            alerts.extend(page)
+            if len(page) < page_size:
+                return alerts
+            after = PageCursor.after(
+                page, field, 'asc', lambda alert: AlertModel.created_time.to_primitive(
+                    alert.created_time), lambda alert: alert.alert_uuid, after)
 
     async def store(self, alert: AlertModel):
         await self.db(AlertModel).store(alert)
+        self.open_alerts.put(alert)
+        self._notify_listeners(alert, loop=asyncio.get_event_loop())
 
     async def store_alerts_history(self, alert: AlertsHistoryModel):
-        await self.db(AlertsHistoryModel).store(alert)
+        await self.store_many((), [alert])
+
+    async def _bulk_write(self, actions, fallbacks, raise_errors=True,
+                          raise_unavailable=False):
+        """
+        Send actions in one bulk request. Actions that failed, or all of
+        them if bulk writes are not available, are retried one by one.
+        :param fallbacks: coroutine functions doing the same as the actions
+        :param raise_errors: raise the first error instead of returning them
+        :param raise_unavailable: raise the first error if the bulk request
+                                  and all the single writes failed, the storage
+                                  is then unavailable rather than rejecting
+                                  some documents
+        :return: error of every action, None for the successful ones
+        """
+        errors = [True] * len(actions)
+        request_failed = True
+        if self._bulk is not None:
+            try:
+                errors = await self._bulk.bulk(actions)
+                request_failed = False
+            except CsmError as e:
+                Log.warn(f"Bulk write failed, writing documents one by one: {e}")
+        failed = [index for index, error in enumerate(errors) if error]
+        if failed:
+            results = await asyncio.gather(*(fallbacks[index]() for index in failed),
+                                           return_exceptions=True)
+            errors = list(errors)
+            for index, result in zip(failed, results):
+                errors[index] = result if isinstance(result, Exception) else None
+        error = next((error for error in errors if error is not None), None)
+        if error is not None and (raise_errors or raise_unavailable and request_failed
+                                  and all(error is not None for error in errors)):
+            raise error
+        return errors
+
+    async def store_many(self, alerts: Iterable[AlertModel],
+                         history: Iterable[AlertsHistoryModel] = (),
+                         updates: Iterable[Tuple[AlertModel, Iterable[str]]] = (),
+                         raise_errors: bool = True) -> List[tuple]:
+        """
+        Store alerts and alert history records in one round trip.
+        History records repeating the last record of their resource
+        are counted in that record instead of being stored.
+        :param alerts: new alerts, written as a whole
+        :param updates: (alert, changed fields) of stored alerts, only the
+                        fields are written so that changes made by others,
+                        like acknowledgements and comments, are kept
+        :param raise_errors: raise the first error. Otherwise errors of some
+                             documents are returned, and only an unavailable
+                             storage raises.
+        :return: (alert or history record, error) of the documents not stored
+        """
+        alerts = list(alerts)
+        updated = [alert for alert, _ in updates]
+        history, last_history = self.history.deduplicate(history)
+        actions = []
+        fallbacks = []
+        for alert in alerts:
+            actions.append(EsBulkClient.index_action(
+                self._alerts_index, alert.alert_uuid, alert.to_primitive()))
+            fallbacks.append(partial(self.db(AlertModel).store, alert))
+        for alert, fields in updates:
+            primitive = alert.to_primitive()
+            doc = {f: primitive.get(f) for f in fields}
+            actions.append(EsBulkClient.update_action(self._alerts_index, alert.alert_uuid, doc))
+            fallbacks.append(partial(self.db(AlertModel).update,
+                Compare(AlertModel.alert_uuid, '=', alert.alert_uuid), doc))
+        for record in history:
+            actions.append(EsBulkClient.index_action(
+                self._history_index, record.alert_uuid, record.to_primitive()))
+            fallbacks.append(partial(self.db(AlertsHistoryModel).store, record))
+        errors = await self._bulk_write(actions, fallbacks, raise_errors, raise_unavailable=True)
+        failed = [(document, error) for document, error
+                  in zip(alerts + updated + history, errors) if error is not None]
+        failed_ids = {id(document) for document, _ in failed}
+        self.history.commit({key: record for key, record in last_history.items()
+                             if id(record) not in failed_ids})
+        self._stored(alert for alert in alerts + updated if id(alert) not in failed_ids)
+        return failed
+
+    async def compact_alerts_history(self, before: datetime,
+                                     page_size: int = const.ES_RECORD_LIMIT) -> int:
+        """
+        Merge runs of repeated history records of a resource created before
+        the time into the first record of the run, which gets the count and
+        the time of the last one. The last record of every resource known to
+        the history index is left alone, new records may still be counted in it.
+        :return: number of removed records
+        """
+        field = const.ALERT_CREATED_TIME
+        sort = SortBy(field, SortOrder.ASC)
+        time_range = DateTimeRange(None, before)
+        # Resource -> first record of the current run
+        runs = {}
+        removed, after = 0, None
+        while True:
+            page = await self.retrieve_all_alerts_history(
+                time_range, sort, QueryLimits(page_size, 0), after=after)
+            changed = {}
+            merged = []
+            for record in page:
+                key = AlertHistoryIndex.key(record)
+                first = runs.get(key)
+                if self.history.is_last(record):
+                    runs.pop(key, None)
+                elif (first is not None and AlertHistoryIndex.fingerprint(first)
+                        == AlertHistoryIndex.fingerprint(record)):
+                    AlertHistoryIndex.merge(first, record)
+                    changed[first.alert_uuid] = first
+                    merged.append(record)
+                else:
+                    runs[key] = record
+            actions = []
+            fallbacks = []
+            for record in changed.values():
+                actions.append(EsBulkClient.index_action(
+                    self._history_index, record.alert_uuid, record.to_primitive()))
+                fallbacks.append(partial(self.db(AlertsHistoryModel).store, record))
+            for record in merged:
+                actions.append(EsBulkClient.delete_action(
+                    self._history_index, record.alert_uuid))
+                fallbacks.append(partial(self.db(AlertsHistoryModel).delete,
+                    Compare(AlertsHistoryModel.alert_uuid, '=', record.alert_uuid)))
+            await self._bulk_write(actions, fallbacks)
+            removed += len(merged)
+            if len(page) < page_size:
+                return removed
+            after = PageCursor.after(
+                page, field, 'asc', lambda record: AlertsHistoryModel.created_time.to_primitive(
+                    record.created_time), lambda record: record.alert_uuid, after)
+
+    async def update_many(self, alerts: Iterable[AlertModel]):
+        """ Replace whole alerts in one round trip """
+        await self.store_many(alerts)
+
+    async def update_fields(self, alerts: Iterable[AlertModel], fields: Iterable[str],
+                            raise_errors: bool = True) -> List[Optional[Exception]]:
+        """
+        Write only some fields of the alerts, in one round trip.
+        The alert objects must already have the new values.
+        :param raise_errors: raise the first error instead of returning them
+        :return: error of every alert, None for the updated ones
+        """
+        alerts = list(alerts)
+        fields = list(fields)
+        actions = []
+        fallbacks = []
+        for alert in alerts:
+            primitive = alert.to_primitive()
+            doc = {f: primitive.get(f) for f in fields}
+            actions.append(EsBulkClient.update_action(self._alerts_index, alert.alert_uuid, doc))
+            fallbacks.append(partial(self.db(AlertModel).update,
+                Compare(AlertModel.alert_uuid, '=', alert.alert_uuid), doc))
+        errors = await self._bulk_write(actions, fallbacks, raise_errors)
+        self._stored(alert for alert, error in zip(alerts, errors) if error is None)
+        return errors
+
+    async def append_comment(self, alert: AlertModel, comment: CommentModel):
+        """
+        Add the comment to the stored alert without rewriting the alert.
+        The alert object must already have the comment and the new updated time.
+        """
+        primitive = alert.to_primitive()
+        script = {
+            'source': "if (ctx._source.comments == null) { ctx._source.comments = []; }"
+                      " ctx._source.comments.add(params.comment);"
+                      " ctx._source.updated_time = params.updated_time;",
+            'params': {
+                'comment': comment.to_primitive(),
+                'updated_time': primitive.get(const.ALERT_UPDATED_TIME),
+            },
+        }
+        action = EsBulkClient.update_action(self._alerts_index, alert.alert_uuid,
+                                            script=script)
+        # Without the bulk API the comments known to this alert replace the
+        # stored ones, the other fields are kept
+        fallback = partial(self.db(AlertModel).update,
+            Compare(AlertModel.alert_uuid, '=', alert.alert_uuid),
+            {const.ALERT_COMMENTS: primitive.get(const.ALERT_COMMENTS),
+             const.ALERT_UPDATED_TIME: primitive.get(const.ALERT_UPDATED_TIME)})
+        await self._bulk_write([action], [fallback])
+        self._stored([alert])
+
+    def _stored(self, alerts):
+        loop = asyncio.get_event_loop()
+        for alert in alerts:
+            self.open_alerts.put(alert)
+            self._notify_listeners(alert, loop=loop)
 
     async def retrieve(self, alert_id) -> AlertModel:
         query = Query().filter_by(Compare(AlertModel.alert_uuid, '=', alert_id))
@@ -69,22 +730,38 @@ class AlertRepository(IAlertStorage):
         return next(iter(await self.db(AlertsHistoryModel).get(query)), None)
 
     async def retrieve_by_sensor_info(self, sensor_info, module_type) -> AlertModel:
+        found, alert = self.open_alerts.lookup(sensor_info, module_type)
+        if found:
+            return alert
         filter = And(And(Compare(AlertModel.sensor_info, '=', \
                 str(sensor_info)), Compare(AlertModel.module_type, "=", \
                 str(module_type))), Or(Compare(AlertModel.acknowledged, '=', \
                 False), Compare(AlertModel.resolved, '=', False)))
         query = Query().filter_by(filter)
-        return next(iter(await self.db(AlertModel).get(query)), None)
+        alert = next(iter(await self.db(AlertModel).get(query)), None)
+        if alert is not None:
+            self.open_alerts.put(alert)
+        return alert
 
     async def update(self, alert: AlertModel):
         await self.db(AlertModel).store(alert)
+        self.open_alerts.put(alert)
+        self._notify_listeners(alert, loop=asyncio.get_event_loop())
 
     async def update_by_sensor_info(self, sensor_info, module_type, update_params):
         filter = And(And(Compare(AlertModel.sensor_info, '=', \
                 str(sensor_info)), Compare(AlertModel.module_type, "=", \
                 str(module_type))), Or(Compare(AlertModel.acknowledged, '=', \
                 False), Compare(AlertModel.resolved, '=', False)))
-        await self.db(AlertModel).update(filter, update_params)
+        try:
+            await self.db(AlertModel).update(filter, update_params)
+        except Exception:
+            # The update may have been applied partially
+            self.open_alerts.invalidate(sensor_info, module_type)
+            raise
+        alert = self.open_alerts.update(sensor_info, module_type, update_params)
+        if alert is not None:
+            self._notify_listeners(alert, loop=asyncio.get_event_loop())
 
     def _prepare_time_range(self, field, time_range: DateTimeRange):
         db_conditions = []
@@ -133,20 +810,42 @@ class AlertRepository(IAlertStorage):
         active_alerts_or = Or(*or_cond)
         and_conditions.append(active_alerts_or)
 
+    @staticmethod
+    def _after_cursor(model, query_filter, after: Optional[PageCursor]):
+        """
+        Add to the filter the condition selecting records after the cursor.
+        The IDs are excluded in chunks to stay under the query clause limit.
+        """
+        if after is None:
+            return query_filter
+        field = getattr(model, after.field)
+        conditions = [Compare(field, '>=' if after.order == 'asc' else '<=',
+                              field.to_native(after.value))]
+        chunk = const.ALERT_IDS_QUERY_CHUNK
+        for i in range(0, len(after.ids), chunk):
+            conditions.append(And(*(Compare(model.alert_uuid, '!=', alert_id)
+                                    for alert_id in after.ids[i:i + chunk])))
+        if query_filter is not None:
+            conditions.insert(0, query_filter)
+        return And(*conditions)
+
     async def retrieve_by_range(
             self, create_time_range: DateTimeRange, show_all: bool=True,
             severity: str=None, sort: Optional[SortBy]=None,
             limits: Optional[QueryLimits]=None, resolved: bool = None, acknowledged: bool = None,
-            show_active: bool=False) -> Iterable[AlertModel]:
-
+            show_active: bool=False, after: Optional[PageCursor] = None) -> Iterable[AlertModel]:
+        """
+        :param after: return the alerts after this cursor, the offset is then ignored
+        """
         query_filter = self._prepare_filters(create_time_range, show_all, severity,
                 resolved, acknowledged, show_active)
+        query_filter = self._after_cursor(AlertModel, query_filter, after)
         query = Query().filter_by(query_filter)
 
         if not limits:
             limits = QueryLimits(const.ES_RECORD_LIMIT, 0)
 
-        if limits and limits.offset:
+        if limits.offset and after is None:
             query = query.offset(limits.offset)
 
         if limits and limits.limit:
@@ -165,6 +864,53 @@ class AlertRepository(IAlertStorage):
             self._prepare_filters(create_time_range, show_all, severity, resolved,
                 acknowledged, show_active))
 
+    @staticmethod
+    def _estimated_page(items, limits: Optional[QueryLimits]):
+        """
+        Cut the extra record fetched to see if there is more after the page.
+        The total is exact on the last page and a lower bound before it.
+        :return: page, total, is the total exact
+        """
+        offset = (limits.offset or 0) if limits else 0
+        if limits and limits.limit and len(items) > limits.limit:
+            return items[:limits.limit], offset + len(items), False
+        return items, offset + len(items), True
+
+    @staticmethod
+    def _probe_limits(limits: Optional[QueryLimits]) -> Optional[QueryLimits]:
+        if limits and limits.limit:
+            return QueryLimits(limits.limit + 1, limits.offset)
+        return limits
+
+    async def retrieve_page_by_range(
+            self, create_time_range: DateTimeRange, show_all: bool=True,
+            severity: str=None, sort: Optional[SortBy]=None,
+            limits: Optional[QueryLimits]=None, resolved: bool = None, acknowledged: bool = None,
+            show_active: bool=False, estimate: bool = False,
+            after: Optional[PageCursor] = None):
+        """
+        Retrieve a page of alerts together with the number of all matching alerts
+        :param estimate: do not count the alerts, only check if there are more
+                         after the page. Cheaper for large ranges. With a cursor
+                         the estimate counts the alerts after the cursor.
+        :param after: return the alerts after this cursor
+        :return: alerts, total, is the total exact
+        """
+        if not limits:
+            limits = QueryLimits(const.ES_RECORD_LIMIT, 0)
+        if after is not None:
+            limits = QueryLimits(limits.limit, 0)
+        if estimate:
+            alerts = await self.retrieve_by_range(create_time_range, show_all, severity,
+                sort, self._probe_limits(limits), resolved, acknowledged, show_active, after)
+            return self._estimated_page(alerts, limits)
+        alerts, total = await asyncio.gather(
+            self.retrieve_by_range(create_time_range, show_all, severity, sort, limits,
+                resolved, acknowledged, show_active, after),
+            self.count_by_range(create_time_range, show_all, severity, resolved,
+                acknowledged, show_active))
+        return alerts, total, True
+
     async def retrieve_all(self) -> list:
         """
         Retrieves all the alerts
@@ -173,12 +919,14 @@ class AlertRepository(IAlertStorage):
 
     async def retrieve_all_alerts_history(self, create_time_range: DateTimeRange, \
             sort: Optional[SortBy]=None, limits: Optional[QueryLimits]=None, \
-            sensor_info: str = None) -> Iterable[AlertsHistoryModel]:
+            sensor_info: str = None, after: Optional[PageCursor] = None
+            ) -> Iterable[AlertsHistoryModel]:
 
         query_filter = self._prepare_history_filters(create_time_range, sensor_info)
+        query_filter = self._after_cursor(AlertsHistoryModel, query_filter, after)
         query = Query().filter_by(query_filter)
 
-        if limits and limits.offset:
+        if limits and limits.offset and after is None:
             query = query.offset(limits.offset)
 
         if limits and limits.limit:
@@ -190,11 +938,20 @@ class AlertRepository(IAlertStorage):
         return await self.db(AlertsHistoryModel).get(query)
 
     async def retrieve_by_ids(self, alert_ids)-> Iterable[AlertsHistoryModel]:
+        alert_ids = list(alert_ids)
+        if len(alert_ids) > const.ALERT_IDS_QUERY_CHUNK:
+            # Large ID lists are split to stay under the query clause limit
+            chunk = const.ALERT_IDS_QUERY_CHUNK
+            results = await asyncio.gather(*(self.retrieve_by_ids(alert_ids[i:i + chunk])
+                                             for i in range(0, len(alert_ids), chunk)))
+            return [alert for result in results for alert in result]
         compares = list()
         for uuid in alert_ids:
             compares.append(Compare(AlertModel.alert_uuid, "=", uuid))
+        if not compares:
+            return []
         filter = Or(*compares)
-        query = Query().filter_by(filter)
+        query = Query().filter_by(filter).limit(len(compares))
         return await self.db(AlertModel).get(query)
 
     async def count_alerts_history(self, create_time_range: DateTimeRange,\
@@ -203,6 +960,28 @@ class AlertRepository(IAlertStorage):
         return await self.db(AlertsHistoryModel).count(\
                 self._prepare_history_filters(create_time_range, sensor_info))
 
+    async def retrieve_alerts_history_page(self, create_time_range: DateTimeRange,
+            sort: Optional[SortBy]=None, limits: Optional[QueryLimits]=None,
+            sensor_info: str = None, estimate: bool = False,
+            after: Optional[PageCursor] = None):
+        """
+        Retrieve a page of alerts history together with the number of all matching records
+        :param estimate: see retrieve_page_by_range
+        :param after: return the records after this cursor
+        :return: alerts, total, is the total exact
+        """
+        if limits and after is not None:
+            limits = QueryLimits(limits.limit, 0)
+        if estimate:
+            alerts = await self.retrieve_all_alerts_history(create_time_range, sort,
+                self._probe_limits(limits), sensor_info, after)
+            return self._estimated_page(alerts, limits)
+        alerts, total = await asyncio.gather(
+            self.retrieve_all_alerts_history(create_time_range, sort, limits, sensor_info,
+                after),
+            self.count_alerts_history(create_time_range, sensor_info))
+        return alerts, total, True
+
     def _prepare_history_filters(self, create_time_range: DateTimeRange, \
             sensor_info: str = None):
         and_conditions = [*self._prepare_time_range\
@@ -279,8 +1058,49 @@ class AlertsAppService(ApplicationService):
         Provides operations on alerts without involving the domain specifics
     """
 
+    # Fields changed by acknowledgement
+    _ACK_FIELDS = (const.ALERT_ACKNOWLEDGED, const.ALERT_RESOLVED, const.ALERT_UPDATED_TIME)
+
     def __init__(self, repo: AlertRepository):
         self.repo = repo
+        self.summary = AlertSummary()
+        self.repo.add_listener(self.summary.update)
+        # Counters received from the agent process that consumes alerts
+        self._summary_snapshot = None
+
+    def get_alert_summary(self) -> dict:
+        """
+        Counters of open alerts, from memory
+        :raises CsmServiceNotAvailable: the counters are not loaded yet
+        """
+        summary = self._summary_snapshot or self.summary.get()
+        if summary is None:
+            raise CsmServiceNotAvailable(CSM_PROVIDER_NOT_AVAILABLE,
+                                         "Alert summary is not available yet")
+        return summary
+
+    def set_alert_summary(self, summary: dict):
+        """
+        Replace the counters with the ones of the agent process that consumes alerts
+        """
+        self._summary_snapshot = summary
+
+    async def reconcile_alert_summary(self):
+        """ Recount open alerts from the DB, fixing the counters if they drifted """
+        self.summary.begin_load()
+        try:
+            alerts = await self.repo.retrieve_open_alerts()
+        except Exception:
+            self.summary.load_cancelled()
+            raise
+        self.summary.load(alerts)
+        Log.debug(f"Alert summary reconciled: {self.summary.get()}")
+
+    async def compact_alerts_history(self):
+        """ Merge repeated alert history records older than ALERT_HISTORY_COMPACT_AGE """
+        before = datetime.now(timezone.utc) - timedelta(seconds=const.ALERT_HISTORY_COMPACT_AGE)
+        removed = await self.repo.compact_alerts_history(before)
+        Log.info(f"Alert history compaction removed {removed} repeated records")
 
     async def update_alert(self, alert_id, fields: dict):
         """
@@ -304,18 +1124,21 @@ class AlertsAppService(ApplicationService):
                 ALERTS_MSG_RESOLVED_AND_ACKED_ERROR)
 
         if "acknowledged" in fields:
-            alert.acknowledged = AlertModel.acknowledged.to_native(fields["acknowledged"])
-            alert.updated_time = int(time.time())
-            """
-            We will mark IEM alert as resolved as soon as it is acknowledged, as
-            there will be no state change occurs for IEM alerts.
-            """
-            if alert.module_type == const.IEM:
-                alert.resolved = AlertModel.resolved.to_native(True)
-
-        await self.repo.update(alert)
+            self._acknowledge(alert, fields["acknowledged"])
+            await self.repo.update_fields([alert], self._ACK_FIELDS)
         return alert.to_primitive()
 
+    @staticmethod
+    def _acknowledge(alert, acknowledged):
+        alert.acknowledged = AlertModel.acknowledged.to_native(acknowledged)
+        alert.updated_time = AlertModel.updated_time.to_native(int(time.time()))
+        """
+        We will mark IEM alert as resolved as soon as it is acknowledged, as
+        there will be no state change occurs for IEM alerts.
+        """
+        if alert.module_type == const.IEM:
+            alert.resolved = AlertModel.resolved.to_native(True)
+
     @Log.trace_method(Log.DEBUG)
     async def add_comment_to_alert(self, alert_uuid: str, user_id: str, comment_text: str):
         """
@@ -336,10 +1159,10 @@ class AlertsAppService(ApplicationService):
 
         if alert["comments"] is None:
             alert["comments"] = []
-        alert[const.ALERT_UPDATED_TIME] = int(time.time())
+        alert[const.ALERT_UPDATED_TIME] = AlertModel.updated_time.to_native(int(time.time()))
         alert_comment = self.build_alert_comment_model(str(len(alert["comments"]) + 1), comment_text, user_id)
         alert["comments"].append(alert_comment)
-        await self.repo.update(alert)
+        await self.repo.append_comment(alert, alert_comment)
 
         return alert_comment.to_primitive()
 
@@ -382,36 +1205,42 @@ class AlertsAppService(ApplicationService):
         Update the Data of Specific Alerts
         :param fields: A dictionary containing alert ids.
                 It will acknowledge all the alerts of the specified ids.
-        :return:
+        :return: result for every ID in the request order, the acknowledged
+                 alert or {"alert_uuid": ..., "error": {"message_id": ..., "message": ...}}
         """
         Log.debug(f"Update all alerts service. fields:{fields}")
-        if not isinstance(fields, list):
-            raise InvalidRequest("Acknowledged value must be of type boolean.")
-
-        alerts = []
-
-        for alert_id in fields:
-            alert = await self.repo.retrieve(alert_id)
-            if not alert:
-                raise CsmNotFoundError("Alert not found for id" + alert_id, ALERTS_MSG_NOT_FOUND)
-
-            alert.acknowledged = AlertModel.acknowledged.to_native(True)
-            alert.updated_time = int(time.time())
-            """
-            We will mark IEM alert as resolved as soon as it is acknowledged, as
-            there will be no state change occurs for IEM alerts.
-            """
-            if alert.module_type == const.IEM:
-                alert.resolved = AlertModel.resolved.to_native(True)
-            await self.repo.update(alert)
-            alerts.append(alert.to_primitive())
-
-        return alerts
+        if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+            raise InvalidRequest("Request body must be a list of alert IDs.")
+
+        alert_ids = list(dict.fromkeys(fields))
+        found = {alert.alert_uuid: alert for alert in await self.repo.retrieve_by_ids(alert_ids)}
+        alerts = [found[alert_id] for alert_id in alert_ids if alert_id in found]
+        for alert in alerts:
+            self._acknowledge(alert, True)
+        errors = await self.repo.update_fields(alerts, self._ACK_FIELDS, raise_errors=False)
+        failed = {alert.alert_uuid: error for alert, error in zip(alerts, errors) if error}
+
+        results = []
+        for alert_id in alert_ids:
+            if alert_id not in found:
+                results.append({const.ALERT_UUID: alert_id, 'error': {
+                    'message_id': ALERTS_MSG_NOT_FOUND,
+                    'message': f"Alert not found for id {alert_id}"}})
+            elif alert_id in failed:
+                Log.error(f"Acknowledgement of alert {alert_id} failed: {failed[alert_id]}")
+                results.append({const.ALERT_UUID: alert_id, 'error': {
+                    'message_id': ALERTS_MSG_UPDATE_FAILED,
+                    'message': f"Alert {alert_id} could not be updated"}})
+            else:
+                results.append(found[alert_id].to_primitive())
+        return results
 
     async def fetch_all_alerts(self, duration, direction, sort_by, severity: Optional[str] = None,
                                offset: Optional[int] = None, show_all: Optional[bool] = True,
                                page_limit: Optional[int] = None, resolved: bool =
-                               None, acknowledged: bool = None, show_active: Optional[bool] = False) -> Dict:
+                               None, acknowledged: bool = None, show_active: Optional[bool] = False,
+                               estimate_total: bool = False, cursor: Optional[str] = None
+                               ) -> JsonStream:
         """
         Fetch All Alerts
         :param duration: time duration for range of alerts
@@ -426,6 +1255,9 @@ class AlertsAppService(ApplicationService):
         :param show_active: active alerts will fetched. Active alerts are
         identified as only one flag out of acknowledged and resolved flags
         must be true and the other must be false.
+        :param estimate_total: do not count all the alerts, total_records is
+        then a lower bound unless total_records_relation is "eq".
+        :param cursor: next_cursor of the previous page, used instead of the offset
         :return: :type:list
         """
         time_range = None
@@ -451,8 +1283,9 @@ class AlertsAppService(ApplicationService):
         elif page_limit is not None:
             limits = QueryLimits(page_limit, 0)
 
+        after = self._decode_cursor(cursor, sort_by, direction)
         # TODO: the function takes too many parameters
-        alerts_list = await self.repo.retrieve_by_range(
+        alerts_list, alerts_count, exact = await self.repo.retrieve_page_by_range(
             time_range,
             show_all,
             severity,
@@ -460,15 +1293,56 @@ class AlertsAppService(ApplicationService):
             limits,
             resolved,
             acknowledged,
-            show_active
+            show_active,
+            estimate_total,
+            after
         )
-
-        alerts_count = await self.repo.count_by_range(time_range, show_all,
-                severity, resolved, acknowledged, show_active)
-        return {
-            "total_records": alerts_count,
-            "alerts": [alert.to_primitive_filter_empty() for alert in alerts_list]
-        }
+        envelope = self._total_envelope(alerts_count, exact, estimate_total)
+        envelope["next_cursor"] = self._next_cursor(AlertModel, alerts_list, page_limit,
+                                                    sort_by, direction, after)
+        return JsonStream(alerts_list, key="alerts", envelope=envelope,
+                          transform=lambda alert: alert.to_primitive_filter_empty())
+
+    @staticmethod
+    def _total_envelope(count: int, exact: bool, estimate: bool) -> dict:
+        envelope = {"total_records": count}
+        if estimate:
+            envelope["total_records_relation"] = "eq" if exact else "gte"
+        return envelope
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str], sort_by: str,
+                       direction: str) -> Optional[PageCursor]:
+        if not cursor:
+            return None
+        if sort_by not in const.ALERT_CURSOR_SORT_FIELDS:
+            raise InvalidRequest(
+                f"Cursor pagination is supported for sorting by "
+                f"{', '.join(const.ALERT_CURSOR_SORT_FIELDS)}", ALERTS_MSG_INVALID_CURSOR)
+        try:
+            after = PageCursor.decode(cursor)
+        except ValueError:
+            raise InvalidRequest("Invalid cursor", ALERTS_MSG_INVALID_CURSOR)
+        if (after.field, after.order) != (sort_by, direction):
+            raise InvalidRequest("The cursor was created for a different sorting",
+                                 ALERTS_MSG_INVALID_CURSOR)
+        return after
+
+    @staticmethod
+    def _next_cursor(model, alerts, page_limit: Optional[int], sort_by: str,
+                     direction: str, after: Optional[PageCursor]) -> Optional[str]:
+        """
+        Cursor of the next page, None if the page is the last one or the
+        sort field is not suitable for cursors
+        """
+        if (sort_by not in const.ALERT_CURSOR_SORT_FIELDS or not page_limit
+                or len(alerts) < page_limit):
+            return None
+        field = getattr(model, sort_by)
+        cursor = PageCursor.after(alerts, sort_by, direction,
+                                  lambda alert: field.to_primitive(getattr(alert, sort_by)),
+                                  lambda alert: alert.alert_uuid, after)
+        return cursor.encode()
 
     async def fetch_alert(self, alert_id):
         """
@@ -487,7 +1361,9 @@ class AlertsAppService(ApplicationService):
                                         offset: Optional[int] = None \
                                         , page_limit: Optional[int] = None, \
                                         sensor_info: Optional[str] = None, \
-                                        start_date = None, end_date = None) -> Dict:
+                                        start_date = None, end_date = None, \
+                                        estimate_total: bool = False, \
+                                        cursor: Optional[str] = None) -> JsonStream:
         """
         Fetch All Alerts to show history
         :param duration: time duration for range of alerts
@@ -495,6 +1371,8 @@ class AlertsAppService(ApplicationService):
         :param sort_by: key by which sorting needs to be performed.
         :param offset: offset page (1-based indexing)
         :param page_limit: no of records to be displayed on a page.
+        :param estimate_total: see fetch_all_alerts
+        :param cursor: see fetch_all_alerts
         :return: :type:list
         """
         time_range = None
@@ -525,18 +1403,20 @@ class AlertsAppService(ApplicationService):
         elif page_limit is not None:
             limits = QueryLimits(page_limit, 0)
 
-        alerts_list = await self.repo.retrieve_all_alerts_history(
+        after = self._decode_cursor(cursor, sort_by, direction)
+        alerts_list, alerts_count, exact = await self.repo.retrieve_alerts_history_page(
             time_range,
             SortBy(sort_by, SortOrder.ASC if direction == "asc" else SortOrder.DESC),
             limits,
-            sensor_info
+            sensor_info,
+            estimate_total,
+            after
         )
-
-        alerts_count = await self.repo.count_alerts_history(time_range, sensor_info)
-        return {
-            "total_records": alerts_count,
-            "alerts": [alert.to_primitive_filter_empty() for alert in alerts_list]
-        }
+        envelope = self._total_envelope(alerts_count, exact, estimate_total)
+        envelope["next_cursor"] = self._next_cursor(AlertsHistoryModel, alerts_list,
+                                                    page_limit, sort_by, direction, after)
+        return JsonStream(alerts_list, key="alerts", envelope=envelope,
+                          transform=lambda alert: alert.to_primitive_filter_empty())
 
     async def fetch_alert_history(self, alert_id):
         """
@@ -605,7 +1485,7 @@ class AlertEmailNotifier(Service):
         await self.email_sender_queue.enqueue_bulk_email(message,
             target_emails, smtp_config)
 
-class AlertMonitorService(Service, Observable):
+class AlertMonitorService(Service):
     """
     Alert Monitor works with AmqpComm to monitor alerts.
     When Alert Monitor receives a subscription request, it scans the DB and
@@ -615,12 +1495,14 @@ class AlertMonitorService(Service, Observable):
     Alert Monitor takes action on the received alerts using a callback.
     Actions include (1) storing on the DB and (2) sending to subscribers, i.e.
     web server.
+    Processed alerts are published as AlertEvent subclasses on the event bus.
     """
 
-    def __init__(self, repo: AlertRepository, plugin, health_plugin, \
-        http_notifications):
+    def __init__(self, repo: AlertRepository, plugin, health_plugin,
+                 events: EventBus = None):
         """
         Initializes the Alert Plugin
+        :param events: bus the alert events are published on
         """
         self._alert_plugin = plugin
         self._monitor_thread = None
@@ -629,9 +1511,60 @@ class AlertMonitorService(Service, Observable):
         self._ret = False
         self.repo = repo
         self._health_plugin = health_plugin
-        self._http_notfications = http_notifications
         self._es_retry = Conf.get(const.CSM_GLOBAL_INDEX, const.ES_RETRY, 5)
+        window_size = Conf.get(const.CSM_GLOBAL_INDEX, const.ALERT_WINDOW_SIZE_KEY)
+        self._window_size = int(window_size) if window_size else const.ALERT_WINDOW_SIZE
+        window_latency = Conf.get(const.CSM_GLOBAL_INDEX, const.ALERT_WINDOW_LATENCY_KEY)
+        self._window_latency = (float(window_latency) if window_latency
+                                else const.ALERT_WINDOW_LATENCY)
+        self._flaps = AlertFlapDetector(
+            self._conf_number(const.ALERT_FLAP_THRESHOLD_KEY, const.ALERT_FLAP_THRESHOLD, int),
+            self._conf_number(const.ALERT_FLAP_WINDOW_KEY, const.ALERT_FLAP_WINDOW),
+            self._conf_number(const.ALERT_FLAP_SETTLE_TIME_KEY, const.ALERT_FLAP_SETTLE_TIME),
+            self._conf_number(const.ALERT_FLAP_SUMMARY_INTERVAL_KEY,
+                              const.ALERT_FLAP_SUMMARY_INTERVAL))
+        self._flap_checker = None
+        # Created on the loop by _process_window
+        self._window_lock = None
         super().__init__()
+        self.events = events or EventBus(self._loop)
+        # (time, number of alerts) of recent windows
+        self._rate_samples = deque()
+        self._metrics_logged = time.monotonic()
+        self._stats = {
+            'alerts': 0,
+            'windows': 0,
+            'failed_windows': 0,
+            'failed_documents': 0,
+            'window_time_max': 0.0,
+        }
+
+    @staticmethod
+    def _conf_number(key, default, number_type=float):
+        value = Conf.get(const.CSM_GLOBAL_INDEX, key)
+        return number_type(value) if value is not None else default
+
+    def metrics(self) -> dict:
+        """ Alert ingestion counters and the recent ingestion rate """
+        now = time.monotonic()
+        samples = [count for sample_time, count in list(self._rate_samples)
+                   if sample_time >= now - const.ALERT_RATE_INTERVAL]
+        metrics = dict(self._stats)
+        metrics['alerts_per_sec'] = sum(samples) / const.ALERT_RATE_INTERVAL
+        metrics['flapping_resources'] = len(self._flaps.flapping())
+        metrics['damped_alerts'] = self._flaps.suppressed
+        metrics['subscribers'] = self.events.metrics()
+        return metrics
+
+    async def _forward_damped_alerts(self):
+        """
+        Process alerts of flapping resources that are due. If storing them
+        fails the detector keeps them for the next check.
+        """
+        due = self._flaps.check()
+        if due:
+            await self._process_window(list(due.values()))
+            self._flaps.forwarded(due)
 
     def _monitor(self):
         """
@@ -640,8 +1573,15 @@ class AlertMonitorService(Service, Observable):
         This method passes consume_alert as a callback function to alert plugin.
         """
         self._thread_running = True
+        try:
+            self._run_coroutine(self.repo.load_open_alerts())
+        except Exception as e:
+            Log.warn(f"Unable to load open alerts, previous alerts will be fetched from DB: {e}")
         self._alert_plugin.init(callback_fn=self._consume, \
-                health_plugin=self._health_plugin)
+                health_plugin=self._health_plugin,
+                window_callback_fn=self._consume_window,
+                window_size=self._window_size,
+                window_latency=self._window_latency)
         self._alert_plugin.process_request(cmd='listen')
 
     def start(self):
@@ -655,12 +1595,17 @@ class AlertMonitorService(Service, Observable):
                                               args=())
                 self._monitor_thread.start()
                 self._thread_started = True
+                self._flap_checker = Periodic(const.ALERT_FLAP_CHECK_INTERVAL,
+                                              self._forward_damped_alerts, self._loop)
+                self._flap_checker.start(now=False)
         except Exception as e:
             Log.warn(f"Error in starting alert monitor thread: {e}")
 
     def stop(self):
         try:
             Log.info("Stopping Alert monitor thread")
+            if self._flap_checker is not None:
+                self._flap_checker.stop()
             self._alert_plugin.stop()
             Log.info("Joining Alert monitor thread")
             self._monitor_thread.join(timeout=2.0)
@@ -704,7 +1649,6 @@ class AlertMonitorService(Service, Observable):
             3. Return a boolean value to signal whether the plugin
                should acknowledge the alert to the RabbitMQ.
         """
-        prev_alert = None
         """
         Before storing the alert let us fisrt try to resolve it.
         We will only resolve the alert if it is a good one.
@@ -726,42 +1670,45 @@ class AlertMonitorService(Service, Observable):
         """ After saving/ updating alert, update the in memory health schema """
         try:
             Log.debug(f"Incoming alert: {message}")
-            for key in [const.ALERT_CREATED_TIME, const.ALERT_UPDATED_TIME]:
-                message[key] = datetime.utcfromtimestamp(message[key])\
-                        .replace(tzinfo=timezone.utc)
+            self._prepare_message(message)
+            # Alerts of flapping resources are held by the flap detector
+            messages = self._flaps.observe(message)
+        except Exception as e:
+            Log.warn(f"Error in consuming alert: {e}")
+            return False
+        for message in messages:
+            if not self._store_alert(message):
+                return False
+        return True
+
+    def _store_alert(self, message):
+        """ Store and publish the alert, see _consume """
+        prev_alert = None
+        try:
             sensor_info = message.get(const.ALERT_SENSOR_INFO, "")
             module_type = message.get(const.ALERT_MODULE_TYPE, "")
-            is_node_alert = self._is_node_alert(message[const.ALERT_MODULE_NAME])
-            is_high_risk_severity = self._is_high_risk_severity(\
-                message[const.ALERT_SEVERITY])
-            """
-            Checking for node hw alert.
-            If the alert is node hw alert and severity is in the category of
-            high risk, then we will prepend the description field with support message.
-            """
-            if is_node_alert and is_high_risk_severity:
-                self._add_support_message(message)
             prev_alert = self._get_previous_alert(sensor_info, module_type)
             alert = AlertModel(message)
             if not prev_alert:
                 self._run_coroutine(self.repo.store(alert))
-                self.add_listener(self._http_notfications.handle_alert)
+                event = NewAlertEvent(alert)
                 Log.debug(f"Alert stored successfully. Alert ID : {alert.alert_uuid}")
                 """
                 Updating health map with alerts
                 """
                 self._health_plugin.update_health_map_with_alert(alert.to_primitive())
+            elif self._resolve_alert(message, prev_alert):
+                alert.alert_uuid = prev_alert.alert_uuid
+                event = UpdatedAlertEvent(alert)
+                Log.debug(f"Alert updated successfully." \
+                        f"Alert ID : {alert.alert_uuid}")
+                """
+                Updating health map with alerts
+                """
+                self._health_plugin.update_health_map_with_alert(alert.to_primitive())
             else:
-                if self._resolve_alert(message, prev_alert):
-                    self.remove_listener(self._http_notfications.handle_alert)
-                    alert.alert_uuid = prev_alert.alert_uuid
-                    Log.debug(f"Alert updated successfully." \
-                            f"Alert ID : {alert.alert_uuid}")
-                    """
-                    Updating health map with alerts
-                    """
-                    self._health_plugin.update_health_map_with_alert(alert.to_primitive())
-            self._notify_listeners(alert, loop=self._loop)
+                event = DuplicateAlertEvent(alert)
+            self.events.publish(event)
             """
             Storing the incoming alert to alert's history collection.
             These alerts will be shown on UI in a seperate alert's history tab.
@@ -774,6 +1721,163 @@ class AlertMonitorService(Service, Observable):
 
         return True
 
+    def _prepare_message(self, message):
+        """ Convert times of a new alert and add the support message """
+        for key in [const.ALERT_CREATED_TIME, const.ALERT_UPDATED_TIME]:
+            message[key] = datetime.utcfromtimestamp(message[key])\
+                    .replace(tzinfo=timezone.utc)
+        is_node_alert = self._is_node_alert(message[const.ALERT_MODULE_NAME])
+        is_high_risk_severity = self._is_high_risk_severity(\
+            message[const.ALERT_SEVERITY])
+        """
+        Checking for node hw alert.
+        If the alert is node hw alert and severity is in the category of
+        high risk, then we will prepend the description field with support message.
+        """
+        if is_node_alert and is_high_risk_severity:
+            self._add_support_message(message)
+
+    def _consume_window(self, messages):
+        """
+        Window counterpart of _consume, receives a list of alerts from the
+        alert plugin. The alerts are applied to the previous ones in memory
+        and written with one bulk request, in one round trip to the event
+        loop. Returns True if the window can be acknowledged.
+        """
+        alerts = []
+        for message in messages:
+            try:
+                Log.debug(f"Incoming alert: {message}")
+                self._prepare_message(message)
+                alerts.extend(self._flaps.observe(message))
+            except Exception as e:
+                Log.warn(f"Error in consuming alert: {e}")
+        if not alerts:
+            # Alerts of flapping resources are held by the flap detector
+            return True
+        for count in range(0, self._es_retry):
+            try:
+                self._run_coroutine(self._process_window(alerts))
+                return True
+            except Exception as ex:
+                Log.warn(f"Unable to store a window of {len(alerts)} alerts. "
+                         f"Retrying : {count+1}.{ex}")
+                time.sleep(2**count)
+        self._stats['failed_windows'] += 1
+        return False
+
+    async def _process_window(self, messages):
+        """
+        Apply the alerts to the stored ones and store them. Windows of the
+        plugin thread and forwarded damped alerts both run on the loop, they
+        are processed one at a time so the changes of one resource are not
+        applied to a stale copy of its alert.
+        """
+        if self._window_lock is None:
+            self._window_lock = asyncio.Lock()
+        async with self._window_lock:
+            await self._store_window(messages)
+
+    async def _store_window(self, messages):
+        started = time.monotonic()
+        # Alerts of one resource are applied in the order they came
+        by_resource = {}
+        for message in messages:
+            key = (message.get(const.ALERT_SENSOR_INFO, ""),
+                   message.get(const.ALERT_MODULE_TYPE, ""))
+            by_resource.setdefault(key, []).append(message)
+        # New alerts are stored as a whole, stored ones by the changed fields
+        created = {}
+        changed = {}
+        published = []
+        for (sensor_info, module_type), resource_messages in by_resource.items():
+            current = await self.repo.retrieve_by_sensor_info(sensor_info, module_type)
+            for message in resource_messages:
+                alert = AlertModel(message)
+                if current is None:
+                    current = alert
+                    created[alert.alert_uuid] = alert
+                    published.append(NewAlertEvent(alert))
+                    continue
+                alert_updated, updated, fields = self._apply_alert(message, current)
+                if updated is not None:
+                    current = updated
+                    if current.alert_uuid in created:
+                        created[current.alert_uuid] = current
+                    else:
+                        _, changed_fields = changed.get(current.alert_uuid, (None, set()))
+                        changed[current.alert_uuid] = (current, changed_fields | fields)
+                if alert_updated:
+                    alert.alert_uuid = current.alert_uuid
+                    published.append(UpdatedAlertEvent(alert))
+                else:
+                    published.append(DuplicateAlertEvent(alert))
+                if current.resolved and current.acknowledged:
+                    # The next alert of the resource starts a new one
+                    current = None
+        history = [AlertsHistoryModel(message) for message in messages]
+        failed = await self.repo.store_many(created.values(), history, changed.values(),
+                                            raise_errors=False)
+        if failed:
+            # Retrying the window would not store them, they are dropped
+            self._stats['failed_documents'] += len(failed)
+            Log.error(f"{len(failed)} documents of a window of {len(messages)} alerts "
+                      f"are not stored: {failed[0][1]}")
+            failed_alerts = {document.alert_uuid for document, _ in failed
+                             if isinstance(document, AlertModel)}
+            published = [event for event in published
+                         if event.alert.alert_uuid not in failed_alerts]
+
+        # Same events as _consume publishes, once the window is stored
+        for event in published:
+            if not isinstance(event, DuplicateAlertEvent):
+                self._health_plugin.update_health_map_with_alert(event.alert.to_primitive())
+            self.events.publish(event)
+        self._update_metrics(len(messages), time.monotonic() - started)
+
+    def _update_metrics(self, alerts, window_time):
+        now = time.monotonic()
+        self._rate_samples.append((now, alerts))
+        while self._rate_samples[0][0] < now - const.ALERT_RATE_INTERVAL:
+            self._rate_samples.popleft()
+        self._stats['alerts'] += alerts
+        self._stats['windows'] += 1
+        self._stats['window_time_max'] = max(self._stats['window_time_max'], window_time)
+        Log.debug(f"Window of {alerts} alerts is stored in {window_time:.3f}s")
+        if now - self._metrics_logged >= const.ALERT_RATE_INTERVAL:
+            self._metrics_logged = now
+            Log.info(f"Alert ingestion metrics: {self.metrics()}")
+
+    def _apply_alert(self, new_alert, prev_alert):
+        """
+        In-memory counterpart of _resolve_alert, changes the previous alert
+        the way _resolve_alert changes it in the DB.
+        :return: (alert_updated, new state of the previous alert or None
+                 if it does not change, set of the changed fields)
+        """
+        if self._is_duplicate_alert(new_alert, prev_alert):
+            alert = self._duplicate_alert(new_alert, prev_alert)
+            fields = set(alert.to_primitive()) - {const.ALERT_UUID, const.ALERT_RESOLVED,
+                                                  const.ALERT_ACKNOWLEDGED, const.ALERT_COMMENTS}
+            return False, alert, fields
+        alert_updated = False
+        update_params = None
+        if self._is_good_alert(new_alert):
+            if self._is_good_alert(prev_alert):
+                update_params = self._update_params(new_alert, prev_alert)
+            elif not prev_alert.resolved:
+                prev_alert.resolved = True
+                update_params = self._update_params(new_alert, prev_alert)
+            alert_updated = True
+        if self._is_bad_alert(new_alert):
+            update_params = self._update_params(new_alert, prev_alert,
+                                                not self._is_bad_alert(prev_alert))
+            alert_updated = True
+        if update_params is None:
+            return alert_updated, None, set()
+        prev_alert.import_data(update_params)
+        return alert_updated, prev_alert, set(update_params)
+
     def _resolve_alert(self, new_alert, prev_alert):
         alert_updated = False
         if not self._is_duplicate_alert(new_alert, prev_alert):
@@ -827,6 +1931,15 @@ class AlertMonitorService(Service, Observable):
         False
         :return: None
         """
+        update_params = self._update_params(alert, prev_alert, update_resolve)
+        self._run_coroutine(self.repo.update_by_sensor_info\
+                (prev_alert.sensor_info, prev_alert.module_type, update_params))
+
+    def _update_params(self, alert, prev_alert, update_resolve=False):
+        """
+        Fields of the previous alert changed by the alert.
+        :return: dict of the fields
+        """
         update_params = {}
         is_node_alert = self._is_node_alert(alert.get(const.ALERT_MODULE_NAME))
         is_high_risk_severity = self._is_high_risk_severity(\
@@ -847,13 +1960,13 @@ class AlertMonitorService(Service, Observable):
         update_params[const.ALERT_SEVERITY] = alert.get(const.ALERT_SEVERITY, "")
         update_params[const.ALERT_UPDATED_TIME] = int(time.time())
         update_params[const.ALERT_HEALTH] = alert.get(const.ALERT_HEALTH, "")
+        update_params[const.ALERT_FLAPPING] = bool(alert.get(const.ALERT_FLAPPING))
         if alert.get(const.ALERT_MODULE_TYPE, "") == const.IEM:
             update_params[const.ALERT_CREATED_TIME] = \
                 alert.get(const.ALERT_CREATED_TIME, "")
             update_params[const.DESCRIPTION] = alert.get(const.DESCRIPTION, "")
         self._update_params_cleanup(update_params)
-        self._run_coroutine(self.repo.update_by_sensor_info\
-                (prev_alert.sensor_info, prev_alert.module_type, update_params))
+        return update_params
 
     def _update_params_cleanup(self, update_params):
         for key, value in update_params.items():
@@ -905,16 +2018,20 @@ class AlertMonitorService(Service, Observable):
         some modified values which will be overwritten by the new one.
         """
         try:
-            alert = AlertModel(new_alert)
-            alert.alert_uuid = prev_alert.alert_uuid
-            alert.resolved = prev_alert.resolved
-            alert.acknowledged = prev_alert.acknowledged
-            alert.comments = prev_alert.comments
-            alert.updated_time = int(time.time())
-            self._run_coroutine(self.repo.update(alert))
+            self._run_coroutine(self.repo.update(self._duplicate_alert(new_alert, prev_alert)))
         except Exception as ex:
             Log.error(f"Updation of duplicate alert failed. Alert: {new_alert}")
 
+    def _duplicate_alert(self, new_alert, prev_alert):
+        """ The new alert with the CSM specific fields of the previous one """
+        alert = AlertModel(new_alert)
+        alert.alert_uuid = prev_alert.alert_uuid
+        alert.resolved = prev_alert.resolved
+        alert.acknowledged = prev_alert.acknowledged
+        alert.comments = prev_alert.comments
+        alert.updated_time = AlertModel.updated_time.to_native(int(time.time()))
+        return alert
+
     def _is_node_alert(self, resource_type):
         """
         This function checks whether the incoming alert is for node hw or not.
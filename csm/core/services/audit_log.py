@@ -33,6 +33,7 @@ from csm.common.errors import CsmNotFoundError
 from typing import Optional, Iterable
 from cortx.utils.conf_store.conf_store import Conf
 from csm.common.process import SimpleProcess
+from csm.common.payload import JsonStream
 
 # mapping of component with model, field for
 # range queires and log format
@@ -84,6 +85,41 @@ class AuditLogManager():
         query = query.order_by(COMPONENT_MODEL_MAPPING[component]["field"], "desc")
         return await self.db(COMPONENT_MODEL_MAPPING[component]["model"]).get(query)
 
+    async def iterate_by_range(self, component, time_range: DateTimeRange,
+                               page_size: int = const.ES_RECORD_LIMIT):
+        """
+        Iterate over all records of the range, newest first, page by page.
+        Pages are selected by the timestamp of the last returned record
+        rather than by offset, so there is no result window limit.
+        """
+        field = COMPONENT_MODEL_MAPPING[component]["field"]
+        model = COMPONENT_MODEL_MAPPING[component]["model"]
+        conditions = self._prepare_time_range(field, time_range)
+        # Records have no ID to tell apart the ones with the same timestamp,
+        # so all the records with the last timestamp of a page are read at
+        # once and the next page starts before that timestamp
+        bound = None
+        while True:
+            page_conditions = list(conditions)
+            if bound is not None:
+                page_conditions.append(Compare(field, '<', bound))
+            query = Query().filter_by(And(*page_conditions)).limit(page_size)
+            query = query.order_by(field, "desc")
+            logs = await self.db(model).get(query)
+            if len(logs) < page_size:
+                for log in logs:
+                    yield log
+                return
+            bound = logs[-1].timestamp
+            for log in logs:
+                if log.timestamp != bound:
+                    yield log
+            tie_filter = And(*conditions, Compare(field, '=', bound))
+            ties = await self.db(model).count(tie_filter)
+            query = Query().filter_by(tie_filter).limit(ties)
+            for log in await self.db(model).get(query):
+                yield log
+
     async def count_by_range(self, component,
                        time_range: DateTimeRange) -> int:
         query_filter = self._prepare_filters(component, time_range)
@@ -117,12 +153,9 @@ class AuditService(ApplicationService):
             if not os.path.exists(const.AUDIT_LOG): os.makedirs(const.AUDIT_LOG)
             txt_file_name = f'{os.path.join(const.AUDIT_LOG, file_name)}.txt'
             tar_file_name = f'{os.path.join(const.AUDIT_LOG, file_name)}.tar.gz'
-            count = await self.audit_mngr.count_by_range(component, time_range)
             file = open(txt_file_name, "w")
-            query_limit = QueryLimits(const.MAX_RESULT_WINDOW, 0)
-            audit_logs = await self.audit_mngr.retrieve_by_range(component,
-                                                 query_limit, time_range)
-            for log in audit_logs:
+            audit_logs = self.audit_mngr.iterate_by_range(component, time_range)
+            async for log in audit_logs:
                 file.write(COMPONENT_MODEL_MAPPING[component]["format"].
                                            format(**(log.to_primitive()))+"\n")
             file.close()
@@ -131,20 +164,44 @@ class AuditService(ApplicationService):
         except OSError as err:
             if err.errno != errno.EEXIST: raise
 
-    async def get_by_range(self, component: str, start_time: str, end_time: str):
-        """ fetch all records for given range from audit log """
+    def _retrieve_by_range(self, component: str, start_time: str, end_time: str):
+        """ iterate over raw audit log records for given range """
         Log.logger.info(f"auditlogs for {component} from {start_time} to {end_time}")
         if not COMPONENT_MODEL_MAPPING.get(component, None):
             raise CsmNotFoundError("No audit logs for %s" % component,
                                                    COMPONENT_NOT_FOUND)
 
         time_range = self.get_date_range_from_duration(int(start_time), int(end_time))
-        query_limit = QueryLimits(Conf.get(const.CSM_GLOBAL_INDEX,
-                                                   "Log>max_result_window"), 0)
-        audit_logs = await self.audit_mngr.retrieve_by_range(component,
-                                                   query_limit, time_range)
-        return [COMPONENT_MODEL_MAPPING[component]["format"].
-                               format(**(log.to_primitive())) for log in audit_logs ]
+        return self.audit_mngr.iterate_by_range(component, time_range)
+
+    @staticmethod
+    def _format_log(component: str, log) -> str:
+        return COMPONENT_MODEL_MAPPING[component]["format"].format(**(log.to_primitive()))
+
+    async def get_by_range(self, component: str, start_time: str, end_time: str):
+        """ fetch all records for given range from audit log """
+        audit_logs = self._retrieve_by_range(component, start_time, end_time)
+        return [self._format_log(component, log) async for log in audit_logs]
+
+    async def stream_by_range(self, component: str, start_time: str, end_time: str) -> JsonStream:
+        """
+        fetch all records for given range, formatting them lazily while sending.
+        The first page is read here, before the response is started, so that
+        DB errors get an error response rather than a truncated body.
+        """
+        audit_logs = self._retrieve_by_range(component, start_time, end_time)
+        try:
+            first = await audit_logs.__anext__()
+        except StopAsyncIteration:
+            return JsonStream([])
+        return JsonStream(self._prepend(first, audit_logs),
+                          transform=lambda log: self._format_log(component, log))
+
+    @staticmethod
+    async def _prepend(first, rest):
+        yield first
+        async for item in rest:
+            yield item
 
     async def get_audit_log_zip(self, component: str, start_time: str, end_time: str):
         """ get zip file for all records from given range """
@@ -0,0 +1,112 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import os
+import re
+import time
+from typing import Optional
+from cortx.utils.log import Log
+from cortx.utils.product_features import unsupported_features
+from csm.common.payload import Json
+
+
+class FeatureEndpointMap:
+    """
+    Feature endpoint mapping compiled into a single regular expression.
+    The mapping file is re-read only when its modification time changes,
+    and the modification time itself is checked at most once per
+    check_interval seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5):
+        self._path = path
+        self._check_interval = check_interval
+        self._next_check = 0
+        self._mtime = -1
+        self._endpoints = []
+        self._matcher = None
+
+    @staticmethod
+    def _compile(endpoint_map: dict):
+        """
+        Build one alternation regex out of all mapping keys.
+        Alternatives are tried in the order of the mapping file, so the
+        first matching key wins like it was with per-key matching.
+        """
+        endpoints = []
+        patterns = []
+        for index, (key, value) in enumerate(endpoint_map.items()):
+            pattern = key.replace("*", r"[\w\d]*")
+            patterns.append(f'(?P<e{index}>{pattern})')
+            endpoints.append(value)
+        matcher = re.compile('|'.join(patterns)) if patterns else None
+        return endpoints, matcher
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self._check_interval
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        Log.debug(f"Loading feature endpoint map {self._path}")
+        self._endpoints, self._matcher = self._compile(Json(self._path).load())
+        self._mtime = mtime
+
+    def match(self, path: str) -> Optional[dict]:
+        """
+        Find the feature description for the request path
+        :param path: request path
+        :return: mapping file entry or None if the path is not mapped
+        """
+        self._reload_if_changed()
+        if self._matcher is None:
+            return None
+        match = self._matcher.fullmatch(path)
+        if match is None:
+            return None
+        return self._endpoints[int(match.lastgroup[1:])]
+
+
+class FeatureSupportCache:
+    """
+    Caches feature support verdicts obtained from UnsupportedFeaturesDB
+    for ttl seconds
+    """
+
+    def __init__(self, ttl: float = 60):
+        self._ttl = ttl
+        self._verdicts = {}
+        self._db = None
+
+    async def is_feature_supported(self, component: str, feature: str) -> bool:
+        key = (component, feature)
+        verdict = self._verdicts.get(key)
+        now = time.monotonic()
+        if verdict is not None and verdict[1] > now:
+            return verdict[0]
+        if self._db is None:
+            self._db = unsupported_features.UnsupportedFeaturesDB()
+        supported = await self._db.is_feature_supported(component, feature)
+        self._verdicts[key] = (supported, now + self._ttl)
+        return supported
+
+    def invalidate(self):
+        """ Drop all cached verdicts """
+        self._verdicts.clear()
@@ -14,13 +14,13 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
 from csm.core.blogic import const
-from typing import Optional, Iterable, Dict
+from typing import Optional, Iterable
 from csm.common.services import Service, ApplicationService
-from csm.common.payload import Payload, Json
+from csm.common.payload import Payload, Json, Dict
 from csm.core.blogic.models.alerts import AlertModel
 from cortx.utils.conf_store.conf_store import Conf
 from cortx.utils.log import Log
-from csm.common.observer import Observable
+from csm.common.event_bus import EventBus
 from threading import Event, Thread
 from csm.core.services.alerts import AlertRepository
 import asyncio
@@ -53,8 +53,10 @@ class HealthAppService(ApplicationService):
         Provides operations on in memory health schema
     """
 
-    def __init__(self, repo: HealthRepository, alerts_repo, plugin):
+    def __init__(self, repo: HealthRepository, alerts_repo, plugin,
+                 persist_schema: bool = True):
         self._health_plugin = plugin
+        self._persist_schema = persist_schema
         self.repo = repo
         self.alerts_repo = alerts_repo
         self._is_map_updated_with_db = False
@@ -117,11 +119,28 @@ class HealthAppService(ApplicationService):
         try:
             self._health_schema = Payload(Json(health_schema_path))
             self.repo.health_schema = self._health_schema
-            self.repo.health_schema.dump()
+            if self._persist_schema:
+                self.repo.health_schema.dump()
             self.set_default_values(self.repo.health_schema.data())
         except Exception as ex:
             Log.error(f"Error occured in reading health schema. Path: {health_schema_path}, {ex}")
 
+    def get_health_snapshot(self) -> dict:
+        """
+        Returns the in-memory health map to be shared with other agent processes
+        """
+        return self.repo.health_schema.data()
+
+    def set_health_snapshot(self, health_map: dict):
+        """
+        Replaces the in-memory health map with the one received from the
+        agent process that consumes health updates
+        :param health_map: health map
+        :returns: None
+        """
+        self._health_schema = Payload(Dict(health_map))
+        self.repo.health_schema = self._health_schema
+
     async def fetch_health_view(self, **kwargs):
         """
         Fetches health details like health summary and alerts for the provides
@@ -609,6 +628,26 @@ class HealthAppService(ApplicationService):
             return_value = False
         return return_value
 
+    def get_health_delta(self, msg_body) -> dict:
+        """
+        Returns the part of a health update message that changed the health map,
+        it is pushed to websocket clients subscribed to health updates.
+        :param msg_body: health update message
+        :return: health update event
+        """
+        return {
+            const.RESOURCE_KEY: msg_body.get(const.RESOURCE_KEY, ""),
+            const.ALERT_NODE_ID: self.get_minion_id(msg_body.get(const.ALERT_NODE_ID, "")),
+            const.ALERT_SEVERITY: msg_body.get(const.ALERT_SEVERITY, "NA"),
+            const.ALERT_UUID: msg_body.get(const.ALERT_UUID, "NA"),
+            const.HEALTH_ALERT_TYPE: msg_body.get(const.HEALTH_ALERT_TYPE, "NA"),
+            const.RESOURCE_LIST: [{
+                const.KEY: items.get(const.KEY, ""),
+                const.ALERT_HEALTH: items.get(const.ALERT_HEALTH, "NA"),
+                const.ALERT_DURABLE_ID: items.get(const.ALERT_DURABLE_ID, "NA"),
+            } for items in msg_body.get(const.RESOURCE_LIST, [])],
+        }
+
     async def update_health_schema_with_db(self):
         """
         Updates the in memory health schema after CSM init.
@@ -634,14 +673,23 @@ class HealthAppService(ApplicationService):
             except Exception as e:
                 Log.warn(f"Error in update_health_schema_with db: {e}")
 
-class HealthMonitorService(Service, Observable):
+class HealthEvent:
+    """ Change of the health map """
+
+    def __init__(self, delta):
+        self.delta = delta
+
+
+class HealthMonitorService(Service):
     """
     Health Monitor works with AmqpComm to monitor and send actuatore requests. 
+    Health map changes are published as HealthEvent on the event bus.
     """
 
-    def __init__(self, plugin, health_service: HealthAppService):
+    def __init__(self, plugin, health_service: HealthAppService, events: EventBus = None):
         """
         Initializes the Health Plugin
+        :param events: bus the health events are published on
         """
         self._health_plugin = plugin
         self._monitor_thread = None
@@ -649,6 +697,7 @@ class HealthMonitorService(Service, Observable):
         self._thread_running = False
         self._health_service = health_service
         super().__init__()
+        self.events = events or EventBus(self._loop)
 
     @property
     def health_plugin(self):
@@ -696,7 +745,8 @@ class HealthMonitorService(Service, Observable):
         This is a callback function which will receive
         a message from the health plugin as a dictionary.
         """
-        self._health_service.update_health_map(message)
+        if self._health_service.update_health_map(message):
+            self.events.publish(HealthEvent(self._health_service.get_health_delta(message)))
         return True
 
     def _update_map_with_db(self):
@@ -0,0 +1,107 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from cortx.utils.log import Log
+from csm.common.errors import CsmServiceNotAvailable, CSM_PROVIDER_NOT_AVAILABLE
+from csm.core.blogic import const
+from csm.core.data.models.users import Passwd
+
+
+class PasswordVerifier:
+    """
+    Verifies password hashes in a dedicated thread pool, so a slow hash
+    does not block the event loop.
+    At most `concurrency` verifications run at once. Up to `queue_size`
+    more wait for a free slot for at most `queue_timeout` seconds. Anything
+    beyond that is rejected with CsmServiceNotAvailable (HTTP 503).
+    """
+
+    def __init__(self, concurrency: int = const.PASSWD_VERIFY_CONCURRENCY,
+                 queue_size: int = const.PASSWD_VERIFY_QUEUE_SIZE,
+                 queue_timeout: float = const.PASSWD_VERIFY_QUEUE_TIMEOUT):
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        self._queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=concurrency,
+                                            thread_name_prefix='passwd_verify')
+        # Created on first use to bind to the running loop
+        self._slots = None
+        self._queue_depth = 0
+        self._stats = {
+            'verified': 0,
+            'rejected': 0,
+            'timed_out': 0,
+            'max_queue_depth': 0,
+            'verify_time_total': 0.0,
+            'verify_time_max': 0.0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def metrics(self) -> dict:
+        """ Verification latency and admission queue statistics """
+        metrics = dict(self._stats)
+        metrics['queue_depth'] = self._queue_depth
+        verified = metrics['verified']
+        metrics['verify_time_avg'] = metrics['verify_time_total'] / verified if verified else 0.0
+        metrics['wait_time_avg'] = metrics['wait_time_total'] / verified if verified else 0.0
+        return metrics
+
+    def _reject(self, counter: str, reason: str):
+        self._stats[counter] += 1
+        Log.warn(f'Password verification rejected: {reason}. Metrics: {self.metrics()}')
+        raise CsmServiceNotAvailable(CSM_PROVIDER_NOT_AVAILABLE,
+                                     'Too many login requests, please retry later')
+
+    async def _acquire(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._concurrency)
+        if not self._slots.locked():
+            # A free slot is taken without waiting
+            await self._slots.acquire()
+            return
+        if self._queue_depth >= self._queue_size:
+            self._reject('rejected', 'admission queue is full')
+        self._queue_depth += 1
+        self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue_depth)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject('timed_out', f'no free slot in {self._queue_timeout} seconds')
+        finally:
+            self._queue_depth -= 1
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        started = time.monotonic()
+        await self._acquire()
+        admitted = time.monotonic()
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, Passwd.verify, password, hashed)
+        finally:
+            self._slots.release()
+            finished = time.monotonic()
+            wait_time, verify_time = admitted - started, finished - admitted
+            stats = self._stats
+            stats['verified'] += 1
+            stats['verify_time_total'] += verify_time
+            stats['verify_time_max'] = max(stats['verify_time_max'], verify_time)
+            stats['wait_time_total'] += wait_time
+            stats['wait_time_max'] = max(stats['wait_time_max'], wait_time)
+            Log.debug(f'Password verified in {verify_time:.3f}s after waiting '
+                      f'{wait_time:.3f}s, queue depth {self._queue_depth}')
@@ -14,73 +14,97 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
 class PermissionSet:
-    ''' Permission Set stored in a compact way as a dictionary '''
+    '''
+    Permission Set stored in a compact way as a bit mask.
+    Every (resource, action) pair gets its own bit in a global index the
+    first time it is seen, so set operations are integer operations.
+    '''
+
+    # Global (resource, action) -> bit number index shared by all sets
+    _bit_index = {}
+    _bit_pairs = []
 
     def __init__(self, items: dict = {}):
-        self._items = {
-            resource: set(actions)
-                for resource, actions in items.items()
-                    if len(actions) > 0
-        }
+        self._mask = self._encode(items)
+
+    @classmethod
+    def _bit(cls, resource: str, action: str) -> int:
+        key = (resource, action)
+        bit = cls._bit_index.get(key)
+        if bit is None:
+            bit = len(cls._bit_pairs)
+            cls._bit_index[key] = bit
+            cls._bit_pairs.append(key)
+        return bit
+
+    @classmethod
+    def _encode(cls, items: dict) -> int:
+        mask = 0
+        for resource, actions in items.items():
+            for action in actions:
+                mask |= 1 << cls._bit(resource, action)
+        return mask
+
+    @classmethod
+    def _from_mask(cls, mask: int) -> 'PermissionSet':
+        result = cls.__new__(cls)
+        result._mask = mask
+        return result
+
+    @classmethod
+    def intern(cls, items: dict) -> None:
+        ''' Reserve bits for the resource/action pairs, e.g. from roles.json '''
+
+        cls._encode(items)
+
+    def to_dict(self) -> dict:
+        ''' Permissions as a dictionary of resource -> set of actions '''
+
+        items = {}
+        mask = self._mask
+        while mask:
+            lowest = mask & -mask
+            resource, action = self._bit_pairs[lowest.bit_length() - 1]
+            items.setdefault(resource, set()).add(action)
+            mask ^= lowest
+        return items
+
+    def copy(self) -> 'PermissionSet':
+        return self._from_mask(self._mask)
+
+    def issuperset(self, other: 'PermissionSet') -> bool:
+        ''' Check if all permissions of the other set are present in this one '''
+
+        return (self._mask & other._mask) == other._mask
 
     def __str__(self) -> str:
         ''' String Representation Operator '''
 
-        return f'{self.__class__.__name__}{self._items.__str__()}'
+        return f'{self.__class__.__name__}{self.to_dict().__str__()}'
 
     def __eq__(self, other: 'PermissionSet') -> bool:
         ''' Equality Operator '''
 
-        return self._items == other._items
+        return self._mask == other._mask
 
     def __or__(self, other: 'PermissionSet') -> 'PermissionSet':
         ''' Union Operator '''
 
-        result = PermissionSet()
-        resources = set(self._items.keys()) | set(other._items.keys())
-        for resource in resources:
-            lhs_actions = self._items.get(resource, set())
-            rhs_actions = other._items.get(resource, set())
-            actions = lhs_actions | rhs_actions
-            if len(actions) > 0:
-                result._items[resource] = actions
-        return result
+        return self._from_mask(self._mask | other._mask)
 
     def __and__(self, other: 'PermissionSet') -> 'PermissionSet':
         ''' Intersection Operator '''
 
-        result = PermissionSet()
-        resources = set(self._items.keys()) & set(other._items.keys())
-        for resource in resources:
-            lhs_actions = self._items.get(resource, set())
-            rhs_actions = other._items.get(resource, set())
-            actions = lhs_actions & rhs_actions
-            if len(actions) > 0:
-                result._items[resource] = actions
-        return result
+        return self._from_mask(self._mask & other._mask)
 
     def __ior__(self, other: 'PermissionSet') -> 'PermissionSet':
         ''' In-place Union Operator '''
 
-        for resource in other._items.keys():
-            lhs_actions = self._items.get(resource, set())
-            rhs_actions = other._items.get(resource, set())
-            actions = lhs_actions | rhs_actions
-            if len(actions) > 0:
-                self._items[resource] = actions
-            else:
-                self._items.pop(resource, None)
+        self._mask |= other._mask
         return self
 
     def __iand__(self, other: 'PermissionSet') -> 'PermissionSet':
         ''' In-place Intersection Operator '''
 
-        for resource in self._items.keys():
-            lhs_actions = self._items.get(resource, set())
-            rhs_actions = other._items.get(resource, set())
-            actions = lhs_actions & rhs_actions
-            if len(actions) > 0:
-                self._items[resource] = actions
-            else:
-                self._items.pop(resource, None)
+        self._mask &= other._mask
         return self
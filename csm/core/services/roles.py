@@ -87,23 +87,32 @@ class RoleManager:
         Log.info(f'Initializing role manager with predefined roles')
         self._validate_roles(predefined_roles)
 
+        # Intern all known resource/action pairs at startup
+        for value in predefined_roles.values():
+            PermissionSet.intern(value['permissions'])
         self._roles = {
             name: Role(name, PermissionSet(value['permissions']))
                 for name, value in predefined_roles.items()
         }
+        # Effective permissions memoized per combination of role names
+        self._effective_permissions = {}
 
     async def calc_effective_permissions(self, *role_names):
         """
         Calculate effective set of permissions from a given set of user roles.
         """
 
-        permissions = PermissionSet()
-        for role_name in role_names:
-            role = self._roles.get(role_name, self.NO_ROLE)
-            if role.name is None:
-                Log.warn(f"Invalid role name '{role_name}'")
-            permissions |= role.permissions
-        return permissions
+        permissions = self._effective_permissions.get(role_names)
+        if permissions is None:
+            permissions = PermissionSet()
+            for role_name in role_names:
+                role = self._roles.get(role_name, self.NO_ROLE)
+                if role.name is None:
+                    Log.warn(f"Invalid role name '{role_name}'")
+                permissions |= role.permissions
+            self._effective_permissions[role_names] = permissions
+        # The caller owns the returned set and may modify it
+        return permissions.copy()
 
     async def add_role(self, name, permissions):
         """
@@ -115,6 +124,7 @@ class RoleManager:
             Log.error(f'Role "{name}" is already present')
             return False
         self._roles[name] = Role(name, PermissionSet(permissions))
+        self._effective_permissions.clear()
         Log.info(f'New role "{name}" has been successfully added')
         return True
 
@@ -125,6 +135,7 @@ class RoleManager:
 
         self._validate_name(name)
         if self._roles.pop(name, None) is not None:
+            self._effective_permissions.clear()
             Log.info(f'Existing role "{name}" has been successfully deleted')
         else:
             Log.warn(f'Role "{name}" does not exist')
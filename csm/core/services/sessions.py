@@ -13,22 +13,33 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
+import asyncio
+import heapq
+import time
 import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from enum import Enum
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from cortx.utils.log import Log
 from cortx.utils.conf_store.conf_store import Conf
+from cortx.utils.data.access import Query
+from cortx.utils.data.access.filters import Compare
+from cortx.utils.data.db.db_provider import DataBaseProvider
+from cortx.utils.security.cipher import Cipher
 from csm.core.blogic import const
 from csm.plugins.cortx.s3 import S3Plugin
 from csm.core.data.models.s3 import S3ConnectionConfig, IamError
+from csm.core.data.models.session import SessionModel
 # TODO: from csm.common.passwd import Passwd
 from csm.core.data.models.users import UserType, User, Passwd
 from csm.core.services.users import UserManager
 from csm.core.services.roles import RoleManager
 from csm.core.services.permissions import PermissionSet
+from csm.core.services.password_verifier import PasswordVerifier
 from csm.common.errors import CsmError, CSM_ERR_INVALID_VALUE
+from csm.common.periodic import Periodic
 
 
 class SessionCredentials:
@@ -117,12 +128,277 @@ class Session:
         return self._permissions
 
 
-class SessionManager:
-    """ Session management class """
+class SessionStore(ABC):
+    """ Base abstract class for session storage backends """
+
+    @abstractmethod
+    async def store(self, session: Session) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, session_id: Session.Id) -> Optional[Session]:
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: Session.Id) -> None:
+        ...
+
+    @abstractmethod
+    async def get_all(self) -> list:
+        ...
+
+    async def get_by_user(self, user_id: str) -> list:
+        """ Sessions of the user, the user ID is case insensitive """
+        user_id = user_id.lower()
+        return [session for session in await self.get_all()
+                if session.credentials.user_id.lower() == user_id]
+
+    async def delete_expired(self, now: datetime) -> int:
+        """ Remove sessions expired by the given time, returns the number removed """
+        expired = [session.session_id for session in await self.get_all()
+                   if session.expiry_time <= now]
+        for session_id in expired:
+            await self.delete(session_id)
+        return len(expired)
+
+    async def touch(self, session: Session) -> None:
+        """
+        Persist the refreshed expiry time of the session.
+        Backends are allowed to defer the write.
+        """
+        await self.store(session)
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Session storage local to the agent process.
+    Sessions are indexed by the user ID and by the expiry time. The expiry
+    heap holds one entry per stored session: a session refreshed after its
+    entry was pushed is pushed again with the new time when the old entry
+    comes out, so refreshes cost nothing.
+    """
 
     def __init__(self):
         self._stg = {}
+        self._by_user = {}
+        self._expiry_heap = []
+
+    def _remove(self, session_id: Session.Id) -> None:
+        session = self._stg.pop(session_id, None)
+        if session is None:
+            return
+        user_key = session.credentials.user_id.lower()
+        user_sessions = self._by_user.get(user_key)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._by_user[user_key]
+
+    async def store(self, session: Session) -> None:
+        if session.session_id not in self._stg:
+            heapq.heappush(self._expiry_heap, (session.expiry_time, session.session_id))
+            user_key = session.credentials.user_id.lower()
+            self._by_user.setdefault(user_key, set()).add(session.session_id)
+        self._stg[session.session_id] = session
+
+    async def get(self, session_id: Session.Id) -> Optional[Session]:
+        return self._stg.get(session_id, None)
+
+    async def delete(self, session_id: Session.Id) -> None:
+        self._remove(session_id)
+
+    async def get_all(self) -> list:
+        return list(self._stg.values())
+
+    async def get_by_user(self, user_id: str) -> list:
+        return [self._stg[session_id]
+                for session_id in self._by_user.get(user_id.lower(), ())]
+
+    async def delete_expired(self, now: datetime) -> int:
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, session_id = heapq.heappop(heap)
+            session = self._stg.get(session_id)
+            if session is None:
+                # Deleted before it expired
+                continue
+            if session.expiry_time > now:
+                heapq.heappush(heap, (session.expiry_time, session_id))
+                continue
+            self._remove(session_id)
+            removed += 1
+        return removed
+
+    async def touch(self, session: Session) -> None:
+        # The stored object is the one that has been refreshed
+        pass
+
+
+class ConsulSessionStore(SessionStore):
+    """
+    Session storage shared by all agent processes.
+    Sessions are kept in Consul and cached in a local LRU. A cached session
+    is trusted for cache_ttl seconds, so a logout done by another process
+    is seen here within that time. Expiry time refreshes are collected and
+    written back in one batch every flush_interval seconds.
+    """
+
+    _CREDENTIALS_TYPES = {
+        'local': LocalCredentials,
+        'ldap': LdapCredentials,
+        's3': S3Credentials,
+    }
+
+    def __init__(self, storage: DataBaseProvider, cipher_key: bytes,
+                 cache_size: int = const.SESSION_CACHE_SIZE,
+                 cache_ttl: float = const.SESSION_CACHE_TTL,
+                 flush_interval: float = const.SESSION_FLUSH_INTERVAL):
+        self._storage = storage
+        self._cipher_key = cipher_key
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._flush_interval = flush_interval
+        self._pending = {}
+        self._flush_task = None
+
+    def _encrypt(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return Cipher.encrypt(self._cipher_key, value.encode('utf-8')).decode('utf-8')
+
+    def _decrypt(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return Cipher.decrypt(self._cipher_key, value.encode('utf-8')).decode('utf-8')
+
+    def _to_model(self, session: Session) -> SessionModel:
+        credentials = session.credentials
+        model = SessionModel()
+        model.session_id = session.session_id
+        model.credentials_type = next(name for name, cls in self._CREDENTIALS_TYPES.items()
+                                      if type(credentials) is cls)
+        model.user_id = credentials.user_id
+        model.user_key = credentials.user_id.lower()
+        if isinstance(credentials, S3Credentials):
+            model.access_key = credentials.access_key
+            model.secret_key = self._encrypt(credentials.secret_key)
+            model.session_token = self._encrypt(credentials.session_token)
+        model.permissions = {resource: list(actions)
+                             for resource, actions in session.permissions.to_dict().items()}
+        model.expiry_time = session.expiry_time
+        return model
+
+    def _from_model(self, model: SessionModel) -> Session:
+        if model.credentials_type == 's3':
+            credentials = S3Credentials(model.user_id, model.access_key,
+                                        self._decrypt(model.secret_key),
+                                        self._decrypt(model.session_token))
+        else:
+            credentials = self._CREDENTIALS_TYPES[model.credentials_type](model.user_id)
+        return Session(model.session_id, model.expiry_time, credentials,
+                       PermissionSet(model.permissions or {}))
+
+    def _cache_put(self, session: Session) -> None:
+        self._cache[session.session_id] = (session, time.monotonic() + self._cache_ttl)
+        self._cache.move_to_end(session.session_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def store(self, session: Session) -> None:
+        self._pending.pop(session.session_id, None)
+        await self._storage(SessionModel).store(self._to_model(session))
+        self._cache_put(session)
+
+    async def get(self, session_id: Session.Id) -> Optional[Session]:
+        entry = self._cache.get(session_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._cache.move_to_end(session_id)
+            return entry[0]
+
+        query = Query().filter_by(Compare(SessionModel.session_id, '=', session_id))
+        model = next(iter(await self._storage(SessionModel).get(query)), None)
+        if model is None:
+            self._cache.pop(session_id, None)
+            self._pending.pop(session_id, None)
+            return None
+        session = self._from_model(model)
+        # Keep the refresh that is not written back yet
+        pending = self._pending.get(session_id)
+        if pending is not None:
+            session.expiry_time = max(session.expiry_time, pending.expiry_time)
+            self._pending[session_id] = session
+        self._cache_put(session)
+        return session
+
+    async def delete(self, session_id: Session.Id) -> None:
+        self._cache.pop(session_id, None)
+        self._pending.pop(session_id, None)
+        await self._storage(SessionModel).delete(
+            Compare(SessionModel.session_id, '=', session_id))
+
+    async def get_all(self) -> list:
+        models = await self._storage(SessionModel).get(Query())
+        return [self._from_model(model) for model in models]
+
+    async def get_by_user(self, user_id: str) -> list:
+        query = Query().filter_by(Compare(SessionModel.user_key, '=', user_id.lower()))
+        models = await self._storage(SessionModel).get(query)
+        return [self._from_model(model) for model in models]
+
+    async def delete_expired(self, now: datetime) -> int:
+        for session_id, (session, _) in list(self._cache.items()):
+            if session.expiry_time <= now:
+                del self._cache[session_id]
+        # Sessions still in use here must not be dropped before the refresh is written
+        await self.flush()
+        return await self._storage(SessionModel).delete(
+            Compare(SessionModel.expiry_time, '<=', now))
+
+    async def touch(self, session: Session) -> None:
+        self._pending[session.session_id] = session
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+        finally:
+            self._flush_task = None
+
+    async def flush(self) -> None:
+        """
+        Write back all pending expiry time refreshes. Only the expiry time
+        of stored sessions is updated, so a session deleted by another
+        process in the meantime is not brought back.
+        """
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        sessions = list(pending.values())
+        results = await asyncio.gather(
+            *(self._storage(SessionModel).update(
+                Compare(SessionModel.session_id, '=', session.session_id),
+                {'expiry_time': session.expiry_time})
+              for session in sessions),
+            return_exceptions=True)
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                Log.error(f'Failed to refresh session {session.session_id}: {result}')
+                self._pending.setdefault(session.session_id, session)
+
+
+class SessionManager:
+    """ Session management class """
+
+    def __init__(self, store: Optional[SessionStore] = None,
+                 sweep_interval: float = const.SESSION_SWEEP_INTERVAL):
+        self._store = store if store is not None else InMemorySessionStore()
         self._expiry_interval = timedelta(minutes=60)  # TODO: Load from config
+        self._sweep_interval = sweep_interval
+        self._sweeper = None
 
     @property
     def expiry_interval(self):
@@ -140,20 +416,41 @@ class SessionManager:
         session_id = self._generate_sid()
         expiry_time = self.calc_expiry_time()
         session = Session(session_id, expiry_time, credentials, permissions)
-        self._stg[session_id] = session
+        await self._store.store(session)
+        self._start_sweeper()
         return session
 
+    def _start_sweeper(self) -> None:
+        # Started on the first login, when the event loop is surely running
+        if self._sweeper is None:
+            self._sweeper = Periodic(self._sweep_interval, self.delete_expired,
+                                     asyncio.get_event_loop())
+            self._sweeper.start(now=False)
+
+    async def delete_expired(self) -> None:
+        removed = await self._store.delete_expired(datetime.now(timezone.utc))
+        if removed:
+            Log.debug(f'Removed {removed} expired sessions')
+
     async def delete(self, session_id: Session.Id) -> None:
-        self._stg.pop(session_id)
+        await self._store.delete(session_id)
 
     async def get(self, session_id: Session.Id) -> Optional[Session]:
-        return self._stg.get(session_id, None)
+        return await self._store.get(session_id)
 
     async def get_all(self):
-        return list(self._stg.values())
+        return await self._store.get_all()
+
+    async def get_by_user(self, user_id: str) -> list:
+        return await self._store.get_by_user(user_id)
 
     async def update(self, session: Session) -> None:
-        self._stg[session.session_id] = session
+        await self._store.store(session)
+
+    async def refresh(self, session: Session) -> None:
+        """ Extend the session lifetime on use """
+        session.expiry_time = self.calc_expiry_time()
+        await self._store.touch(session)
 
 
 class AuthPolicy(ABC):
@@ -167,8 +464,11 @@ class AuthPolicy(ABC):
 class LocalAuthPolicy(AuthPolicy):
     """ Local CSM user authentication policy """
 
+    def __init__(self, password_verifier: PasswordVerifier):
+        self._password_verifier = password_verifier
+
     async def authenticate(self, user: User, password: str) -> Optional[SessionCredentials]:
-        if Passwd.verify(password, user.password_hash):
+        if await self._password_verifier.verify(password, user.password_hash):
             return LocalCredentials(user.user_id)
         return None
 
@@ -212,9 +512,11 @@ class AuthService:
     """ Generic authentication service. Allows to use different
     authentication policies for different user types. """
 
-    def __init__(self):
+    def __init__(self, password_verifier: Optional[PasswordVerifier] = None):
+        if password_verifier is None:
+            password_verifier = PasswordVerifier()
         self._policies = {
-            UserType.CsmUser.value: LocalAuthPolicy(),
+            UserType.CsmUser.value: LocalAuthPolicy(password_verifier),
             UserType.LdapUser.value: LdapAuthPolicy(),
             UserType.S3AccountUser.value: S3AuthPolicy(),
         }
@@ -286,7 +588,7 @@ class LoginService:
             raise CsmError(CSM_ERR_INVALID_VALUE, 'Session expired')
 
         # Refresh Expiry Time
-        session.expiry_time = self._session_manager.calc_expiry_time()
+        await self._session_manager.refresh(session)
 
         return session
 
@@ -296,10 +598,9 @@ class LoginService:
         :param user_id: user ID, for S3 session the S3 user name is expected.
         :return: List of temporary access keys.
         """
-        sessions = await self._session_manager.get_all()
+        sessions = await self._session_manager.get_by_user(user_id)
         return [s.credentials.access_key for s in sessions
-                if s.credentials.user_id.lower() == user_id.lower() and isinstance(
-                    s.credentials, S3Credentials)]
+                if isinstance(s.credentials, S3Credentials)]
 
     async def delete_all_sessions(self, session_id: Session.Id) -> None:
         """
@@ -322,7 +623,6 @@ class LoginService:
         :return: None
         """
         Log.debug(f"Delete all active sessions for Userid: {user_id}")
-        session_data = await self._session_manager.get_all()
+        session_data = await self._session_manager.get_by_user(user_id)
         for each_session in session_data:
-            if each_session.credentials.user_id.lower() == user_id.lower():
-                await self._session_manager.delete(each_session.session_id)
+            await self._session_manager.delete(each_session.session_id)
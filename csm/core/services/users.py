@@ -23,6 +23,7 @@ from cortx.utils.log import Log
 from csm.common.services import Service, ApplicationService
 from csm.common.queries import SortBy, SortOrder, QueryLimits, DateTimeRange
 from csm.core.data.models.users import User, UserType, Passwd
+from csm.core.services.password_verifier import PasswordVerifier
 from csm.common.errors import (CsmNotFoundError, CsmError, InvalidRequest,
                                 CsmPermissionDenied, ResourceExist)
 import time
@@ -126,9 +127,11 @@ class CsmUserService(ApplicationService):
     """
     Service that exposes csm user management actions from the csm core.
     """
-    def __init__(self, provisioner, user_mgr: UserManager):
+    def __init__(self, provisioner, user_mgr: UserManager,
+                 password_verifier: Optional[PasswordVerifier] = None):
         self.user_mgr = user_mgr
         self._provisioner = provisioner
+        self._password_verifier = password_verifier or PasswordVerifier()
 
     def _user_to_dict(self, user: User):
         """ Helper method to convert user model into a dictionary repreentation """
@@ -282,7 +285,7 @@ class CsmUserService(ApplicationService):
         else:
             await self._validation_for_update_by_normal_user(user_id, loggedin_user_id, new_values)
         
-        if current_password and not self._verfiy_current_password(user, current_password):
+        if current_password and not await self._verfiy_current_password(user, current_password):
             raise InvalidRequest("Cannot update user details without valid current password",
                                       USERS_MSG_UPDATE_NOT_ALLOWED)
         
@@ -290,11 +293,11 @@ class CsmUserService(ApplicationService):
         await self.user_mgr.save(user)
         return self._user_to_dict(user)
 
-    def _verfiy_current_password(self, user: User, password):
+    async def _verfiy_current_password(self, user: User, password):
         """
         Verify current password of user .
         """
-        return Passwd.verify(password, user.password_hash)
+        return await self._password_verifier.verify(password, user.password_hash)
 
     def is_super_user(self, user: User):
         """ Check if user is super user """
@@ -17,10 +17,11 @@ import json
 import os
 import time
 import asyncio
+from typing import Optional
 from csm.common.comm import AmqpComm
 from csm.common.errors import CsmError
 from cortx.utils.log import Log
-from csm.common.payload import Payload, Json, JsonMessage, Dict
+from csm.common.payload import Json, JsonMessage, JsonCodec, CompiledMapping
 from csm.common.plugin import CsmPlugin
 from csm.core.blogic import const
 from marshmallow import Schema, fields, ValidationError
@@ -98,6 +99,64 @@ class AlertSchemaValidator(Schema):
     support_message = fields.String(required=False, description="Support message for alert.")
     resource_id = fields.String(required=True, description="Id of the resource")
 
+class AlertValidator:
+    """
+    Validates converted alerts with AlertSchemaValidator created once.
+    The schema fields are compiled into a plan of plain type checks. An alert
+    whose values already have the types the schema loads them as passes
+    with the plan alone. Other alerts take the full marshmallow load, so the
+    result and the errors are the same as with the schema itself.
+    """
+
+    # Field classes returning values of these exact types unchanged
+    _FAST_TYPES = {fields.String: str, fields.Integer: int, fields.Boolean: bool}
+
+    def __init__(self, schema: Schema = None):
+        self._schema = schema or AlertSchemaValidator()
+        self._plan = []
+        for name, field in self._schema.load_fields.items():
+            value_type = self._FAST_TYPES.get(type(field))
+            if value_type is None or field.validators or field.data_key:
+                # The plan cannot tell what the schema would do
+                self._plan = None
+                break
+            self._plan.append((name, value_type, field.required, field.allow_none))
+        self.fast_loads = 0
+        self.full_loads = 0
+
+    def _fast_load(self, alert) -> Optional[dict]:
+        """ :return: loaded alert, None if the full load is needed """
+        if type(alert) is not dict:
+            return None
+        result = {}
+        for name, value_type, required, allow_none in self._plan:
+            if name not in alert:
+                if required:
+                    return None
+                continue
+            value = alert[name]
+            if value is None:
+                if not allow_none:
+                    return None
+            elif type(value) is not value_type:
+                return None
+            result[name] = value
+        return result
+
+    def load(self, alert: dict) -> dict:
+        """
+        Validate the alert, fields unknown to the schema are excluded
+        :raises ValidationError: the alert is invalid
+        """
+        if self._plan is not None:
+            result = self._fast_load(alert)
+            if result is not None:
+                self.fast_loads += 1
+                return result
+        self.full_loads += 1
+        return self._schema.load(alert, unknown=const.MARSHMALLOW_EXCLUDE)
+
+
 class AlertPlugin(CsmPlugin):
     """
     Alert Plugin is responsible for listening on the comm channel and receive
@@ -111,22 +170,36 @@ class AlertPlugin(CsmPlugin):
         try:
             self.comm_client = AmqpComm()
             self.monitor_callback = None
+            self.monitor_window_callback = None
+            self.window_size = 1
+            self.window_latency = 0
             self.health_plugin = None
             self.mapping_dict = Json(const.ALERT_MAPPING_TABLE).load()
+            # Conversion plans of the common fields and of every resource type
+            self.mapping_plans = {key: CompiledMapping(mapping)
+                                  for key, mapping in self.mapping_dict.items()}
             self.decision_maker_service = DecisionMakerService()
+            self.alert_validator = AlertValidator()
         except Exception as e:
             Log.exception(e)
 
-    def init(self, callback_fn, health_plugin):
+    def init(self, callback_fn, health_plugin, window_callback_fn=None,
+             window_size=1, window_latency=0):
         """
         Establish connection with the RMQ Server.
         AlertPlugin's _listen method acts as the thread function.
         Parameters -
         1. callback_fn :- This parameter specifies the name AlertMonitor 
            class function to which plugin will send the alerts as JSON string.  
+        2. window_callback_fn :- If set, alerts are received in windows of
+           up to window_size messages collected for at most window_latency
+           seconds and passed to this function as a list.
         """
         try:
             self.monitor_callback = callback_fn
+            self.monitor_window_callback = window_callback_fn
+            self.window_size = window_size
+            self.window_latency = window_latency
             self.health_plugin = health_plugin
             self.comm_client.init()
         except Exception as e:
@@ -168,10 +241,9 @@ class AlertPlugin(CsmPlugin):
             try:
                 if self.monitor_callback:
                     Log.info("Coverting and validating alert.")
-                    alert = self._convert_to_csm_schema(message)
+                    alert = self._convert_to_csm_schema(sensor_queue_msg)
                     """Validating Schema using marshmallow"""
-                    alert_validator = AlertSchemaValidator()
-                    alert_data = alert_validator.load(alert,  unknown='EXCLUDE')
+                    alert_data = self.alert_validator.load(alert)
                     Log.debug(f"Alert validated : {alert_data}")
                     status = self.monitor_callback(alert_data)
                     """
@@ -192,6 +264,50 @@ class AlertPlugin(CsmPlugin):
             Log.debug(f"Marking sensor response as acknowleged. status: {status}")
             self.comm_client.acknowledge()
 
+    def _plugin_window_callback(self, messages):
+        """
+        Window counterpart of _plugin_callback.
+        Alerts of the window are passed to the AlertMonitor at once and are
+        acknowledged if they are processed, returned to the queue otherwise.
+        The other messages keep the acknowledgement rules of _plugin_callback:
+        actuator responses are acknowledged if they are processed and alerts
+        failing validation are acknowledged. Messages that _plugin_callback
+        leaves unacknowledged are rejected instead, they would otherwise
+        take the window prefetch slots until the connection is closed.
+        :return: outcome of every message, see AmqpComm.recv_window
+        """
+        outcomes = [const.AMQP_MSG_REJECT] * len(messages)
+        alerts = []
+        # Indexes of the alert messages in the window
+        alert_indexes = []
+        sensor_queue_msgs = []
+        for index, message in enumerate(messages):
+            try:
+                sensor_queue_msg = JsonMessage(message).load()
+                Log.info(f"Message on sensor queue: {sensor_queue_msg}")
+                title = sensor_queue_msg.get("title", "").lower()
+                if "actuator" in title:
+                    if self.health_plugin.health_plugin_callback(message):
+                        outcomes[index] = const.AMQP_MSG_ACK
+                elif "sensor" in title:
+                    alert = self._convert_to_csm_schema(sensor_queue_msg)
+                    alerts.append(self.alert_validator.load(alert))
+                    alert_indexes.append(index)
+                    sensor_queue_msgs.append(sensor_queue_msg)
+            except ValidationError as ve:
+                Log.warn(f"Acknowledge incase of validation error {ve}")
+                outcomes[index] = const.AMQP_MSG_ACK
+            except Exception as e:
+                Log.warn(f"Error occured during processing alerts: {e}")
+        if alerts:
+            status = self.monitor_window_callback(alerts)
+            for index in alert_indexes:
+                outcomes[index] = const.AMQP_MSG_ACK if status else const.AMQP_MSG_REQUEUE
+            if self.decision_maker_service and status:
+                for sensor_queue_msg in sensor_queue_msgs:
+                    self.decision_maker_service.decision_maker_callback(sensor_queue_msg)
+        return outcomes
+
     def _listen(self):
         """
         This is thread function.
@@ -199,7 +315,11 @@ class AlertPlugin(CsmPlugin):
         and starts consuming the alerts.
         """
         try:
-            self.comm_client.recv(self._plugin_callback)
+            if self.monitor_window_callback and self.window_size > 1:
+                self.comm_client.recv_window(self._plugin_window_callback,
+                                             self.window_size, self.window_latency)
+            else:
+                self.comm_client.recv(self._plugin_callback)
         except Exception as e:
             Log.warn(e)
 
@@ -214,12 +334,14 @@ class AlertPlugin(CsmPlugin):
     def _convert_to_csm_schema(self, message):
         """
         Parsing the alert JSON to create the csm schema
+        :param message: decoded alert message, or the alert JSON string.
+                        Values of the decoded message are shared with the
+                        result, they must not be modified.
         """
         Log.debug(f"Convert to csm schema:{message}")
         csm_schema = {}
         try:
-            json_msg_obj = JsonMessage(message)
-            msg_body = json_msg_obj.load()
+            msg_body = JsonMessage(message).load() if isinstance(message, str) else message
             sub_body = msg_body.get(const.ALERT_MESSAGE, {}).get(
                 const.ALERT_SENSOR_TYPE, {})
             resource_type = sub_body.get("info", {}).get\
@@ -236,16 +358,10 @@ class AlertPlugin(CsmPlugin):
                 """
                 module_type = res_split[len(res_split) - 1]
                 """ Convert  the SSPL Schema to CSM Schema. """
-                input_alert_payload = Payload(JsonMessage(message))
-                csm_alert_payload = Payload(Dict(dict()))
-                input_alert_payload.convert(self.mapping_dict.get\
-                        (const.COMMON), csm_alert_payload)
-                resource_mapping = self.mapping_dict.get(resource_type, "")
+                csm_schema = self.mapping_plans[const.COMMON].convert(msg_body)
+                resource_mapping = self.mapping_plans.get(resource_type)
                 if resource_mapping:
-                    input_alert_payload.convert(resource_mapping, csm_alert_payload)
-                csm_alert_payload.dump()
-                csm_schema = csm_alert_payload.load()
-                obj_extended_info = JsonMessage(csm_schema[const.ALERT_EXTENDED_INFO])
+                    resource_mapping.convert(msg_body, csm_schema)
                 """
                 Fetching the health information from the alert.
                 Currently we require 3 values 1. health, 2. health_reason and
@@ -306,13 +422,12 @@ class AlertPlugin(CsmPlugin):
                 if const.ALERT_EVENTS in csm_schema and \
                         csm_schema[const.ALERT_EVENTS] is not None:
                     csm_schema[const.ALERT_EVENT_DETAILS] = []
-                    obj_event_details = JsonMessage(csm_schema[const.ALERT_EVENT_DETAILS])
                     self._prepare_specific_info(csm_schema, specific_info)
                     csm_schema.pop(const.ALERT_EVENTS)
                     csm_schema[const.ALERT_EVENT_DETAILS]= \
-                        obj_event_details.dump(csm_schema[const.ALERT_EVENT_DETAILS])
+                        JsonCodec.dumps(csm_schema[const.ALERT_EVENT_DETAILS])
                 csm_schema[const.ALERT_EXTENDED_INFO] = \
-                    obj_extended_info.dump(csm_schema[const.ALERT_EXTENDED_INFO])
+                    JsonCodec.dumps(csm_schema[const.ALERT_EXTENDED_INFO])
         except Exception as e:
             Log.error(f"Error occured in coverting alert to csm schema. {e}")
         Log.debug(f"Converted schema:{csm_schema}")
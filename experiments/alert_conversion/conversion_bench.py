@@ -0,0 +1,101 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+#!/usr/bin/env python3
+
+"""
+ ****************************************************************************
+ Filename:          conversion_bench.py
+ Description:       Measure per-message cost of decoding an SSPL alert and
+                    mapping it to the CSM schema: decoding twice and
+                    Payload.convert vs decoding once and CompiledMapping.
+
+ Usage:             python3 conversion_bench.py [number_of_rounds] [corpus.json]
+ ****************************************************************************
+"""
+
+import json
+import os
+import sys
+import time
+
+from csm.common.payload import Payload, JsonMessage, Dict, JsonCodec, CompiledMapping
+
+
+NUMBER_OF_ROUNDS = 2000
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(HERE, 'sspl_alerts.json')
+MAPPING_TABLE = os.path.join(HERE, '..', '..', 'schema', 'alert_mapping_table.json')
+COMMON = 'common'
+
+
+def _resource_type(msg):
+    return msg['message']['sensor_response_type']['info']['resource_type']
+
+
+def legacy_convert(mapping_table, message):
+    """ Conversion as it was: the plugin and the converter decode the message """
+    msg = JsonMessage(message).load()
+    input_alert_payload = Payload(JsonMessage(message))
+    csm_alert_payload = Payload(Dict(dict()))
+    input_alert_payload.convert(mapping_table[COMMON], csm_alert_payload)
+    resource_mapping = mapping_table.get(_resource_type(msg), "")
+    if resource_mapping:
+        input_alert_payload.convert(resource_mapping, csm_alert_payload)
+    csm_alert_payload.dump()
+    return csm_alert_payload.load()
+
+
+def compiled_convert(plans, message):
+    """ Conversion with the message decoded once and precompiled mappings """
+    msg = JsonCodec.loads(message)
+    csm_schema = plans[COMMON].convert(msg)
+    resource_mapping = plans.get(_resource_type(msg))
+    if resource_mapping:
+        resource_mapping.convert(msg, csm_schema)
+    return csm_schema
+
+
+def measure(name, convert, mapping, messages, rounds):
+    # Warm up
+    for message in messages:
+        convert(mapping, message)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            convert(mapping, message)
+    elapsed = time.perf_counter() - start
+    print(f'{name:>8} {elapsed / (rounds * len(messages)) * 1e6:10.2f} us/message')
+
+
+def main(rounds, corpus):
+    with open(corpus) as f:
+        messages = [json.dumps(message) for message in json.load(f)]
+    with open(MAPPING_TABLE) as f:
+        mapping_table = json.load(f)
+    plans = {key: CompiledMapping(mapping) for key, mapping in mapping_table.items()}
+
+    for message in messages:
+        if legacy_convert(mapping_table, message) != compiled_convert(plans, message):
+            raise AssertionError(f'Conversions differ for {message}')
+    print(f'{len(messages)} messages, {rounds} rounds')
+    measure('legacy', legacy_convert, mapping_table, messages, rounds)
+    measure('compiled', compiled_convert, plans, messages, rounds)
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ROUNDS
+    corpus = sys.argv[2] if len(sys.argv) > 2 else CORPUS
+    main(rounds, corpus)
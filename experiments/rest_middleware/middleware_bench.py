@@ -0,0 +1,139 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+#!/usr/bin/env python3
+
+"""
+ ****************************************************************************
+ Filename:          middleware_bench.py
+ Description:       Measure per-request overhead of the session and permission
+                    middlewares: route resolving on every middleware vs
+                    precomputed route auth table.
+
+ Usage:             python3 middleware_bench.py [number_of_requests]
+ ****************************************************************************
+"""
+
+import asyncio
+import sys
+import time
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from cortx.utils.log import Log
+
+from csm.common.permission_names import Resource, Action
+from csm.core.agent.api import CsmRestApi
+from csm.core.controllers.routes import CsmRoutes
+from csm.core.controllers.view import CsmView, CsmAuth
+from csm.core.services.permissions import PermissionSet
+
+
+NUMBER_OF_REQUESTS = 5000
+SESSION_ID = 'bench'
+
+routes = web.RouteTableDef()
+
+
+@routes.view('/api/v1/bench/{item_id}')
+class BenchView(CsmView):
+    @CsmAuth.permissions({Resource.ALERTS: {Action.LIST}})
+    async def get(self):
+        return web.Response(text='ok')
+
+
+@routes.view('/api/v1/bench_public')
+@CsmAuth.public
+class BenchPublicView(CsmView):
+    async def get(self):
+        return web.Response(text='ok')
+
+
+class Credentials:
+    user_id = 'bench'
+
+
+class Session:
+    credentials = Credentials()
+    permissions = PermissionSet({Resource.ALERTS: {Action.LIST, Action.UPDATE}})
+
+
+class LoginService:
+    async def auth_session(self, session_id):
+        return Session()
+
+
+@web.middleware
+async def legacy_session_middleware(request, handler):
+    """ Session middleware as it was: resolves the route by itself """
+    match_info = await request.app.router.resolve(request)
+    session = None
+    if not CsmView.is_public(match_info.handler, request.method):
+        session_id = request.headers.get(CsmAuth.HDR).split(' ')[1]
+        session = await request.app.login_service.auth_session(session_id)
+    request.session = session
+    return await handler(request)
+
+
+@web.middleware
+async def legacy_permission_middleware(request, handler):
+    """ Permission middleware as it was: resolves the route once again """
+    if request.session is not None:
+        match_info = await request.app.router.resolve(request)
+        required = CsmView.get_permissions(match_info.handler, request.method)
+        if (request.session.permissions & required) != required:
+            raise web.HTTPForbidden()
+    return await handler(request)
+
+
+def create_app(middlewares):
+    app = web.Application(middlewares=middlewares)
+    app.add_routes(routes)
+    CsmRoutes.build_auth_table(app.router)
+    app.login_service = LoginService()
+    return app
+
+
+async def measure(name, middlewares, number):
+    """ Run the requests sequentially and print average time per request """
+    client = TestClient(TestServer(create_app(middlewares)))
+    await client.start_server()
+    headers = {CsmAuth.HDR: f'{CsmAuth.TYPE} {SESSION_ID}'}
+    try:
+        for path in ('/api/v1/bench/1', '/api/v1/bench_public'):
+            # Warm up connection pool and caches
+            for _ in range(100):
+                await client.get(path, headers=headers)
+            start = time.perf_counter()
+            for i in range(number):
+                resp = await client.get(path, headers=headers)
+                await resp.read()
+            elapsed = time.perf_counter() - start
+            print(f'{name:>8} {path:<24} {elapsed / number * 1e6:10.1f} us/request')
+    finally:
+        await client.close()
+
+
+async def main(number):
+    await measure('legacy', [legacy_session_middleware, legacy_permission_middleware],
+                  number)
+    await measure('table', [CsmRestApi.session_middleware, CsmRestApi.permission_middleware],
+                  number)
+    await measure('none', [], number)
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_REQUESTS
+    Log.init('middleware_bench', log_path='/tmp', level='ERROR')
+    asyncio.get_event_loop().run_until_complete(main(number))
@@ -0,0 +1,117 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+#!/usr/bin/env python3
+
+"""
+ ****************************************************************************
+ Filename:          alert_validation_bench.py
+ Description:       Check that AlertValidator gives the same results and
+                    errors as AlertSchemaValidator on recorded alerts and
+                    broken variants of them, then measure per-alert cost of
+                    a new schema per alert, a cached schema and AlertValidator.
+                    Exits with status 1 if the results differ.
+
+ Usage:             python3 alert_validation_bench.py [number_of_rounds] [alerts.json]
+ ****************************************************************************
+"""
+
+import json
+import os
+import sys
+import time
+
+from csm.core.blogic import const
+from csm.plugins.cortx.alert import AlertSchemaValidator, AlertValidator
+
+
+NUMBER_OF_ROUNDS = 2000
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema', 'csm_alerts.json')
+
+
+def variants(alert):
+    """ The alert and broken or unusual copies of it """
+    yield alert
+    for name, value in (('created_time', str(alert['created_time'])),
+                        ('created_time', None), ('node_id', 1), ('disk_slot', '12'),
+                        ('resolved', 'false'), ('description', None), ('extra', 'x')):
+        changed = dict(alert)
+        changed[name] = value
+        yield changed
+    for name in ('alert_uuid', 'description'):
+        changed = dict(alert)
+        changed.pop(name, None)
+        yield changed
+
+
+def outcome(load, alert):
+    try:
+        return 'ok', load(alert)
+    except Exception as e:
+        return type(e).__name__, str(e)
+
+
+def new_schema_load(alert):
+    """ Validation as it was: a new schema for every alert """
+    return AlertSchemaValidator().load(alert, unknown=const.MARSHMALLOW_EXCLUDE)
+
+
+def check(alerts):
+    validator = AlertValidator()
+    schema = AlertSchemaValidator()
+    cached_load = lambda alert: schema.load(alert, unknown=const.MARSHMALLOW_EXCLUDE)
+    checked = 0
+    for alert in alerts:
+        for variant in variants(alert):
+            expected = outcome(cached_load, variant)
+            actual = outcome(validator.load, variant)
+            if actual != expected:
+                print(f'Results differ for {variant}:\n  schema:    {expected}\n'
+                      f'  validator: {actual}')
+                return False
+            checked += 1
+    print(f'{checked} alerts checked, {validator.fast_loads} fast, '
+          f'{validator.full_loads} full loads')
+    return True
+
+
+def measure(name, load, alerts, rounds):
+    for alert in alerts:
+        load(alert)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for alert in alerts:
+            load(alert)
+    elapsed = time.perf_counter() - start
+    print(f'{name:>10} {elapsed / (rounds * len(alerts)) * 1e6:10.2f} us/alert')
+
+
+def main(rounds, corpus):
+    with open(corpus) as f:
+        alerts = json.load(f)
+    if not check(alerts):
+        return 1
+    schema = AlertSchemaValidator()
+    measure('new schema', new_schema_load, alerts, rounds)
+    measure('cached', lambda alert: schema.load(alert, unknown=const.MARSHMALLOW_EXCLUDE),
+            alerts, rounds)
+    measure('validator', AlertValidator().load, alerts, rounds)
+    return 0
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ROUNDS
+    corpus = sys.argv[2] if len(sys.argv) > 2 else CORPUS
+    sys.exit(main(rounds, corpus))
@@ -0,0 +1,77 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import json
+from marshmallow import ValidationError
+from csm.test.common import assert_equal, Const
+from csm.common.payload import Payload, Json, JsonMessage, Dict, CompiledMapping
+from csm.core.blogic import const
+from csm.plugins.cortx.alert import AlertSchemaValidator, AlertValidator
+
+ALERT = {'alert_uuid': '1', 'sensor_info': 'node_1', 'state': 'fault', 'type': 'fault',
+         'severity': 'critical', 'module_name': 'disk', 'description': 'Disk fault',
+         'created_time': 1592224360, 'updated_time': 1592224360, 'resolved': False,
+         'acknowledged': False, 'health': 'Fault', 'node_id': 'srvnode-1',
+         'host_id': 'srvnode-1.local', 'resource_id': '0.1'}
+
+
+def test_compiled_mapping_matches_payload(*args):
+    mapping_table = Json(const.ALERT_MAPPING_TABLE).load()
+    with open(Const.MOCK_PATH + 'alert_input.json') as f:
+        messages = json.load(f)
+    for message in messages:
+        resource_type = message['message']['sensor_response_type']['info']['resource_type']
+        for mapping in (mapping_table[const.COMMON], mapping_table[resource_type]):
+            expected = Payload(Dict(dict()))
+            Payload(JsonMessage(json.dumps(message))).convert(mapping, expected)
+            assert_equal(CompiledMapping(mapping).convert(message), expected.data())
+
+
+def test_compiled_mapping_missing_keys(*args):
+    mapping = CompiledMapping({'a.b': 'x.y', 'a.c': 'x.z', 'd': 'w'})
+    target = {'x': 'replaced'}
+    mapping.convert({'a': {'b': 1}}, target)
+    assert_equal(target, {'x': {'y': 1, 'z': None}, 'w': None})
+
+
+def _load(load, alert):
+    try:
+        return load(alert)
+    except ValidationError as e:
+        return e.messages
+
+
+def test_validator_matches_schema(*args):
+    validator = AlertValidator()
+    schema = AlertSchemaValidator()
+    alerts = [ALERT, dict(ALERT, extra='x'), dict(ALERT, created_time='1592224360'),
+              dict(ALERT, node_id=1), dict(ALERT, description=None), dict(ALERT, state=None)]
+    alerts.append({k: v for k, v in ALERT.items() if k != 'alert_uuid'})
+    for alert in alerts:
+        assert_equal(_load(validator.load, alert),
+                     _load(lambda a: schema.load(a, unknown=const.MARSHMALLOW_EXCLUDE), alert))
+    # Alerts already holding the loaded types, unknown fields are dropped
+    assert_equal(validator.fast_loads, 3)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_compiled_mapping_matches_payload,
+    test_compiled_mapping_missing_keys,
+    test_validator_matches_schema,
+]
@@ -0,0 +1,121 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from csm.test.common import assert_equal
+from csm.core.services.alerts import AlertFlapDetector
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def _message(uuid, state, resource='fan_1'):
+    return {'alert_uuid': uuid, 'state': state, 'sensor_info': resource, 'module_type': 'fan'}
+
+
+def _run(detector, clock, sequence):
+    """
+    Feed (time, state) pairs to the detector, checking it every second
+    :return: (time, alert_uuid, state, flapping) of the forwarded alerts
+    """
+    forwarded = []
+    for uuid, (at, state) in enumerate(sequence):
+        while clock.now < at:
+            clock.now += 1
+            due = detector.check()
+            forwarded.extend((clock.now, m['alert_uuid'], m['state'], m.get('flapping'))
+                             for m in due.values())
+            detector.forwarded(due)
+        forwarded.extend((at, m['alert_uuid'], m['state'], m.get('flapping'))
+                         for m in detector.observe(_message(str(uuid), state)))
+    return forwarded
+
+
+def test_flapping_resource_is_damped(*args):
+    clock = FakeClock()
+    detector = AlertFlapDetector(threshold=3, window=10, settle_time=5, summary_interval=4,
+                                 clock=clock)
+    states = ['fault', 'fault_resolved'] * 4
+    forwarded = _run(detector, clock, [(at, state) for at, state in enumerate(states)]
+                     + [(12, 'fault_resolved')])
+    assert_equal(forwarded, [
+        (0, '0', 'fault', None),
+        (1, '1', 'fault_resolved', None),
+        (2, '2', 'fault', None),
+        # The third state change makes the resource flap
+        (3, '3', 'fault_resolved', True),
+        # Summaries of the alerts held since then
+        (7, '6', 'fault', True),
+        (11, '7', 'fault_resolved', True),
+        # No state change for settle_time, the settled state is forwarded
+        (12, '7', 'fault_resolved', False),
+        (12, '8', 'fault_resolved', None),
+    ])
+    assert_equal(detector.suppressed, 4)
+    assert_equal(detector.flapping(), [])
+
+
+def test_steady_resources_are_not_damped(*args):
+    clock = FakeClock()
+    detector = AlertFlapDetector(threshold=2, window=10, settle_time=5, summary_interval=4,
+                                 clock=clock)
+    # State changes further apart than the window
+    forwarded = _run(detector, clock, [(0, 'fault'), (11, 'fault_resolved'), (22, 'fault')])
+    assert_equal([f[3] for f in forwarded], [None, None, None])
+    # Flapping of one resource does not hold alerts of another one
+    for state in ('fault_resolved', 'fault', 'fault_resolved'):
+        detector.observe(_message('x', state, 'fan_2'))
+    assert_equal(detector.flapping(), [('fan_2', 'fan')])
+    assert_equal(len(detector.observe(_message('y', 'fault_resolved'))), 1)
+    disabled = AlertFlapDetector(threshold=0, clock=clock)
+    for state in ('fault', 'fault_resolved') * 5:
+        assert_equal(len(disabled.observe(_message('z', state))), 1)
+
+
+def test_alerts_are_kept_until_forwarded(*args):
+    clock = FakeClock()
+    detector = AlertFlapDetector(threshold=2, window=10, settle_time=5, summary_interval=4,
+                                 clock=clock)
+    for uuid, state in enumerate(['fault', 'fault_resolved', 'fault']):
+        detector.observe(_message(str(uuid), state))
+    clock.now = 5
+    due = detector.check()
+    assert_equal([(m['alert_uuid'], m['flapping']) for m in due.values()], [('2', False)])
+    # Not forwarded, the next check hands the alert over again
+    assert_equal(detector.check(), due)
+    # A state change after the check keeps the resource flapping
+    detector.observe(_message('3', 'fault_resolved'))
+    detector.forwarded(due)
+    assert_equal(detector.flapping(), [('fan_1', 'fan')])
+    clock.now = 10
+    due = detector.check()
+    assert_equal([(m['alert_uuid'], m['flapping']) for m in due.values()], [('3', False)])
+    detector.forwarded(due)
+    assert_equal(detector.flapping(), [])
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_flapping_resource_is_damped,
+    test_steady_resources_are_not_damped,
+    test_alerts_are_kept_until_forwarded,
+]
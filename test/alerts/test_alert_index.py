@@ -0,0 +1,120 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from datetime import datetime, timedelta
+from csm.test.common import assert_equal, async_test, FakeStorage
+from csm.core.blogic import const
+from csm.core.blogic.models.alerts import AlertModel
+from csm.core.services.alerts import AlertRepository, OpenAlertIndex
+
+
+def _alert(uuid, sensor_info='enclosure:fru:psu', resolved=False, acknowledged=False):
+    return AlertModel({'alert_uuid': uuid, 'sensor_info': sensor_info,
+                       'module_type': 'psu', 'state': 'fault',
+                       'resolved': resolved, 'acknowledged': acknowledged})
+
+
+def test_index_lookup(*args):
+    index = OpenAlertIndex()
+    assert_equal(index.lookup('enclosure:fru:psu', 'psu'), (False, None))
+    index.load([_alert('1'), _alert('2', 'disk', True, True)], complete=True)
+    assert_equal(len(index), 1)
+    found, alert = index.lookup('enclosure:fru:psu', 'psu')
+    assert_equal((found, alert.alert_uuid), (True, '1'))
+    # A miss in a complete index means there is no open alert
+    assert_equal(index.lookup('disk', 'psu'), (True, None))
+
+    index.invalidate('disk', 'psu')
+    assert_equal(index.lookup('disk', 'psu'), (False, None))
+    index.put(_alert('3', 'disk'))
+    assert_equal(index.lookup('disk', 'psu')[1].alert_uuid, '3')
+
+
+def test_index_update(*args):
+    index = OpenAlertIndex()
+    index.load([_alert('1', resolved=False, acknowledged=True)], complete=True)
+    index.update('enclosure:fru:psu', 'psu', {'state': 'fault_resolved'})
+    assert_equal(index.lookup('enclosure:fru:psu', 'psu')[1].state, 'fault_resolved')
+    # The returned alert is a copy
+    index.lookup('enclosure:fru:psu', 'psu')[1].state = 'changed'
+    assert_equal(index.lookup('enclosure:fru:psu', 'psu')[1].state, 'fault_resolved')
+
+    index.update('enclosure:fru:psu', 'psu', {'resolved': True})
+    assert_equal(index.lookup('enclosure:fru:psu', 'psu'), (True, None))
+
+
+@async_test
+async def test_repository_uses_index(*args):
+    storage = FakeStorage()
+    collection = storage(AlertModel)
+    repo = AlertRepository(storage)
+    await repo.retrieve_by_sensor_info('enclosure:fru:psu', 'psu')
+    assert_equal(collection.gets, 1)
+
+    repo.open_alerts.load([], complete=True)
+    await repo.store(_alert('1'))
+    alert = await repo.retrieve_by_sensor_info('enclosure:fru:psu', 'psu')
+    assert_equal(alert.alert_uuid, '1')
+    assert_equal(await repo.retrieve_by_sensor_info('disk', 'psu'), None)
+    assert_equal(collection.gets, 1)
+
+    alert.acknowledged = True
+    await repo.update(alert)
+    await repo.update_by_sensor_info('enclosure:fru:psu', 'psu', {'resolved': True})
+    assert_equal(await repo.retrieve_by_sensor_info('enclosure:fru:psu', 'psu'), None)
+    assert_equal(collection.gets, 1)
+
+
+@async_test
+async def test_index_is_loaded_by_pages(*args):
+    repo = AlertRepository(FakeStorage())
+    page_size = const.ES_RECORD_LIMIT
+    alerts = [_alert(str(index), f'disk_{index}') for index in range(page_size + 1)]
+    for index, alert in enumerate(alerts):
+        alert.created_time = datetime(2020, 1, 1) + timedelta(seconds=index)
+    pages = []
+
+    async def retrieve_by_range(*args, after=None, **kwargs):
+        pages.append(after)
+        if after is None:
+            return alerts[:page_size]
+        # Stored while the index is being loaded
+        repo.open_alerts.put(_alert('new', 'enclosure:fru:psu'))
+        repo.open_alerts.invalidate('disk_0', 'psu')
+        return alerts[page_size:]
+
+    repo.retrieve_by_range = retrieve_by_range
+    await repo.load_open_alerts()
+    assert_equal(len(pages), 2)
+    assert_equal(repo.open_alerts.complete, True)
+    assert_equal(len(repo.open_alerts), page_size + 1)
+    assert_equal(repo.open_alerts.lookup(f'disk_{page_size}', 'psu')[1].alert_uuid,
+                 str(page_size))
+    # Changes made during the load are not lost
+    assert_equal(repo.open_alerts.lookup('enclosure:fru:psu', 'psu')[1].alert_uuid, 'new')
+    assert_equal(repo.open_alerts.lookup('disk_0', 'psu'), (False, None))
+    assert_equal(repo.open_alerts.lookup('fan', 'psu'), (True, None))
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_index_lookup,
+    test_index_update,
+    test_repository_uses_index,
+    test_index_is_loaded_by_pages,
+]
@@ -0,0 +1,414 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from datetime import datetime, timedelta, timezone
+from csm.test.common import assert_equal, async_test, FakeStorage
+from csm.common.errors import CsmInternalError, CsmResourceNotAvailable
+from csm.common.comm import AmqpComm
+from csm.common.es_bulk import EsBulkClient
+from csm.common.payload import JsonCodec
+from csm.core.blogic import const
+from csm.core.blogic.models.alerts import AlertModel, AlertsHistoryModel
+from csm.plugins.cortx.alert import AlertPlugin
+from marshmallow import ValidationError
+from csm.core.services.alerts import AlertRepository, AlertMonitorService, AlertsAppService, \
+    AlertFlapDetector, AlertEvent
+
+
+class FakeBulk(EsBulkClient):
+    def __init__(self, fail=False, broken=()):
+        super().__init__('localhost', 9200, indexes=EsBulkClient.model_indexes(DB_CONFIG))
+        self.requests = []
+        self.fail = fail
+        self.broken = set(broken)
+
+    async def bulk(self, actions):
+        self.requests.append(actions)
+        if self.fail:
+            raise CsmResourceNotAvailable('Bulk request failed')
+        return ['failed' if meta[next(iter(meta))]['_id'] in self.broken else None
+                for meta, _ in actions]
+
+
+DB_CONFIG = {
+    'models': [
+        {'import_path': 'csm.core.blogic.models.alerts.AlertModel', 'database': 'es_db',
+         'config': {'es_db': {'collection': 'alerts'}}},
+        {'import_path': 'csm.core.blogic.models.alerts.AlertsHistoryModel', 'database': 'es_db',
+         'config': {'es_db': {'collection': 'alerts-history'}}},
+        {'import_path': 'csm.core.data.models.users.User', 'database': 'consul_db',
+         'config': {'consul_db': {'collection': 'user_collection'}}},
+    ]
+}
+
+
+class FakeHealthPlugin:
+    def __init__(self):
+        self.alerts = []
+
+    def update_health_map_with_alert(self, alert):
+        self.alerts.append(alert['alert_uuid'])
+
+
+def _message(uuid, state, resource='psu_1'):
+    now = datetime.now(timezone.utc)
+    return {'alert_uuid': uuid, 'state': state, 'sensor_info': resource,
+            'module_type': 'psu', 'module_name': 'enclosure:fru:psu',
+            'severity': 'warning', 'resolved': False, 'acknowledged': False,
+            'created_time': now, 'updated_time': now}
+
+
+def _monitor(repo):
+    monitor = AlertMonitorService(repo, None, FakeHealthPlugin())
+    notified = []
+    monitor.events.subscribe(AlertEvent, notified.append)
+    return monitor, notified
+
+
+@async_test
+async def test_window_is_stored_in_one_bulk_request(*args):
+    bulk = FakeBulk()
+    repo = AlertRepository(FakeStorage(), bulk)
+    repo.open_alerts.load([], complete=True)
+    monitor, notified = _monitor(repo)
+    await monitor._process_window([_message('1', 'fault'), _message('2', 'fault', 'psu_2'),
+                                   _message('3', 'fault_resolved'), _message('4', 'fault')])
+    assert_equal(len(bulk.requests), 1)
+    indexes = [meta['index']['_index'] for meta, _ in bulk.requests[0]]
+    assert_equal(indexes, ['alerts', 'alerts', 'alerts-history', 'alerts-history',
+                           'alerts-history', 'alerts-history'])
+    # Later alerts of a resource update the first one in order
+    alert = await repo.retrieve_by_sensor_info('psu_1', 'psu')
+    assert_equal((alert.alert_uuid, alert.state, alert.resolved), ('1', 'fault', False))
+    await monitor.events.join()
+    assert_equal([(type(e).__name__, e.alert.alert_uuid) for e in notified],
+                 [('NewAlertEvent', '1'), ('UpdatedAlertEvent', '1'),
+                  ('UpdatedAlertEvent', '1'), ('NewAlertEvent', '2')])
+    monitor.events.stop()
+    assert_equal(monitor.metrics()['alerts'], 4)
+
+
+@async_test
+async def test_window_updates_changed_fields_of_stored_alert(*args):
+    storage = FakeStorage()
+    bulk = FakeBulk()
+    repo = AlertRepository(storage, bulk)
+    stored = AlertModel(_message('1', 'fault'))
+    repo.open_alerts.load([stored], complete=True)
+    monitor, _ = _monitor(repo)
+    await monitor._process_window([_message('2', 'fault_resolved'), _message('3', 'fault_resolved')])
+    # The repeated history record is counted in the previous one
+    actions = [(next(iter(meta)), meta[next(iter(meta))]['_id']) for meta, _ in bulk.requests[0]]
+    assert_equal(actions, [('update', '1'), ('index', '2')])
+    # Acknowledgements and comments made meanwhile are not overwritten
+    doc = bulk.requests[0][0][1]['doc']
+    assert_equal(doc['resolved'], True)
+    assert_equal('acknowledged' in doc or 'comments' in doc or 'alert_uuid' in doc, False)
+    monitor.events.stop()
+    # The DB gets the same fields when the bulk request fails
+    repo = AlertRepository(storage, FakeBulk(fail=True))
+    repo.open_alerts.load([AlertModel(_message('1', 'fault'))], complete=True)
+    monitor, _ = _monitor(repo)
+    await monitor._process_window([_message('2', 'fault')])
+    assert_equal(sorted(storage(AlertModel).updates[0]),
+                 sorted(set(AlertModel(_message('2', 'fault')).to_primitive())
+                        - {'alert_uuid', 'resolved', 'acknowledged', 'comments'}))
+    monitor.events.stop()
+
+
+def test_indexes_are_read_from_db_config(*args):
+    bulk = FakeBulk()
+    assert_equal((bulk.index_of(AlertModel), bulk.index_of(AlertsHistoryModel)),
+                 ('alerts', 'alerts-history'))
+    try:
+        bulk.index_of(FakeStorage)
+        raise AssertionError("Index of an unknown model is returned")
+    except CsmInternalError:
+        pass
+
+
+@async_test
+async def test_broken_document_does_not_fail_window(*args):
+    storage = FakeStorage()
+    repo = AlertRepository(storage, FakeBulk(broken={'2'}))
+    storage(AlertModel).broken.add('2')
+    repo.open_alerts.load([], complete=True)
+    monitor, notified = _monitor(repo)
+    # The bulk item and the single write of alert 2 keep failing
+    await monitor._process_window([_message('1', 'fault'), _message('2', 'fault', 'psu_2')])
+    assert_equal(list(storage(AlertModel).models), [])
+    assert_equal(monitor.metrics()['failed_documents'], 1)
+    assert_equal((await repo.retrieve_by_sensor_info('psu_1', 'psu')).alert_uuid, '1')
+    await monitor.events.join()
+    assert_equal([e.alert.alert_uuid for e in notified], ['1'])
+    monitor.events.stop()
+    # Only an unavailable storage fails the window, it is then delivered again
+    monitor, _ = _monitor(AlertRepository(storage, FakeBulk(fail=True)))
+    storage(AlertsHistoryModel).broken.add('2')
+    try:
+        await monitor._process_window([_message('2', 'fault', 'psu_2')])
+        raise AssertionError("The window is stored")
+    except CsmResourceNotAvailable:
+        pass
+    monitor.events.stop()
+
+
+@async_test
+async def test_store_many_falls_back_to_single_writes(*args):
+    storage = FakeStorage()
+    repo = AlertRepository(storage, FakeBulk(fail=True))
+    await repo.store_many([AlertModel(_message('1', 'fault'))],
+                          [AlertsHistoryModel(_message('1', 'fault'))])
+    assert_equal(list(storage(AlertModel).models), ['1'])
+    assert_equal(list(storage(AlertsHistoryModel).models), ['1'])
+
+
+@async_test
+async def test_acknowledge_sends_changed_fields(*args):
+    storage = FakeStorage()
+    bulk = FakeBulk()
+    repo = AlertRepository(storage, bulk)
+    for uuid in ('1', '2'):
+        await storage(AlertModel).store(AlertModel(_message(uuid, 'fault')))
+    service = AlertsAppService(repo)
+    alerts = await service.update_all_alerts(['1', '2'])
+    assert_equal([alert['acknowledged'] for alert in alerts], [True, True])
+    assert_equal(len(bulk.requests), 1)
+    meta, body = bulk.requests[0][0]
+    assert_equal(meta, {'update': {'_index': 'alerts', '_id': '1'}})
+    assert_equal(sorted(body['doc']), ['acknowledged', 'resolved', 'updated_time'])
+    # Without the bulk API only the changed fields are written too
+    repo = AlertRepository(storage, FakeBulk(fail=True))
+    await AlertsAppService(repo).update_all_alerts(['1'])
+    assert_equal(storage(AlertModel).stores, 2)
+    assert_equal(sorted(storage(AlertModel).updates[-1]),
+                 ['acknowledged', 'resolved', 'updated_time'])
+
+
+@async_test
+async def test_bulk_acknowledge_reports_every_id(*args):
+    storage = FakeStorage()
+    repo = AlertRepository(storage, FakeBulk(broken={'2'}))
+    for uuid in ('1', '2'):
+        await storage(AlertModel).store(AlertModel(_message(uuid, 'fault')))
+    storage(AlertModel).broken.add('2')
+    results = await AlertsAppService(repo).update_all_alerts(['1', '3', '2', '1'])
+    assert_equal([r['alert_uuid'] for r in results], ['1', '3', '2'])
+    assert_equal(results[0]['acknowledged'], True)
+    assert_equal(results[1]['error']['message_id'], 'alerts_not_found')
+    assert_equal(results[2]['error']['message_id'], 'alerts_update_failed')
+
+
+@async_test
+async def test_comment_is_appended_by_script(*args):
+    storage = FakeStorage()
+    bulk = FakeBulk()
+    repo = AlertRepository(storage, bulk)
+    await storage(AlertModel).store(AlertModel(_message('1', 'fault')))
+    comment = await AlertsAppService(repo).add_comment_to_alert('1', 'admin', 'checked')
+    meta, body = bulk.requests[0][0]
+    assert_equal(body['script']['params']['comment'], comment)
+    assert_equal('doc' in body, False)
+    repo = AlertRepository(storage, FakeBulk(fail=True))
+    await AlertsAppService(repo).add_comment_to_alert('1', 'admin', 'fixed')
+    update = storage(AlertModel).updates[-1]
+    assert_equal(sorted(update), ['comments', 'updated_time'])
+    assert_equal([c['comment_text'] for c in update['comments']], ['checked', 'fixed'])
+
+
+@async_test
+async def test_flapping_alert_is_marked_until_settled(*args):
+    clock = [0]
+    repo = AlertRepository(FakeStorage(), FakeBulk())
+    repo.open_alerts.load([], complete=True)
+    monitor, notified = _monitor(repo)
+    monitor._flaps = AlertFlapDetector(2, 10, 5, 100, clock=lambda: clock[0])
+    for uuid, state in enumerate(['fault', 'fault_resolved', 'fault', 'fault_resolved']):
+        clock[0] += 1
+        messages = monitor._flaps.observe(_message(str(uuid), state))
+        if messages:
+            await monitor._process_window(messages)
+    alert = await repo.retrieve_by_sensor_info('psu_1', 'psu')
+    assert_equal((alert.state, alert.flapping), ('fault', True))
+    await monitor.events.join()
+    assert_equal(len(notified), 3)
+    clock[0] += 5
+    await monitor._forward_damped_alerts()
+    alert = await repo.retrieve_by_sensor_info('psu_1', 'psu')
+    assert_equal((alert.state, alert.resolved, alert.flapping), ('fault_resolved', True, False))
+    assert_equal(monitor.metrics()['damped_alerts'], 1)
+    monitor.events.stop()
+
+
+@async_test
+async def test_failed_forward_of_settled_alert_is_retried(*args):
+    clock = [0]
+    repo = AlertRepository(FakeStorage(), FakeBulk())
+    repo.open_alerts.load([], complete=True)
+    monitor, _ = _monitor(repo)
+    monitor._flaps = AlertFlapDetector(2, 10, 5, 100, clock=lambda: clock[0])
+    for uuid, state in enumerate(['fault', 'fault_resolved', 'fault', 'fault_resolved']):
+        clock[0] += 1
+        messages = monitor._flaps.observe(_message(str(uuid), state))
+        if messages:
+            await monitor._process_window(messages)
+    clock[0] += 5
+
+    async def store_many(*args, **kwargs):
+        raise CsmResourceNotAvailable('Elasticsearch is down')
+
+    repo.store_many = store_many
+    try:
+        await monitor._forward_damped_alerts()
+        raise AssertionError("The failed write is not reported")
+    except CsmResourceNotAvailable:
+        pass
+    # The settled alert is kept until it is stored
+    assert_equal(monitor._flaps.flapping(), [('psu_1', 'psu')])
+    del repo.store_many
+    await monitor._forward_damped_alerts()
+    alert = await repo.retrieve_by_sensor_info('psu_1', 'psu')
+    assert_equal((alert.state, alert.resolved, alert.flapping), ('fault_resolved', True, False))
+    assert_equal(monitor._flaps.flapping(), [])
+    monitor.events.stop()
+
+
+class FakeChannel:
+    def __init__(self):
+        self.settled = []
+
+    def acknowledge(self, delivery_tag=None, multiple=False):
+        self.settled.append(('ack', delivery_tag, multiple))
+
+    def reject(self, delivery_tag=None, multiple=False, requeue=True):
+        self.settled.append(('requeue' if requeue else 'reject', delivery_tag, multiple))
+
+
+class WindowComm(AmqpComm):
+    """ Consumer of a window without a broker connection """
+
+    def __init__(self, callback):
+        self._inChannel = FakeChannel()
+        self._window = []
+        self._window_timer = None
+        self.plugin_callback = callback
+
+
+class FakeValidator:
+    def load(self, alert):
+        if 'invalid' in alert:
+            raise ValidationError('Invalid alert')
+        return alert
+
+
+class FakeActuatorHealth:
+    def health_plugin_callback(self, message):
+        return JsonCodec.loads(message)['processed']
+
+
+class WindowPlugin(AlertPlugin):
+    """ Alert plugin without the RabbitMQ and alert mapping configuration """
+
+    def __init__(self, window_status):
+        self.monitor_window_callback = lambda alerts: window_status
+        self.health_plugin = FakeActuatorHealth()
+        self.decision_maker_service = None
+        self.alert_validator = FakeValidator()
+
+    def _convert_to_csm_schema(self, message):
+        return message['alert']
+
+
+def test_window_messages_keep_ack_rules(*args):
+    messages = [JsonCodec.dumps(message) for message in (
+        {'title': 'Actuator response', 'processed': True},
+        {'title': 'Actuator response', 'processed': False},
+        {'title': 'Sensor response', 'alert': {'alert_uuid': '1'}},
+        {'title': 'Sensor response', 'alert': {'invalid': True}},
+        {'title': 'Sensor response'},
+        {'title': 'Unknown'},
+    )]
+    assert_equal(WindowPlugin(True)._plugin_window_callback(messages),
+                 ['ack', 'reject', 'ack', 'ack', 'reject', 'reject'])
+    # Alerts that could not be stored are delivered again
+    assert_equal(WindowPlugin(False)._plugin_window_callback(messages)[2], 'requeue')
+    comm = WindowComm(lambda bodies: [const.AMQP_MSG_ACK] * len(bodies))
+    comm._window = [(1, b''), (2, b'')]
+    comm._flush_window()
+    assert_equal(comm._inChannel.settled, [('ack', 2, True)])
+    comm = WindowComm(lambda bodies: ['ack', 'reject', 'requeue'])
+    comm._window = [(1, b''), (2, b''), (3, b'')]
+    comm._flush_window()
+    assert_equal(comm._inChannel.settled,
+                 [('ack', 1, False), ('reject', 2, False), ('requeue', 3, False)])
+
+
+def _history(uuid, state, resource='psu_1', minute=0):
+    record = AlertsHistoryModel(_message(uuid, state, resource))
+    record.created_time = datetime(2021, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minute)
+    return record
+
+
+@async_test
+async def test_repeated_history_is_counted(*args):
+    bulk = FakeBulk()
+    repo = AlertRepository(FakeStorage(), bulk)
+    await repo.store_many([], [_history('1', 'fault'), _history('2', 'fault', minute=1)])
+    await repo.store_alerts_history(_history('3', 'fault', minute=2))
+    await repo.store_alerts_history(_history('4', 'fault_resolved', minute=3))
+    written = [(meta['index']['_id'], body.get('occurrences'), body.get('last_time'))
+               for request in bulk.requests for meta, body in request]
+    first = int(datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp())
+    assert_equal(written, [('1', 2, first + 60), ('1', 3, first + 120), ('4', None, None)])
+
+
+@async_test
+async def test_history_compaction(*args):
+    storage = FakeStorage()
+    bulk = FakeBulk()
+    repo = AlertRepository(storage, bulk)
+    records = [_history('1', 'fault'), _history('2', 'fault', minute=1),
+               _history('3', 'fault', minute=2), _history('4', 'fault', 'psu_2', minute=3),
+               _history('5', 'fault_resolved', minute=4), _history('6', 'fault_resolved', minute=5)]
+    for record in records:
+        await storage(AlertsHistoryModel).store(record)
+    # New repeated records may still be counted in the last one
+    repo.history.commit({repo.history.key(records[-1]): records[-1]})
+    removed = await repo.compact_alerts_history(datetime.now(timezone.utc))
+    assert_equal(removed, 2)
+    actions = [(next(iter(meta)), meta[next(iter(meta))]['_id'],
+                body and body.get('occurrences')) for meta, body in bulk.requests[0]]
+    assert_equal(actions, [('index', '1', 3), ('delete', '2', None), ('delete', '3', None)])
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_window_is_stored_in_one_bulk_request,
+    test_window_updates_changed_fields_of_stored_alert,
+    test_indexes_are_read_from_db_config,
+    test_broken_document_does_not_fail_window,
+    test_store_many_falls_back_to_single_writes,
+    test_window_messages_keep_ack_rules,
+    test_acknowledge_sends_changed_fields,
+    test_bulk_acknowledge_reports_every_id,
+    test_comment_is_appended_by_script,
+    test_flapping_alert_is_marked_until_settled,
+    test_failed_forward_of_settled_alert_is_retried,
+    test_repeated_history_is_counted,
+    test_history_compaction,
+]
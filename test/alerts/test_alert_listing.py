@@ -0,0 +1,141 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from datetime import datetime, timedelta
+from csm.test.common import assert_equal, async_test, FakeAlertRepository
+from csm.common.errors import InvalidRequest
+from csm.common.payload import JsonCodec
+from csm.common.queries import PageCursor
+from csm.core.services.alerts import AlertsAppService
+
+START = datetime(2021, 1, 1)
+
+
+class FakeAlert:
+    def __init__(self, uuid):
+        self.alert_uuid = uuid
+        # Pairs of alerts have the same time
+        self.created_time = START - timedelta(seconds=int(uuid) // 2)
+
+    def to_primitive_filter_empty(self):
+        return {'alert_uuid': self.alert_uuid}
+
+
+def _repository(count):
+    return FakeAlertRepository([FakeAlert(str(i)) for i in range(count)])
+
+
+async def _fetch(repo, sort_by='created_time', **kwargs):
+    stream = await AlertsAppService(repo).fetch_all_alerts(None, 'desc', sort_by, **kwargs)
+    return JsonCodec.loads((await stream.to_bytes()).decode())
+
+
+@async_test
+async def test_page_and_count_run_concurrently(*args):
+    repo = _repository(25)
+    result = await _fetch(repo, offset=2, page_limit=10)
+    assert_equal(result['total_records'], 25)
+    assert_equal([a['alert_uuid'] for a in result['alerts']][:2], ['10', '11'])
+    assert_equal(sorted(repo.calls), ['count', 'page'])
+    assert_equal(repo.max_running, 2)
+    assert_equal('total_records_relation' in result, False)
+
+
+@async_test
+async def test_estimated_total(*args):
+    repo = _repository(25)
+    result = await _fetch(repo, offset=1, page_limit=10, estimate_total=True)
+    assert_equal(len(result['alerts']), 10)
+    assert_equal((result['total_records'], result['total_records_relation']), (11, 'gte'))
+    assert_equal(repo.calls, ['page'])
+    # The last page gives the exact number
+    result = await _fetch(repo, offset=3, page_limit=10, estimate_total=True)
+    assert_equal((result['total_records'], result['total_records_relation']), (25, 'eq'))
+
+
+def test_page_cursor_encoding(*args):
+    items = [('a', 3), ('b', 2), ('c', 2)]
+    cursor = PageCursor.after(items, 'created_time', 'desc', lambda i: i[1], lambda i: i[0])
+    cursor = PageCursor.decode(cursor.encode())
+    assert_equal((cursor.field, cursor.order, cursor.value, cursor.ids),
+                 ('created_time', 'desc', 2, ['b', 'c']))
+    # IDs with the same value are kept over pages
+    cursor = PageCursor.after([('d', 2)], 'created_time', 'desc', lambda i: i[1],
+                              lambda i: i[0], cursor)
+    assert_equal(cursor.ids, ['b', 'c', 'd'])
+    for token in ('', 'not a cursor', PageCursor('f', 'up', 1, []).encode()):
+        try:
+            PageCursor.decode(token)
+        except ValueError:
+            continue
+        raise AssertionError(f"{token!r} was decoded")
+
+
+@async_test
+async def test_cursor_walks_all_alerts(*args):
+    repo = _repository(25)
+    seen, cursor = [], None
+    while True:
+        result = await _fetch(repo, page_limit=3, cursor=cursor)
+        seen.extend(alert['alert_uuid'] for alert in result['alerts'])
+        cursor = result['next_cursor']
+        if cursor is None:
+            break
+    assert_equal(seen, [str(i) for i in range(25)])
+    # Alerts with the time of the cursor that were already returned
+    assert_equal(repo.cursors[-1].ids, ['22', '23'])
+    try:
+        await _fetch(repo, page_limit=3, cursor=repo.cursors[-1].encode(),
+                     sort_by='severity')
+    except InvalidRequest:
+        pass
+    else:
+        raise AssertionError("Cursor accepted for a different sort field")
+
+
+@async_test
+async def test_cursor_walks_alerts_of_one_time_in_any_order(*args):
+    repo = _repository(25)
+    for alert in repo.alerts:
+        alert.created_time = START
+    retrieve_by_range = repo.retrieve_by_range
+
+    async def reordered(*args, **kwargs):
+        # Records with the same sort value come in no particular order
+        repo.alerts = repo.alerts[7:] + repo.alerts[:7]
+        return await retrieve_by_range(*args, **kwargs)
+    repo.retrieve_by_range = reordered
+    seen, cursor = [], None
+    while True:
+        result = await _fetch(repo, page_limit=3, cursor=cursor)
+        seen.extend(alert['alert_uuid'] for alert in result['alerts'])
+        cursor = result['next_cursor']
+        if cursor is None:
+            break
+    assert_equal(sorted(seen, key=int), [str(i) for i in range(25)])
+    assert_equal(len(repo.cursors[-1].ids), 24)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_page_and_count_run_concurrently,
+    test_estimated_total,
+    test_page_cursor_encoding,
+    test_cursor_walks_all_alerts,
+    test_cursor_walks_alerts_of_one_time_in_any_order,
+]
@@ -0,0 +1,73 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from csm.test.common import assert_equal, async_test, FakeAlertRepository
+from csm.common.errors import CsmServiceNotAvailable
+from csm.core.blogic.models.alerts import AlertModel
+from csm.core.services.alerts import AlertsAppService, AlertSummary
+
+
+def _alert(uuid, severity='warning', node='srvnode-1', resolved=False, acknowledged=False):
+    return AlertModel({'alert_uuid': uuid, 'severity': severity, 'node_id': node,
+                       'resolved': resolved, 'acknowledged': acknowledged})
+
+
+def test_summary_counters(*args):
+    summary = AlertSummary()
+    assert_equal(summary.get(), None)
+    summary.load([_alert('1'), _alert('2', 'critical', 'srvnode-2', resolved=True),
+                  _alert('3', resolved=True, acknowledged=True)])
+    assert_equal(summary.get(), {'open': 2, 'unacknowledged': 2, 'unresolved': 1,
+                                 'severity': {'warning': 1, 'critical': 1},
+                                 'node': {'srvnode-1': 1, 'srvnode-2': 1}})
+    version = summary.version
+    # The new state of an alert replaces the old one
+    summary.update(_alert('1', acknowledged=True))
+    summary.update(_alert('1', acknowledged=True))
+    summary.update(_alert('2', 'critical', 'srvnode-2', resolved=True, acknowledged=True))
+    assert_equal(summary.get(), {'open': 1, 'unacknowledged': 0, 'unresolved': 1,
+                                 'severity': {'warning': 1}, 'node': {'srvnode-1': 1}})
+    assert_equal(summary.version, version + 2)
+
+
+@async_test
+async def test_reconcile_keeps_newer_updates(*args):
+    repo = FakeAlertRepository([_alert('1'), _alert('2')])
+    service = AlertsAppService(repo)
+    try:
+        service.get_alert_summary()
+    except CsmServiceNotAvailable:
+        pass
+    else:
+        raise AssertionError("Summary served before it was loaded")
+    service.summary.begin_load()
+    # Stored while the DB was read
+    await repo.update(_alert('1', acknowledged=True))
+    service.summary.load(repo.alerts)
+    assert_equal(service.get_alert_summary()['unacknowledged'], 1)
+    # Drift is fixed by reconciliation
+    service.summary.update(_alert('3'))
+    await service.reconcile_alert_summary()
+    assert_equal(service.get_alert_summary()['open'], 2)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_summary_counters,
+    test_reconcile_keeps_newer_updates,
+]
@@ -23,6 +23,9 @@ from csm.core.providers.provider_factory import ProviderFactory
 from csm.core.providers.providers import Request, Response
 from csm.core.blogic import const
 from csm.core.agent.api import CsmApi
+from csm.common.errors import CsmResourceNotAvailable
+from csm.core.blogic.models.alerts import AlertModel
+from csm.core.services.alerts import AlertRepository
 
 class Const:
     CSM_GLOBAL_INDEX = 'CSM'
@@ -108,3 +111,97 @@ def assert_raises(exc_type):
 
     exc_name = get_type_name(exc_type)
     raise TestFailed(f'{exc_name} not raised')
+
+
+class FakeCollection:
+    """
+    DB collection keeping models in memory by their primary key and counting
+    the calls. Filters are not evaluated: get returns all models, update and
+    delete change all of them.
+    """
+
+    def __init__(self):
+        self.models = {}
+        # Keys of the models that fail to be stored
+        self.broken = set()
+        self.stores = 0
+        self.gets = 0
+        self.updates = []
+
+    async def store(self, model):
+        key = getattr(model, model._id)
+        if key in self.broken:
+            raise CsmResourceNotAvailable('Store failed')
+        self.stores += 1
+        self.models[key] = model
+
+    async def get(self, query):
+        self.gets += 1
+        return list(self.models.values())
+
+    async def update(self, filter_obj, to_update):
+        if self.broken & self.models.keys():
+            raise CsmResourceNotAvailable('Update failed')
+        self.updates.append(to_update)
+        for model in self.models.values():
+            for name, value in to_update.items():
+                setattr(model, name, model._fields[name].to_native(value))
+        return len(self.models)
+
+    async def delete(self, filter_obj):
+        count = len(self.models)
+        self.models.clear()
+        return count
+
+
+class FakeStorage:
+    """ DataBaseProvider with a FakeCollection for every model """
+
+    def __init__(self):
+        self.collections = {}
+
+    def __call__(self, model_class):
+        return self.collections.setdefault(model_class, FakeCollection())
+
+
+class FakeAlertRepository(AlertRepository):
+    """
+    Serves a fixed list of alerts, in the order of the list whatever the
+    sort is, and records the queries made
+    """
+
+    def __init__(self, alerts, bulk=None):
+        super().__init__(FakeStorage(), bulk)
+        self.alerts = alerts
+        self.calls = []
+        self.cursors = []
+        self.running = 0
+        self.max_running = 0
+
+    async def _query(self, name, result):
+        self.calls.append(name)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0)
+        self.running -= 1
+        return result
+
+    async def retrieve_by_range(self, create_time_range, show_all=True, severity=None,
+                                sort=None, limits=None, resolved=None, acknowledged=None,
+                                show_active=False, after=None):
+        self.cursors.append(after)
+        alerts = self.alerts
+        if after is not None:
+            # ISO times of one format are ordered as strings
+            def created(alert):
+                return AlertModel.created_time.to_primitive(alert.created_time)
+            if after.order == 'desc':
+                alerts = [a for a in alerts if created(a) <= after.value]
+            else:
+                alerts = [a for a in alerts if created(a) >= after.value]
+            alerts = [a for a in alerts if a.alert_uuid not in after.ids]
+        offset = (limits.offset or 0) if after is None else 0
+        return await self._query('page', alerts[offset:offset + limits.limit])
+
+    async def count_by_range(self, *args):
+        return await self._query('count', len(self.alerts))
@@ -27,7 +27,7 @@ from csm.common.template import Template
 from csm.common.email import SmtpServerConfiguration, EmailSender, OutOfAttemptsEmailError
 from csm.core.blogic.models.alerts import IAlertStorage, Alert
 from csm.core.data.models.system_config import SystemConfigSettings, Notification, EmailConfig
-from csm.core.services.alerts import AlertMonitorService, AlertEmailNotifier
+from csm.core.services.alerts import AlertMonitorService, AlertEmailNotifier, AlertEvent
 
 
 class MockAlertRepository(IAlertStorage):
@@ -120,7 +120,7 @@ async def test_alert_monitor_service():
         ALERT_MODEL = alert
 
     monitor_service = AlertMonitorService(mock_repo, mock_plugin)
-    monitor_service.add_listener(handle_alert_cb)
+    monitor_service.events.subscribe(AlertEvent, lambda event: handle_alert_cb(event.alert))
     monitor_service.start()
     await asyncio.sleep(1)  # We need to release event loop for some time
 
@@ -21,7 +21,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from csm.common.payload import Yaml
 from csm.core.blogic import const
 from csm.core.services.audit_log import AuditService, AuditLogManager
-from csm.common.errors import CsmPermissionDenied
+from csm.common.errors import CsmPermissionDenied, CsmResourceNotAvailable
 from cortx.utils.data.db.db_provider import DataBaseProvider, GeneralConfig
 from csm.common.queries import DateTimeRange
 t = unittest.TestCase()
@@ -34,6 +34,26 @@ class MockAuditManager():
     async def count_by_range(self, *args, **kwargs):
         return 0
 
+    async def iterate_by_range(self, *args, **kwargs):
+        for log in self.logs:
+            yield log
+
+    logs = []
+
+class FailingAuditManager(MockAuditManager):
+
+    async def iterate_by_range(self, *args, **kwargs):
+        raise CsmResourceNotAvailable("Audit log query failed")
+        yield
+
+class MockLog():
+
+    def __init__(self, message):
+        self.message = message
+
+    def to_primitive(self):
+        return {"message": self.message}
+
 def init(args):
     pass
 
@@ -51,6 +71,18 @@ async def test_download_audit_log_service():
     expected_value = "csm.12-02-2020.17-02-2020"
     t.assertIn(expected_value, actual_value)
 
+async def test_stream_audit_log_service():
+    mock_mngr = MockAuditManager()
+    mock_mngr.logs = [MockLog("login"), MockLog("logout")]
+    audit_service = AuditService(mock_mngr)
+    stream = await audit_service.stream_by_range("csm", 1581490848, 1581922908)
+    t.assertEqual(await stream.to_bytes(), b'["login","logout"]')
+    stream = await AuditService(MockAuditManager()).stream_by_range("csm", 1581490848, 1581922908)
+    t.assertEqual(await stream.to_bytes(), b'[]')
+    # DB errors are raised before the response is started
+    with t.assertRaises(CsmResourceNotAvailable):
+        await AuditService(FailingAuditManager()).stream_by_range("csm", 1581490848, 1581922908)
+
 def test_filename_service():
     mock_mngr = MockAuditManager()
     audit_service = AuditService(mock_mngr)
@@ -62,6 +94,7 @@ def run_tests(args = {}):
     loop = asyncio.get_event_loop()
     loop.run_until_complete(test_show_audit_log_service())
     loop.run_until_complete(test_download_audit_log_service())
+    loop.run_until_complete(test_stream_audit_log_service())
     test_filename_service()
 
 test_list = [run_tests]
@@ -0,0 +1,72 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+from threading import Thread
+from csm.test.common import assert_equal, async_test
+from csm.common.event_bus import EventBus
+
+
+class Event:
+    def __init__(self, number):
+        self.number = number
+
+
+class OtherEvent(Event):
+    pass
+
+
+@async_test
+async def test_subscribers_are_isolated(*args):
+    bus = EventBus(asyncio.get_event_loop())
+    received = []
+    release = asyncio.Event()
+
+    async def slow(event):
+        await release.wait()
+
+    def failing(event):
+        raise ValueError('Handler failed')
+
+    bus.subscribe(Event, slow, 'slow', queue_size=2)
+    bus.subscribe(Event, failing, 'failing')
+    bus.subscribe(OtherEvent, lambda event: received.append(event.number), 'other')
+    # Events of other threads are queued in order
+    publisher = Thread(target=lambda: [bus.publish(OtherEvent(i)) for i in range(3)])
+    publisher.start()
+    publisher.join()
+    bus.publish(Event(3))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    # The blocked subscriber delays neither the publisher nor the others
+    assert_equal(received, [0, 1, 2])
+    metrics = bus.metrics()
+    assert_equal((metrics['failing']['delivered'], metrics['failing']['failed']), (0, 4))
+    # The oldest events are dropped for the subscriber, one is being handled
+    assert_equal((metrics['slow']['queued'], metrics['slow']['dropped']), (1, 2))
+    release.set()
+    await bus.join()
+    assert_equal(bus.metrics()['slow']['delivered'], 2)
+    bus.stop()
+    assert_equal(bus.metrics(), {})
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_subscribers_are_isolated,
+]
@@ -0,0 +1,73 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import json
+import os
+import tempfile
+from csm.test.common import assert_equal
+from csm.core.services.feature_endpoints import FeatureEndpointMap
+
+
+ENDPOINT_MAP = {
+    "/api/v1/alerts": {"feature_name": "alerts", "dependent_on": ["sspl"]},
+    "/api/v1/alerts/*": {"feature_name": "alerts", "dependent_on": ["sspl"]},
+    "/api/v1/alerts/*/comments": {"feature_name": "comments", "dependent_on": []},
+    "/api/v1/stats/*": {"feature_name": "stats", "dependent_on": []}
+}
+
+
+def _write_map(path, endpoint_map):
+    with open(path, 'w') as f:
+        json.dump(endpoint_map, f)
+
+
+def test_feature_endpoint_match(*args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'feature_endpoint_mapping.json')
+        _write_map(path, ENDPOINT_MAP)
+        endpoints = FeatureEndpointMap(path)
+
+        assert_equal(endpoints.match('/api/v1/alerts')['feature_name'], 'alerts')
+        assert_equal(endpoints.match('/api/v1/alerts/1a2b')['feature_name'], 'alerts')
+        assert_equal(endpoints.match('/api/v1/alerts/1a2b/comments')['feature_name'],
+                     'comments')
+        assert_equal(endpoints.match('/api/v1/stats/node1')['feature_name'], 'stats')
+        assert_equal(endpoints.match('/api/v1/alerts/1a2b/history'), None)
+        assert_equal(endpoints.match('/api/v1/system'), None)
+
+
+def test_feature_endpoint_reload(*args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'feature_endpoint_mapping.json')
+        endpoints = FeatureEndpointMap(path, check_interval=0)
+        assert_equal(endpoints.match('/api/v1/alerts'), None)
+
+        _write_map(path, ENDPOINT_MAP)
+        assert_equal(endpoints.match('/api/v1/alerts')['feature_name'], 'alerts')
+
+        _write_map(path, {"/api/v1/alerts": {"feature_name": "new", "dependent_on": []}})
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        assert_equal(endpoints.match('/api/v1/alerts')['feature_name'], 'new')
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_feature_endpoint_match,
+    test_feature_endpoint_reload,
+]
@@ -0,0 +1,161 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from aiohttp import web, hdrs
+from aiohttp.test_utils import TestClient, TestServer
+from csm.test.common import assert_equal, async_test
+from csm.common.payload import JsonCodec, JsonStream
+from csm.common.errors import CsmResourceNotAvailable
+from csm.core.agent.api import CsmRestApi
+from csm.core.blogic import const
+from csm.core.controllers.view import CsmResponse, JsonStreamResponse
+
+
+ALERTS = [{'alert_uuid': str(i), 'description': 'Fan is not working ' * 4}
+          for i in range(50)]
+DOCUMENT = JsonCodec.dumps({'total_records': len(ALERTS), 'alerts': ALERTS}).encode('utf-8')
+
+
+async def _alerts(request):
+    stream = JsonStream(ALERTS, key='alerts', envelope={'total_records': len(ALERTS)},
+                        batch_size=10)
+    return JsonStreamResponse(stream)
+
+
+async def _summary(request):
+    resp = CsmResponse({'open': 1})
+    resp.headers[hdrs.ETAG] = '"7"'
+    return resp
+
+
+async def _weak_summary(request):
+    resp = CsmResponse({'alerts': ALERTS})
+    resp.headers[hdrs.ETAG] = 'W/"8"'
+    return resp
+
+
+async def _failing_alerts(request):
+    async def alerts():
+        raise CsmResourceNotAvailable("Alerts query failed")
+        yield
+    return JsonStreamResponse(JsonStream(alerts(), key='alerts'))
+
+
+async def _client():
+    app = web.Application(middlewares=[CsmRestApi.http_cache_middleware])
+    app[const.USL_POLLING_LOG] = False
+    app.router.add_get('/alerts', _alerts)
+    app.router.add_get('/summary', _summary)
+    app.router.add_get('/weak', _weak_summary)
+    app.router.add_get('/failing', _failing_alerts)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    return client
+
+
+@async_test
+async def test_streamed_listing_etag(*args):
+    client = await _client()
+    try:
+        resp = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'identity'})
+        assert_equal(resp.status, 200)
+        assert_equal(await resp.read(), DOCUMENT)
+        etag = resp.headers[hdrs.ETAG]
+        assert_equal(resp.headers[hdrs.VARY], hdrs.ACCEPT_ENCODING)
+        resp = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'identity',
+                                                    hdrs.IF_NONE_MATCH: etag})
+        assert_equal(resp.status, 304)
+        assert_equal((resp.headers[hdrs.ETAG], resp.headers[hdrs.VARY]),
+                     (etag, hdrs.ACCEPT_ENCODING))
+        # A version set by the handler is used instead of the body hash
+        resp = await client.get('/summary', headers={hdrs.IF_NONE_MATCH: 'W/"7"'})
+        assert_equal(resp.status, 304)
+    finally:
+        await client.close()
+
+
+@async_test
+async def test_streamed_listing_encoding(*args):
+    client = await _client()
+    try:
+        plain = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'identity'})
+        assert_equal(hdrs.CONTENT_ENCODING in plain.headers, False)
+        resp = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'gzip;q=0.5, br;q=0'})
+        assert_equal(resp.headers[hdrs.CONTENT_ENCODING], 'gzip')
+        assert_equal(await resp.read(), DOCUMENT)
+        # Strong validators differ between content codings
+        gzip_etag = resp.headers[hdrs.ETAG]
+        assert_equal(gzip_etag, plain.headers[hdrs.ETAG][:-1] + '-gzip"')
+        resp = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'gzip, br;q=0',
+                                                    hdrs.IF_NONE_MATCH: plain.headers[hdrs.ETAG]})
+        assert_equal(resp.status, 200)
+    finally:
+        await client.close()
+
+
+@async_test
+async def test_large_stream_is_not_buffered(*args):
+    read_ahead_size = const.HTTP_STREAM_READ_AHEAD_SIZE
+    const.HTTP_STREAM_READ_AHEAD_SIZE = len(DOCUMENT) // 2
+    client = await _client()
+    try:
+        resp = await client.get('/alerts', headers={hdrs.ACCEPT_ENCODING: 'gzip'})
+        assert_equal(resp.status, 200)
+        assert_equal(hdrs.ETAG in resp.headers, False)
+        assert_equal(resp.headers[hdrs.TRANSFER_ENCODING], 'chunked')
+        assert_equal(resp.headers[hdrs.CONTENT_ENCODING], 'gzip')
+        assert_equal(resp.headers[hdrs.VARY], hdrs.ACCEPT_ENCODING)
+        # The chunks serialized in advance are sent first
+        assert_equal(await resp.read(), DOCUMENT)
+    finally:
+        const.HTTP_STREAM_READ_AHEAD_SIZE = read_ahead_size
+        await client.close()
+
+
+@async_test
+async def test_weak_etag_of_handler(*args):
+    client = await _client()
+    try:
+        resp = await client.get('/weak', headers={hdrs.ACCEPT_ENCODING: 'gzip, br;q=0'})
+        assert_equal(resp.headers[hdrs.ETAG], 'W/"8-gzip"')
+        resp = await client.get('/weak', headers={hdrs.ACCEPT_ENCODING: 'gzip, br;q=0',
+                                                  hdrs.IF_NONE_MATCH: 'W/"8-gzip"'})
+        assert_equal(resp.status, 304)
+    finally:
+        await client.close()
+
+
+@async_test
+async def test_stream_error_is_json(*args):
+    client = await _client()
+    try:
+        resp = await client.get('/failing')
+        assert_equal(resp.status, 500)
+        assert_equal((await resp.json())['message'], "Internal error: Alerts query failed")
+    finally:
+        await client.close()
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_streamed_listing_etag,
+    test_streamed_listing_encoding,
+    test_large_stream_is_not_buffered,
+    test_weak_etag_of_handler,
+    test_stream_error_is_json,
+]
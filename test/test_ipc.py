@@ -0,0 +1,150 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import os
+import tempfile
+from csm.test.common import assert_equal, async_test
+from csm.common.ipc import IpcServer, IpcClient
+
+
+RECONNECT_INTERVAL = 0.05
+
+
+class Received:
+    """ Messages received by IPC handlers, by topic """
+
+    def __init__(self, *topics):
+        self.messages = []
+        self.handlers = {topic: self._handler(topic) for topic in topics}
+
+    def _handler(self, topic):
+        def handle(payload):
+            self.messages.append((topic, payload))
+        return handle
+
+    async def wait(self, count):
+        for _ in range(200):
+            if len(self.messages) >= count:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"Expected {count} messages, received {self.messages}")
+
+
+async def _connected(client):
+    for _ in range(200):
+        if client._writer is not None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("IPC client did not connect")
+
+
+async def _stop(server, task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    await server.stop()
+
+
+@async_test
+async def test_ipc_framing(*args):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'ipc.sock')
+        from_client = Received('alert_update')
+        server = IpcServer(path, handlers=from_client.handlers)
+        await server.start()
+        received = Received('alert', 'health')
+        client = IpcClient(path, received.handlers, RECONNECT_INTERVAL)
+        task = asyncio.ensure_future(client.run())
+        await _connected(client)
+        # Newlines inside the payload do not break the framing
+        alert = {'alert_uuid': '1', 'description': 'Line 1\nLine 2'}
+        large = {'resources': ['disk'] * 50000}
+        server.publish('alert', alert)
+        server.publish('unknown', {})
+        server.publish('health', large)
+        server.publish('alert', {'alert_uuid': '2'})
+        await received.wait(3)
+        assert_equal(received.messages, [('alert', alert), ('health', large),
+                                         ('alert', {'alert_uuid': '2'})])
+        # Messages of clients are dispatched to the server handlers
+        assert_equal(client.send('alert_update', {'alert_uuid': '1', 'acknowledged': True}), True)
+        await from_client.wait(1)
+        assert_equal(from_client.messages,
+                     [('alert_update', {'alert_uuid': '1', 'acknowledged': True})])
+        await _stop(server, task)
+
+
+@async_test
+async def test_ipc_retained_messages(*args):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'ipc.sock')
+        server = IpcServer(path)
+        await server.start()
+        # Only the last retained message of a topic is kept for new clients
+        server.publish('health', {'version': 1}, retain=True)
+        server.publish('health', {'version': 2}, retain=True)
+        server.publish('alert', {'alert_uuid': '1'})
+        await asyncio.sleep(0)
+        received = Received('alert', 'health')
+        client = IpcClient(path, received.handlers, RECONNECT_INTERVAL)
+        task = asyncio.ensure_future(client.run())
+        await received.wait(1)
+        # An unchanged retained message is not sent again
+        server.publish('health', {'version': 2}, retain=True)
+        server.publish('health', {'version': 3}, retain=True)
+        await received.wait(2)
+        await asyncio.sleep(0.05)
+        assert_equal(received.messages, [('health', {'version': 2}), ('health', {'version': 3})])
+        await _stop(server, task)
+
+
+@async_test
+async def test_ipc_reconnect(*args):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'ipc.sock')
+        received = Received('health')
+        client = IpcClient(path, received.handlers, RECONNECT_INTERVAL)
+        # The client waits for the server to start
+        task = asyncio.ensure_future(client.run())
+        await asyncio.sleep(RECONNECT_INTERVAL * 2)
+        assert_equal(client.send('alert_update', {}), False)
+        server = IpcServer(path)
+        await server.start()
+        server.publish('health', {'version': 1}, retain=True)
+        await received.wait(1)
+        # Messages are lost while the server is down, the retained state is
+        # replayed after reconnection
+        await server.stop()
+        await asyncio.sleep(RECONNECT_INTERVAL)
+        assert_equal(client.send('alert_update', {}), False)
+        await server.start()
+        server.publish('health', {'version': 2}, retain=True)
+        await received.wait(2)
+        assert_equal(received.messages[-1], ('health', {'version': 2}))
+        await _stop(server, task)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_ipc_framing,
+    test_ipc_retained_messages,
+    test_ipc_reconnect,
+]
@@ -0,0 +1,132 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from csm.test.common import assert_equal, async_test
+from csm.common.payload import JsonCodec, JsonStream
+from csm.core.controllers.view import JsonStreamResponse
+
+
+ENVELOPE = {'total_records': 3, 'version': 7}
+
+
+def _items(count):
+    return [{'alert_uuid': str(i), 'severity': 'critical', 'acknowledged': i % 2 == 0}
+            for i in range(count)]
+
+
+def _ndjson(*docs):
+    return b''.join(JsonCodec.dumps(doc).encode('utf-8') + b'\n' for doc in docs)
+
+
+async def _chunks(stream, ndjson=False):
+    return [chunk async for chunk in stream.chunks(ndjson)]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@async_test
+async def test_document_forms(*args):
+    items = _items(3)
+    # The streamed bytes are the ones of the document serialized at once
+    assert_equal(await JsonStream(items).to_bytes(),
+                 JsonCodec.dumps(items).encode('utf-8'))
+    assert_equal(await JsonStream(items, key='alerts', envelope=ENVELOPE).to_bytes(),
+                 JsonCodec.dumps(dict(ENVELOPE, alerts=items)).encode('utf-8'))
+    assert_equal(await JsonStream(items, key='alerts').to_bytes(),
+                 JsonCodec.dumps({'alerts': items}).encode('utf-8'))
+    # NDJSON has one item per line, the envelope comes first
+    assert_equal(await JsonStream(items).to_bytes(ndjson=True), _ndjson(*items))
+    assert_equal(await JsonStream(items, key='alerts', envelope=ENVELOPE).to_bytes(ndjson=True),
+                 _ndjson(ENVELOPE, *items))
+
+
+@async_test
+async def test_empty_list(*args):
+    assert_equal(await JsonStream([]).to_bytes(), b'[]')
+    assert_equal(await JsonStream([], key='alerts', envelope=ENVELOPE).to_bytes(),
+                 JsonCodec.dumps(dict(ENVELOPE, alerts=[])).encode('utf-8'))
+    assert_equal(await JsonStream([]).to_bytes(ndjson=True), b'')
+    assert_equal(await JsonStream([], key='alerts', envelope=ENVELOPE).to_bytes(ndjson=True),
+                 _ndjson(ENVELOPE))
+    # The document is still sent as a single chunk
+    assert_equal(len(await _chunks(JsonStream([], key='alerts'))), 1)
+
+
+@async_test
+async def test_batch_boundaries(*args):
+    batch_size = 3
+    for count in (1, batch_size - 1, batch_size, batch_size + 1, 2 * batch_size):
+        items = _items(count)
+        stream = JsonStream(items, key='alerts', envelope=ENVELOPE, batch_size=batch_size)
+        chunks = await _chunks(stream)
+        # A full batch per chunk and the closing chunk with the rest
+        assert_equal(len(chunks), count // batch_size + 1)
+        assert_equal(b''.join(chunks),
+                     JsonCodec.dumps(dict(ENVELOPE, alerts=items)).encode('utf-8'))
+        chunks = await _chunks(stream, ndjson=True)
+        assert_equal(len(chunks), count // batch_size + 1)
+        assert_equal(b''.join(chunks), _ndjson(ENVELOPE, *items))
+
+
+@async_test
+async def test_async_source(*args):
+    items = _items(5)
+    transform = lambda item: dict(item, description=f"Alert {item['alert_uuid']}")
+    stream = JsonStream(_aiter(items), key='alerts', transform=transform, batch_size=2)
+    assert_equal(await stream.to_bytes(),
+                 JsonCodec.dumps({'alerts': [transform(i) for i in items]}).encode('utf-8'))
+
+
+@async_test
+async def test_stream_response(*args):
+    items = _items(5)
+
+    async def handler(request):
+        stream = JsonStream(_aiter(items), key='alerts', envelope=ENVELOPE, batch_size=2)
+        return JsonStreamResponse(stream, ndjson=JsonStreamResponse.accepts_ndjson(request))
+
+    app = web.Application()
+    app.router.add_get('/alerts', handler)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    try:
+        resp = await client.get('/alerts')
+        assert_equal(resp.status, 200)
+        assert_equal(resp.content_type, 'application/json')
+        assert_equal(await resp.read(),
+                     JsonCodec.dumps(dict(ENVELOPE, alerts=items)).encode('utf-8'))
+        resp = await client.get('/alerts', headers={'Accept': JsonStreamResponse.NDJSON})
+        assert_equal(resp.content_type, JsonStreamResponse.NDJSON)
+        assert_equal(await resp.read(), _ndjson(ENVELOPE, *items))
+    finally:
+        await client.close()
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_document_forms,
+    test_empty_list,
+    test_batch_boundaries,
+    test_async_source,
+    test_stream_response,
+]
@@ -0,0 +1,71 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import time
+from unittest.mock import patch
+from csm.test.common import assert_equal, async_test
+from csm.common.errors import CsmServiceNotAvailable
+from csm.core.data.models.users import Passwd
+from csm.core.services.password_verifier import PasswordVerifier
+
+
+def _slow_verify(password, hashed):
+    time.sleep(0.2)
+    return password == hashed
+
+
+@async_test
+async def test_password_verify(*args):
+    verifier = PasswordVerifier()
+    hashed = Passwd.hash('Seagate@1')
+    assert_equal(await verifier.verify('Seagate@1', hashed), True)
+    assert_equal(await verifier.verify('Seagate@2', hashed), False)
+    metrics = verifier.metrics()
+    assert_equal(metrics['verified'], 2)
+    assert_equal(metrics['queue_depth'], 0)
+
+
+@async_test
+async def test_password_verify_admission(*args):
+    verifier = PasswordVerifier(concurrency=1, queue_size=1, queue_timeout=5)
+    with patch.object(Passwd, 'verify', _slow_verify):
+        results = await asyncio.gather(*(verifier.verify('pwd', 'pwd') for _ in range(3)),
+                                       return_exceptions=True)
+    assert_equal(results[:2], [True, True])
+    assert_equal(isinstance(results[2], CsmServiceNotAvailable), True)
+    assert_equal(verifier.metrics()['rejected'], 1)
+
+
+@async_test
+async def test_password_verify_queue_timeout(*args):
+    verifier = PasswordVerifier(concurrency=1, queue_size=8, queue_timeout=0.05)
+    with patch.object(Passwd, 'verify', _slow_verify):
+        results = await asyncio.gather(*(verifier.verify('pwd', 'pwd') for _ in range(2)),
+                                       return_exceptions=True)
+    assert_equal(results[0], True)
+    assert_equal(isinstance(results[1], CsmServiceNotAvailable), True)
+    assert_equal(verifier.metrics()['timed_out'], 1)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_password_verify,
+    test_password_verify_admission,
+    test_password_verify_queue_timeout,
+]
@@ -64,6 +64,61 @@ def test_permissions_intersection(*args):
     assert_equal(calculated, expected)
 
 
+def test_permissions_superset(*args):
+    permissions = PermissionSet({
+        Resource.ALERTS: {Action.LIST, Action.UPDATE},
+        Resource.USERS: {Action.LIST}
+    })
+
+    assert_equal(permissions.issuperset(PermissionSet({Resource.ALERTS: {Action.LIST}})), True)
+    assert_equal(permissions.issuperset(PermissionSet()), True)
+    assert_equal(permissions.issuperset(permissions), True)
+    assert_equal(permissions.issuperset(PermissionSet({
+        Resource.ALERTS: {Action.LIST},
+        Resource.STATS: {Action.LIST}
+    })), False)
+    assert_equal(PermissionSet().issuperset(permissions), False)
+
+
+def test_permissions_to_dict(*args):
+    items = {
+        Resource.ALERTS: {Action.LIST, Action.UPDATE},
+        Resource.USERS: {Action.CREATE}
+    }
+    permissions = PermissionSet(items)
+
+    assert_equal(permissions.to_dict(), items)
+    assert_equal(PermissionSet().to_dict(), {})
+    # Sets built from the dictionary are equal to the original one
+    assert_equal(PermissionSet(permissions.to_dict()), permissions)
+
+
+def test_permissions_unknown_names(*args):
+    # Pairs missing from roles.json get their bits on first use
+    unknown = {'test_resource': {'test_action', Action.LIST}}
+    PermissionSet.intern({'test_resource': ['test_action']})
+    permissions = PermissionSet(unknown)
+
+    assert_equal(permissions.to_dict(), unknown)
+    assert_equal(PermissionSet({'test_resource': ['test_action']}),
+                 PermissionSet({'test_resource': {'test_action'}}))
+    assert_equal(permissions & PermissionSet({Resource.ALERTS: {Action.LIST}}), PermissionSet())
+    assert_equal((permissions | PermissionSet({'other_resource': {'test_action'}})).to_dict(),
+                 dict(unknown, other_resource={'test_action'}))
+
+
+def test_permissions_in_place(*args):
+    permissions = PermissionSet({Resource.ALERTS: {Action.LIST}})
+    copy = permissions.copy()
+    permissions |= PermissionSet({Resource.ALERTS: {Action.UPDATE}})
+
+    assert_equal(permissions.to_dict(), {Resource.ALERTS: {Action.LIST, Action.UPDATE}})
+    # The copy does not share the permissions
+    assert_equal(copy.to_dict(), {Resource.ALERTS: {Action.LIST}})
+    permissions &= PermissionSet({Resource.ALERTS: {Action.UPDATE}})
+    assert_equal(permissions.to_dict(), {Resource.ALERTS: {Action.UPDATE}})
+
+
 def init(args):
     pass
 
@@ -71,4 +126,8 @@ def init(args):
 test_list = [
     test_permissions_union,
     test_permissions_intersection,
+    test_permissions_superset,
+    test_permissions_to_dict,
+    test_permissions_unknown_names,
+    test_permissions_in_place,
 ]
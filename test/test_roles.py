@@ -31,6 +31,7 @@ from csm.core.services.roles import RoleManager
 from csm.core.services.permissions import PermissionSet
 
 from csm.core.agent.api import CsmRestApi
+from csm.core.controllers.routes import CsmRoutes
 
 from csm.core.controllers.alerts.alerts import (
     AlertsListView,
@@ -156,6 +157,30 @@ async def test_invalid_roles(*args):
     assert_equal(actual_permissions, expected_permissions)
 
 
+async def test_effective_permissions_memo(*args):
+    role_manager = RoleManager(roles_dict)
+    permissions = await role_manager.calc_effective_permissions('monitor', 'manage')
+    expected_permissions = permissions.copy()
+    # Callers receive a copy of the memoized set
+    permissions |= PermissionSet({'s3accounts': {'create'}})
+
+    actual_permissions = await role_manager.calc_effective_permissions('monitor', 'manage')
+
+    assert_equal(actual_permissions, expected_permissions)
+    assert_equal(await role_manager.calc_effective_permissions('auditor', 'monitor'),
+                 await role_manager.calc_effective_permissions('monitor'))
+
+    # Memoized unions are dropped when roles change
+    await role_manager.add_role('auditor', {'audit_log': ['list']})
+    actual_permissions = await role_manager.calc_effective_permissions('auditor', 'monitor')
+    assert_equal(actual_permissions,
+                 PermissionSet(dict(roles_dict['monitor']['permissions'], audit_log=['list'])))
+    await role_manager.delete_role('manage')
+    actual_permissions = await role_manager.calc_effective_permissions('monitor', 'manage')
+    assert_equal(actual_permissions,
+                 await role_manager.calc_effective_permissions('monitor'))
+
+
 CSM_BASE_DIRS = [
     os.path.join(os.path.dirname(__file__), '..'),
     Const.CSM_PATH,
@@ -183,7 +208,7 @@ async def check_rest_ep_permissions(role_manager, handler, method, roles, must_f
     request = MagicMock()
     request.method = method
     request.match_info.handler = handler
-    request.app.router.resolve.return_value = async_return(request.match_info)
+    request.route_auth = CsmRoutes.get_route_auth(request.match_info, method)
     request.session.permissions = PermissionSet()
 
     if roles:
@@ -523,5 +548,6 @@ test_list = [
     async_test(test_monitor_roles),
     async_test(test_manage_roles_with_root),
     async_test(test_invalid_roles),
+    async_test(test_effective_permissions_memo),
     async_test(test_rest_ep_permissions),
 ]
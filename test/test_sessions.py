@@ -0,0 +1,138 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+from datetime import timedelta
+from csm.test.common import assert_equal, assert_not_equal, async_test, FakeStorage
+from csm.core.data.models.session import SessionModel
+from csm.core.services.permissions import PermissionSet
+from csm.core.services.sessions import (SessionManager, ConsulSessionStore,
+                                        InMemorySessionStore, LocalCredentials,
+                                        S3Credentials)
+
+
+@async_test
+async def test_in_memory_session_lifecycle(*args):
+    manager = SessionManager()
+    permissions = PermissionSet({'alerts': {'list'}})
+    session = await manager.create(LocalCredentials('admin'), permissions)
+    assert_equal(await manager.get(session.session_id), session)
+
+    expiry_time = session.expiry_time - timedelta(minutes=1)
+    session.expiry_time = expiry_time
+    await manager.refresh(session)
+    assert_not_equal(session.expiry_time, expiry_time)
+
+    await manager.delete(session.session_id)
+    await manager.delete(session.session_id)
+    assert_equal(await manager.get(session.session_id), None)
+
+
+@async_test
+async def test_consul_session_store_cache(*args):
+    storage = FakeStorage()
+    manager = SessionManager(ConsulSessionStore(storage, b'', cache_ttl=60))
+    permissions = PermissionSet({'alerts': {'list', 'update'}})
+    session = await manager.create(LocalCredentials('admin'), permissions)
+    assert_equal(storage(SessionModel).stores, 1)
+
+    cached = await manager.get(session.session_id)
+    assert_equal(cached, session)
+    assert_equal(storage(SessionModel).gets, 0)
+
+    restored = await ConsulSessionStore(storage, b'').get(session.session_id)
+    assert_equal(restored.credentials.user_id, 'admin')
+    assert_equal(restored.permissions, permissions)
+    assert_equal(restored.expiry_time, session.expiry_time)
+
+
+@async_test
+async def test_consul_session_store_lazy_refresh(*args):
+    storage = FakeStorage()
+    store = ConsulSessionStore(storage, b'', flush_interval=3600)
+    manager = SessionManager(store)
+    session = await manager.create(LocalCredentials('admin'), PermissionSet())
+    session.expiry_time -= timedelta(minutes=1)
+    for _ in range(10):
+        await manager.refresh(session)
+    assert_equal(storage(SessionModel).stores, 1)
+
+    await store.flush()
+    assert_equal((storage(SessionModel).stores, len(storage(SessionModel).updates)), (1, 1))
+    assert_equal(storage(SessionModel).models[session.session_id].expiry_time,
+                 session.expiry_time)
+
+
+@async_test
+async def test_consul_refresh_does_not_restore_deleted_session(*args):
+    storage = FakeStorage()
+    worker_store = ConsulSessionStore(storage, b'', flush_interval=3600)
+    manager = SessionManager(worker_store)
+    session = await manager.create(LocalCredentials('admin'), PermissionSet())
+    await manager.refresh(session)
+    # Logout handled by another worker before the refresh is written back
+    await SessionManager(ConsulSessionStore(storage, b'')).delete(session.session_id)
+    await worker_store.flush()
+    assert_equal(storage(SessionModel).models, {})
+    assert_equal(await ConsulSessionStore(storage, b'').get(session.session_id), None)
+
+
+@async_test
+async def test_in_memory_sessions_by_user(*args):
+    manager = SessionManager()
+    admin_sessions = {(await manager.create(LocalCredentials('Admin'), PermissionSet())).session_id
+                      for _ in range(3)}
+    s3_session = await manager.create(S3Credentials('s3user', 'AKIA', 'secret', 'token'),
+                                      PermissionSet())
+
+    found = await manager.get_by_user('admin')
+    assert_equal({session.session_id for session in found}, admin_sessions)
+    found = await manager.get_by_user('S3USER')
+    assert_equal([session.session_id for session in found], [s3_session.session_id])
+
+    await manager.delete(s3_session.session_id)
+    assert_equal(await manager.get_by_user('s3user'), [])
+
+
+@async_test
+async def test_in_memory_delete_expired(*args):
+    store = InMemorySessionStore()
+    manager = SessionManager(store)
+    expired = await manager.create(LocalCredentials('admin'), PermissionSet())
+    refreshed = await manager.create(LocalCredentials('admin'), PermissionSet())
+    deleted = await manager.create(LocalCredentials('admin'), PermissionSet())
+    now = max(s.expiry_time for s in (expired, refreshed, deleted)) + timedelta(seconds=1)
+    await manager.delete(deleted.session_id)
+    refreshed.expiry_time = now + timedelta(minutes=1)
+
+    assert_equal(await store.delete_expired(now), 1)
+    assert_equal(await manager.get(expired.session_id), None)
+    assert_equal(await manager.get(refreshed.session_id), refreshed)
+    assert_equal([s.session_id for s in await manager.get_by_user('admin')],
+                 [refreshed.session_id])
+    assert_equal(await store.delete_expired(now), 0)
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_in_memory_session_lifecycle,
+    test_consul_session_store_cache,
+    test_consul_session_store_lazy_refresh,
+    test_consul_refresh_does_not_restore_deleted_session,
+    test_in_memory_sessions_by_user,
+    test_in_memory_delete_expired,
+]
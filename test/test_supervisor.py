@@ -0,0 +1,97 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import errno
+import os
+import signal
+import sys
+import tempfile
+from csm.test.common import assert_equal
+from csm.common.errors import CsmError
+from csm.core.agent.supervisor import AgentSupervisor
+
+
+# Stands for the agent: the background process creates the IPC socket
+# file, the first HTTP worker dies and the restarted one stops the supervisor
+AGENT = """
+import os, signal, sys, time
+role = sys.argv[1].split('=')[1]
+workdir = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(workdir, 'started'), 'a') as f:
+    f.write(role + '\\n')
+if role == 'background':
+    if '--fail' in sys.argv:
+        sys.exit(1)
+    open(os.path.join(workdir, 'ipc.sock'), 'w').close()
+elif not os.path.exists(os.path.join(workdir, 'crashed')):
+    open(os.path.join(workdir, 'crashed'), 'w').close()
+    sys.exit(3)
+else:
+    os.kill(os.getppid(), signal.SIGTERM)
+time.sleep(30)
+"""
+
+
+class ScriptedSupervisor(AgentSupervisor):
+    def __init__(self, workdir, args=None):
+        super().__init__(1, args, os.path.join(workdir, 'ipc.sock'),
+                         startup_timeout=10, respawn_interval=0.1)
+        self.agent = os.path.join(workdir, 'agent.py')
+        with open(self.agent, 'w') as f:
+            f.write(AGENT)
+
+    def _command(self):
+        return [sys.executable, self.agent]
+
+
+def _run(supervisor):
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        supervisor.run()
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+
+def _started(workdir):
+    with open(os.path.join(workdir, 'started')) as f:
+        return f.read().split()
+
+
+def test_workers_are_restarted(*args):
+    with tempfile.TemporaryDirectory() as workdir:
+        _run(ScriptedSupervisor(workdir))
+        # Workers start after the background process, a dead worker is restarted
+        assert_equal(_started(workdir), ['background', 'http', 'http'])
+
+
+def test_background_start_failure(*args):
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            _run(ScriptedSupervisor(workdir, ['--fail']))
+            raise AssertionError("Supervisor started workers without the background process")
+        except CsmError as e:
+            assert_equal(e.rc(), errno.ECHILD)
+        assert_equal(_started(workdir), ['background'])
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_workers_are_restarted,
+    test_background_start_failure,
+]
@@ -0,0 +1,216 @@
+# CORTX-CSM: CORTX Management web and CLI interface.
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+import asyncio
+import json
+from csm.test.common import assert_equal, async_test
+from csm.core.agent.websocket import (WebSocketClient, WsOverflowPolicy, WsReplayBuffer,
+                                      WsSubscriptions, WsTopic)
+
+
+class FakeWebSocket:
+    """ Websocket that sends only when the test allows it """
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.closed = False
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_str(self, data):
+        await self.unblocked.wait()
+        self.sent.append(data)
+
+    async def close(self, code=None, message=None):
+        self.closed = True
+
+
+async def _drain():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@async_test
+async def test_ws_client_fan_out(*args):
+    slow_ws, fast_ws = FakeWebSocket(blocked=True), FakeWebSocket()
+    clients = [WebSocketClient(slow_ws, 4), WebSocketClient(fast_ws, 4)]
+    for client in clients:
+        client.start()
+    for i in range(3):
+        for client in clients:
+            client.enqueue(str(i))
+    await _drain()
+    assert_equal(fast_ws.sent, ['0', '1', '2'])
+    assert_equal(slow_ws.sent, [])
+
+    slow_ws.unblocked.set()
+    await _drain()
+    assert_equal(slow_ws.sent, ['0', '1', '2'])
+    for client in clients:
+        await client.stop()
+
+
+@async_test
+async def test_ws_client_drop_oldest(*args):
+    ws = FakeWebSocket(blocked=True)
+    client = WebSocketClient(ws, 2, WsOverflowPolicy.DROP_OLDEST)
+    for i in range(4):
+        client.enqueue(str(i))
+    assert_equal(client.stats()['dropped'], 2)
+    client.start()
+    ws.unblocked.set()
+    await _drain()
+    assert_equal(ws.sent, ['2', '3'])
+    await client.stop()
+
+
+@async_test
+async def test_ws_client_coalesce(*args):
+    ws = FakeWebSocket(blocked=True)
+    client = WebSocketClient(ws, 2, WsOverflowPolicy.COALESCE)
+    client.enqueue('a1', 'a')
+    client.enqueue('b1', 'b')
+    client.enqueue('a2', 'a')
+    client.enqueue('c1', 'c')
+    stats = client.stats()
+    assert_equal((stats['coalesced'], stats['dropped']), (1, 1))
+    client.start()
+    ws.unblocked.set()
+    await _drain()
+    assert_equal(ws.sent, ['b1', 'c1'])
+    await client.stop()
+
+
+@async_test
+async def test_ws_client_disconnect(*args):
+    ws = FakeWebSocket(blocked=True)
+    client = WebSocketClient(ws, 2, WsOverflowPolicy.DISCONNECT)
+    client.start()
+    for i in range(3):
+        client.enqueue(str(i))
+    await _drain()
+    assert_equal(ws.closed, True)
+    assert_equal(client.closed, True)
+    assert_equal(client.enqueue('3'), False)
+    await client.stop()
+
+
+def test_ws_subscriptions_legacy(*args):
+    subscriptions = WsSubscriptions()
+    assert_equal(subscriptions.legacy, True)
+    assert_equal(subscriptions.match(WsTopic.ALERTS, {'severity': 'warning'}), True)
+    assert_equal(subscriptions.match(WsTopic.HEALTH, {}), False)
+
+
+def test_ws_subscriptions_filter(*args):
+    subscriptions = WsSubscriptions()
+    reply = subscriptions.handle_request({'action': 'subscribe', 'topic': 'alerts',
+                                          'filter': {'severity': ['critical', 'error'],
+                                                     'node_id': 'srvnode-1'}})
+    assert_equal(reply, {'action': 'subscribed', 'topic': 'alerts'})
+    assert_equal(subscriptions.legacy, False)
+    critical = {'severity': 'critical', 'node_id': 'srvnode-1'}
+    assert_equal(subscriptions.match(WsTopic.ALERTS, critical), True)
+    assert_equal(subscriptions.match(WsTopic.ALERTS, dict(critical, node_id='srvnode-2')), False)
+    assert_equal(subscriptions.match(WsTopic.ALERTS, dict(critical, severity='warning')), False)
+    assert_equal(subscriptions.match(WsTopic.HEALTH, {}), False)
+
+    subscriptions.handle_request({'action': 'subscribe', 'topic': 'health'})
+    assert_equal(subscriptions.match(WsTopic.HEALTH, {'severity': 'warning'}), True)
+    reply = subscriptions.handle_request({'action': 'unsubscribe', 'topic': 'alerts'})
+    assert_equal(reply, {'action': 'unsubscribed', 'topic': 'alerts'})
+    assert_equal(subscriptions.match(WsTopic.ALERTS, critical), False)
+
+
+def test_ws_subscriptions_invalid(*args):
+    subscriptions = WsSubscriptions()
+    for request in ([], {'action': 'listen', 'topic': 'alerts'},
+                    {'action': 'subscribe', 'topic': 'stats'},
+                    {'action': 'subscribe', 'topic': 'alerts', 'filter': {'password': 'x'}}):
+        assert_equal(subscriptions.handle_request(request)['action'], 'error')
+    assert_equal(WsTopic.message_key(WsTopic.ALERTS, {'alert_uuid': '1'}), ('alerts', '1'))
+    assert_equal(WsTopic.message_key(WsTopic.HEALTH, {'alert_uuid': '1'}), None)
+
+
+def test_ws_replay_buffer(*args):
+    replay = WsReplayBuffer(3)
+    assert_equal(replay.since(replay.epoch, 0), [])
+    for index in range(5):
+        event = replay.append(WsTopic.ALERTS, {'alert_uuid': str(index)})
+    assert_equal(event.seq, 5)
+    assert_equal(replay.last_seq, 5)
+    assert_equal([event.seq for event in replay.since(replay.epoch, 2)], [3, 4, 5])
+    assert_equal([event.seq for event in replay.since(replay.epoch, 4)], [5])
+    assert_equal(replay.since(replay.epoch, 5), [])
+    # The gap fell out of the buffer, the sequence is from the future or
+    # from another agent process
+    assert_equal(replay.since(replay.epoch, 1), None)
+    assert_equal(replay.since(replay.epoch, 6), None)
+    assert_equal(replay.since('other', 4), None)
+
+
+def test_ws_replay_buffer_shared_numbering(*args):
+    background = WsReplayBuffer(0)
+    events = [background.append(WsTopic.ALERTS, {'alert_uuid': str(index)})
+              for index in range(4)]
+    # Workers keep the numbers of the background process
+    worker = WsReplayBuffer(3)
+    for event in events[:2]:
+        worker.append(event.topic, event.data, event.epoch, event.seq)
+    assert_equal((worker.epoch, worker.last_seq), (background.epoch, 2))
+    assert_equal([event.seq for event in worker.since(background.epoch, 0)], [1, 2])
+    # An event did not reach the worker, what is before it can not be replayed
+    worker.append(events[3].topic, events[3].data, events[3].epoch, events[3].seq)
+    assert_equal(worker.since(background.epoch, 2), None)
+    assert_equal([event.seq for event in worker.since(background.epoch, 3)], [4])
+    # The background process restarted
+    restarted = WsReplayBuffer(0).append(WsTopic.HEALTH, {})
+    worker.append(restarted.topic, restarted.data, restarted.epoch, restarted.seq)
+    assert_equal((worker.epoch, worker.last_seq), (restarted.epoch, 1))
+    assert_equal(worker.since(background.epoch, 4), None)
+
+
+def test_ws_event_format(*args):
+    replay = WsReplayBuffer()
+    event = replay.append(WsTopic.ALERTS, {'alert_uuid': '1'})
+    subscriptions = WsSubscriptions()
+    # Clients without subscriptions get the numbers inside the object
+    assert_equal(json.loads(subscriptions.format(event)),
+                 {'alert_uuid': '1', 'epoch': replay.epoch, 'seq': 1})
+    assert_equal(json.loads(subscriptions.format(replay.append(WsTopic.ALERTS, ['2']))),
+                 ['2'])
+    subscriptions.handle_request({'action': 'subscribe', 'topic': 'alerts'})
+    assert_equal(json.loads(subscriptions.format(event)),
+                 {'topic': 'alerts', 'seq': 1, 'data': {'alert_uuid': '1'}})
+    assert_equal(event.key, ('alerts', '1'))
+
+
+def init(args):
+    pass
+
+
+test_list = [
+    test_ws_client_fan_out,
+    test_ws_client_drop_oldest,
+    test_ws_client_coalesce,
+    test_ws_client_disconnect,
+    test_ws_subscriptions_legacy,
+    test_ws_subscriptions_filter,
+    test_ws_subscriptions_invalid,
+    test_ws_replay_buffer,
+    test_ws_replay_buffer_shared_numbering,
+    test_ws_event_format,
+]